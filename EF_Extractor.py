@@ -12,11 +12,15 @@ EVE Frontier Staticdata Extractor – V3 FINAL
 
 import argparse
 import json
+import operator
 import sys
 import importlib.util
 from pathlib import Path
 import pickle
 
+from loader_index import find_loader
+from resfileindex import load_index
+
 # ============================================================
 # PLATFORM
 # ============================================================
@@ -41,6 +45,102 @@ def resfiles_root(game_path: Path) -> Path:
 # MATERIALIZATION (CORE)
 # ============================================================
 
+# Per-class accessor plans: the data attributes of a class plus an
+# operator.attrgetter reading them in one call. Methods and callable values
+# are dropped once per plan, not per instance. The plan key is the class
+# (no instance __dict__ / custom __dir__), the class and the __dict__ keys,
+# or the raw __dir__() listing: generic FSD object classes list per-schema
+# fields there, so nothing cheaper tells their instances apart.
+_ACCESSOR_PLANS = {}
+_LAYOUTS = {}
+PLAN_STATS = {"hits": 0, "misses": 0, "dir_calls": 0}
+
+def class_layout(cls):
+    layout = _LAYOUTS.get(cls)
+    if layout is None:
+        if cls.__dir__ is not object.__dir__:
+            layout = "dir"
+        elif cls.__dictoffset__:
+            layout = "dict"
+        else:
+            layout = "fixed"
+        _LAYOUTS[cls] = layout
+    return layout
+
+def list_attributes(obj):
+    PLAN_STATS["dir_calls"] += 1
+    return tuple(dir(obj))
+
+def plan_key(obj, cls):
+    layout = class_layout(cls)
+    try:
+        if layout == "dict":
+            return cls, tuple(obj.__dict__)
+        if layout == "dir":
+            return cls, tuple(obj.__dir__())
+    except Exception:
+        return cls, list_attributes(obj)
+    return cls
+
+def build_plan(obj, cls):
+    fields, fragile = [], False
+    for a in list_attributes(obj):
+        # methods are callable class attributes → skip without binding them
+        if a.startswith("_") or callable(getattr(cls, a, None)):
+            continue
+        try:
+            val = getattr(obj, a)
+        except Exception:
+            # may fail on this instance only → read this class one by one
+            fragile = True
+            fields.append(a)
+            continue
+        if not callable(val):
+            fields.append(a)
+    fields = tuple(fields)
+    if fragile or not fields:
+        read = None
+    elif len(fields) == 1:
+        get = operator.attrgetter(fields[0])
+        read = lambda o: (get(o),)
+    else:
+        read = operator.attrgetter(*fields)
+    return fields, read
+
+def accessor_plan(obj):
+    cls = type(obj)
+    key = plan_key(obj, cls)
+    plan = _ACCESSOR_PLANS.get(key)
+    if plan is not None:
+        PLAN_STATS["hits"] += 1
+        return plan
+    PLAN_STATS["misses"] += 1
+    plan = _ACCESSOR_PLANS[key] = build_plan(obj, cls)
+    return plan
+
+def read_attributes(obj):
+    fields, read = accessor_plan(obj)
+    if read is not None:
+        try:
+            return {a: materialize(v) for a, v in zip(fields, read(obj))}
+        except Exception:
+            pass  # an attribute failing on this instance only
+    out = {}
+    for a in fields:
+        try:
+            out[a] = materialize(getattr(obj, a))
+        except Exception:
+            continue
+    return out
+
+def plan_stats_line():
+    hits, misses = PLAN_STATS["hits"], PLAN_STATS["misses"]
+    rate = hits / (hits + misses) * 100 if hits + misses else 0.0
+    return (
+        f"accessor plans: {hits} hits, {misses} misses ({rate:.1f}% hit rate, "
+        f"{len(_ACCESSOR_PLANS)} plans, {PLAN_STATS['dir_calls']} dir() calls)"
+    )
+
 def materialize(obj):
     if obj is None or isinstance(obj, (str, int, float, bool)):
         return obj
@@ -56,17 +156,7 @@ def materialize(obj):
         cls_name = None
 
     if cls_name and cls_name not in ("list", "tuple"):
-        out = {}
-        for attr in dir(obj):
-            if attr.startswith("_"):
-                continue
-            try:
-                val = getattr(obj, attr)
-                if callable(val):
-                    continue
-                out[attr] = materialize(val)
-            except Exception:
-                continue
+        out = read_attributes(obj)
         if out:
             return out
 
@@ -101,26 +191,23 @@ def bin64_root(game_path: Path) -> Path:
         return game_path / "stillness" / "bin64"
 
 def load_built_fsd(game_path: Path, container: str, fsd_file: Path):
-    ext = ".pyd" if IS_WIN else ".so"
-    wanted = f"{container}loader{ext}".lower()
-
     root = bin64_root(game_path)
 
-    for p in root.rglob(f"*{ext}"):
-        if p.name.lower() == wanted:
-
-            sys.path.insert(0, str(root))
-            try:
-                spec = importlib.util.spec_from_file_location(p.stem, p)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+    # cached bin64 index instead of an rglob per container
+    p = find_loader(root, container)
+    if p is None:
+        return None
 
-                return module.load(str(fsd_file))
+    sys.path.insert(0, str(root))
+    try:
+        spec = importlib.util.spec_from_file_location(p.stem, p)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
 
-            finally:
-                sys.path.remove(str(root))
+        return module.load(str(fsd_file))
 
-    return None
+    finally:
+        sys.path.remove(str(root))
 
 def load_schema_fsd(game_path: Path, fsd_file: Path, schema_file: Path | None, container: str):
 
@@ -240,22 +327,6 @@ def normalize_localization(data):
 # RESFILEINDEX
 # ============================================================
 
-def load_resfileindex(index_path: Path):
-    mapping = {}
-    with index_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            if not( 
-                line.startswith("res:/staticdata/") or line.startswith("res:/localizationfsd/")
-            ):
-                continue
-            respath, folder, *_ = line.strip().split(",")
-            name = respath.replace("res:/staticdata/", "")
-            for ext in (".static", ".fsdbinary"):
-                if name.endswith(ext):
-                    name = name[:-len(ext)]
-            mapping[name] = folder
-    return mapping
-
 def resolve_paths(game_path, mapping, container):
     if container not in mapping:
         raise RuntimeError(f"No FSD file for container: {container}")
@@ -345,11 +416,13 @@ def main():
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    mapping = load_resfileindex(Path(args.index))
+    index = load_index(Path(args.index))
+    mapping = index.mapping()
     containers = [c.strip().lower() for c in args.containers.split(",") if c.strip()]
 
     for container in containers:
         print(f"[INFO] Processing container: {container}")
+        PLAN_STATS.update(hits=0, misses=0, dir_calls=0)
         fsd_file, schema = resolve_paths(game_path, mapping, container)
         data = load_fsd_data(game_path, container, fsd_file, schema)
 
@@ -367,9 +440,11 @@ def main():
             json.dump(clean, f, ensure_ascii=False, indent=2)
 
         print(f"[OK] {container} → {out}")
+        print(f"[INFO] {plan_stats_line()}")
 
-    # Localization extraction (Windows-only)
-    extract_localization_pickle(game_path, mapping, out_dir)
+    # Localization extraction (Windows-only), matched on the full respath
+    respaths = {respath: row[1] for respath, row in index.rows.items()}
+    extract_localization_pickle(game_path, respaths, out_dir)
 
 if __name__ == "__main__":
     main()
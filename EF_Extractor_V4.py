@@ -7,12 +7,53 @@ Windows + macOS compatible
 """
 
 import argparse
+import hashlib
 import json
+import math
+import multiprocessing
+import multiprocessing.connection as mp_connection
+import operator
+import os
+import re
+import shutil
 import sys
+import time
 import importlib.util
 import pickle
 from pathlib import Path
 
+from loader_index import find_loader
+from loader_profile import (
+    LOADER_PATHS,
+    load_profile,
+    profiled_loader,
+    save_profile,
+)
+from localization_store import (
+    JSON_NAME,
+    LANGUAGES_STORE_NAME,
+    STORE_NAME,
+    display_text,
+    write_language_store,
+    write_store,
+)
+from record_hashes import hashes_path, tap_hashes, write_hashes
+from resfileindex import load_index
+from schema_extractors import schema_extractor
+from record_io import (
+    FORMATS,
+    container_path,
+    file_format,
+    indexed_records,
+    iter_file,
+    open_text,
+    value_records,
+    write_records,
+    write_value,
+    zstandard,
+)
+from sqlite_sink import SqliteSink
+
 IS_MAC = sys.platform == "darwin"
 IS_WIN = sys.platform.startswith("win")
 
@@ -55,11 +96,351 @@ def resfiles_root(game_path: Path):
 # MATERIALIZE
 # ------------------------------------------------------------
 
+# Accessor plans: for each CCP class, the data attributes of its instances
+# and an operator.attrgetter that reads them all in one call. Methods and
+# attributes holding callables are dropped once, when the plan is built,
+# so a later instance costs one attrgetter call instead of a getattr /
+# callable() / try per attribute.
+#
+# What identifies an instance's attribute names, i.e. its plan:
+#   fixed  no instance __dict__, no custom __dir__: the class alone
+#   dict   instance __dict__: the class and the __dict__ keys
+#   dir    custom __dir__: its raw listing. Generic FSD object classes list
+#          their schema's fields this way, so instances of one class differ
+#          (a region and a planet) and nothing cheaper tells them apart. The
+#          listing is not sorted, and dir() itself only runs on a plan miss.
+_ACCESSOR_PLANS = {}
+_LAYOUTS = {}
+
+PLAN_STATS = {"hits": 0, "misses": 0, "dir_calls": 0}
+
+
+def class_layout(cls):
+
+    layout = _LAYOUTS.get(cls)
+
+    if layout is None:
+
+        if cls.__dir__ is not object.__dir__:
+            layout = "dir"
+        elif cls.__dictoffset__:
+            layout = "dict"
+        else:
+            layout = "fixed"
+
+        _LAYOUTS[cls] = layout
+
+    return layout
+
+
+def list_attributes(obj):
+
+    PLAN_STATS["dir_calls"] += 1
+
+    return tuple(dir(obj))
+
+
+def plan_key(obj, cls):
+
+    layout = class_layout(cls)
+
+    try:
+        if layout == "dict":
+            return cls, tuple(obj.__dict__)
+
+        if layout == "dir":
+            return cls, tuple(obj.__dir__())
+
+    except Exception:
+        return cls, list_attributes(obj)
+
+    return cls
+
+
+def build_plan(obj, cls):
+
+    fields = []
+    fragile = False
+
+    for attr in list_attributes(obj):
+
+        # Methods live on the class; skipping them here avoids creating a
+        # bound method just to throw it away.
+        if attr.startswith("_") or callable(getattr(cls, attr, None)):
+            continue
+
+        try:
+            val = getattr(obj, attr)
+        except Exception:
+            # may only fail on this instance; such classes read one by one
+            fragile = True
+            fields.append(attr)
+            continue
+
+        if not callable(val):
+            fields.append(attr)
+
+    fields = tuple(fields)
+
+    if fragile or not fields:
+        read = None
+    elif len(fields) == 1:
+        get = operator.attrgetter(fields[0])
+        read = lambda o: (get(o),)
+    else:
+        read = operator.attrgetter(*fields)
+
+    return fields, read
+
+
+def accessor_plan(obj):
+    """
+    (fields, read) for obj: its data attribute names in dir() order, and
+    read(obj) returning their values as a tuple (None: read them one by one).
+    """
+
+    cls = type(obj)
+
+    key = plan_key(obj, cls)
+
+    plan = _ACCESSOR_PLANS.get(key)
+
+    if plan is not None:
+        PLAN_STATS["hits"] += 1
+        return plan
+
+    PLAN_STATS["misses"] += 1
+
+    plan = _ACCESSOR_PLANS[key] = build_plan(obj, cls)
+
+    return plan
+
+
+def read_attributes(obj):
+
+    fields, read = accessor_plan(obj)
+
+    if read is not None:
+        try:
+            return {attr: materialize(val) for attr, val in zip(fields, read(obj))}
+        except Exception:
+            # an attribute that fails on this instance only
+            pass
+
+    out = {}
+
+    for attr in fields:
+        try:
+            out[attr] = materialize(getattr(obj, attr))
+        except Exception:
+            continue
+
+    return out
+
+
+def plan_stats_line():
+
+    hits = PLAN_STATS["hits"]
+    misses = PLAN_STATS["misses"]
+    total = hits + misses
+    rate = hits / total * 100 if total else 0.0
+
+    return (
+        f"accessor plans: {hits} hits, {misses} misses ({rate:.1f}% hit rate, "
+        f"{len(_ACCESSOR_PLANS)} plans, {PLAN_STATS['dir_calls']} dir() calls)"
+    )
+
+
+# --dedup: small all-scalar dicts / lists (positions, statistics) that
+# repeat within one record are built once and the same result is used for
+# every occurrence. json.dump writes shared values out in full, so the
+# output is unchanged.
+#
+# Off by default: on the benchmark containers the memo costs more time
+# than it saves and does not lower peak memory (see dedup_stats_line()).
+DEDUP = False
+
+# hash of a small all-scalar dict / list -> result, cleared by end_record()
+_CONTENT_MEMO = {}
+
+# ids of the objects being expanded right now, for cycle detection
+_ACTIVE = set()
+
+SMALL_BLOCK = 16
+
+SCALARS = (str, int, float, bool)
+
+DEDUP_STATS = {
+    "content_hits": 0,
+    "objects_saved": 0,
+    "bytes_saved": 0,
+    "memo_bytes": 0,
+    "cycles": 0,
+}
+
+
+def set_dedup(enabled):
+
+    global DEDUP
+
+    DEDUP = bool(enabled)
+
+
+def reset_materialize_stats():
+
+    PLAN_STATS.update(hits=0, misses=0, dir_calls=0)
+
+    for key in DEDUP_STATS:
+        DEDUP_STATS[key] = 0
+
+    _CONTENT_MEMO.clear()
+    _ACTIVE.clear()
+
+
+def end_record():
+    """Drop the content memo once a record is built, keeping its peak size."""
+
+    if _CONTENT_MEMO:
+        size = sys.getsizeof(_CONTENT_MEMO) + sum(sys.getsizeof(key) for key in _CONTENT_MEMO)
+        DEDUP_STATS["memo_bytes"] = max(DEDUP_STATS["memo_bytes"], size)
+        _CONTENT_MEMO.clear()
+
+
+def subtree_size(value):
+    """(containers, approximate bytes) of a materialized value."""
+
+    objects = 0
+    size = 0
+    stack = [value]
+
+    while stack:
+
+        v = stack.pop()
+        size += sys.getsizeof(v)
+
+        if isinstance(v, dict):
+            objects += 1
+            stack.extend(v.values())
+        elif isinstance(v, list):
+            objects += 1
+            stack.extend(v)
+
+    return objects, size
+
+
+def count_saved(value):
+
+    objects, size = subtree_size(value)
+
+    DEDUP_STATS["objects_saved"] += objects
+    DEDUP_STATS["bytes_saved"] += size
+
+
+def scalar_values(value):
+    """The values of a small dict / list of scalars, else None."""
+
+    if type(value) is dict:
+        values = value.values()
+    elif type(value) is list:
+        values = value
+    else:
+        return None
+
+    if len(value) > SMALL_BLOCK:
+        return None
+
+    for v in values:
+
+        if v.__class__ is float:
+            # -0.0 == 0.0 but is written differently
+            if not v and math.copysign(1.0, v) < 0:
+                return None
+
+        elif v is not None and v.__class__ not in (str, int, bool):
+            return None
+
+    return values
+
+
+def same_block(a, b):
+
+    # == alone treats 1, 1.0 and True as equal
+    if type(a) is not type(b) or a != b:
+        return False
+
+    if type(a) is dict:
+        return all(v.__class__ is b[k].__class__ for k, v in a.items())
+
+    return all(x.__class__ is y.__class__ for x, y in zip(a, b))
+
+
+def share_block(value):
+
+    values = scalar_values(value)
+
+    if values is None:
+        return value
+
+    if type(value) is dict:
+        key = hash((tuple(value), tuple(values)))
+    else:
+        key = hash(tuple(values))
+
+    shared = _CONTENT_MEMO.get(key)
+
+    if shared is not None and same_block(shared, value):
+        DEDUP_STATS["content_hits"] += 1
+        count_saved(shared)
+        return shared
+
+    if shared is None:
+        _CONTENT_MEMO[key] = value
+
+    return value
+
+
+def dedup_stats_line():
+
+    if not DEDUP:
+        return f"dedup: off, {DEDUP_STATS['cycles']} cycles"
+
+    saved = DEDUP_STATS["bytes_saved"]
+    memo = DEDUP_STATS["memo_bytes"]
+
+    return (
+        f"dedup: {DEDUP_STATS['content_hits']} identical blocks, "
+        f"{DEDUP_STATS['objects_saved']} objects / {saved / 1024:.1f} KiB not rebuilt, "
+        f"memo up to {memo / 1024:.1f} KiB, net {(saved - memo) / 1024:.1f} KiB, "
+        f"{DEDUP_STATS['cycles']} cycles"
+    )
+
+
 def materialize(obj):
 
-    if obj is None or isinstance(obj, (str, int, float, bool)):
+    if obj is None or isinstance(obj, SCALARS):
         return obj
 
+    oid = id(obj)
+
+    if oid in _ACTIVE:
+        DEDUP_STATS["cycles"] += 1
+        return f"<cycle: {type(obj).__name__}>"
+
+    _ACTIVE.add(oid)
+
+    try:
+        out = materialize_node(obj)
+    finally:
+        _ACTIVE.discard(oid)
+
+    if DEDUP:
+        out = share_block(out)
+
+    return out
+
+
+def materialize_node(obj):
+
     if hasattr(obj, "items"):
         return {str(k): materialize(v) for k, v in obj.items()}
 
@@ -70,34 +451,155 @@ def materialize(obj):
 
     if name and name not in ("list", "tuple"):
 
-        out = {}
+        out = read_attributes(obj)
 
-        for attr in dir(obj):
+        if out:
+            return out
 
-            if attr.startswith("_"):
-                continue
+    if hasattr(obj, "__iter__") and not isinstance(obj, (str, bytes)):
+        try:
+            return [materialize(x) for x in obj]
+        except Exception:
+            pass
 
-            try:
-                val = getattr(obj, attr)
+    return str(obj)
+
+
+# ------------------------------------------------------------
+# FIELD PROJECTION
+# ------------------------------------------------------------
+
+def build_projection(paths):
+    """
+    Turn dotted attribute paths into a projection tree.
+
+    ["planets.*.statistics.temperature", "star"] becomes
+    {"planets": {"*": {"statistics": {"temperature": None}}}, "star": None}
+    where None means "keep the whole subtree" and "*" matches every key
+    of a dict-like container, every attribute of an object, or every
+    item of a list.
+    """
+
+    tree = {}
+
+    for path in paths:
+
+        node = tree
+        parts = path.split(".")
+
+        for i, part in enumerate(parts):
+
+            if i == len(parts) - 1:
+                node[part] = None
+                break
+
+            child = node.get(part, {})
+
+            # A shorter path already keeps this whole subtree.
+            if child is None:
+                break
+
+            node[part] = child
+            node = child
+
+    return tree
+
+
+def lookup_key(obj, key):
+
+    try:
+        return obj[int(key)] if key.isdigit() else obj[key]
+    except (KeyError, IndexError, TypeError):
+        return obj[key]
 
-                if callable(val):
-                    continue
 
-                out[attr] = materialize(val)
+def materialize_projected(obj, tree):
+    """
+    materialize() restricted to a projection tree.
 
+    Only the attributes named in the tree are read; nothing else on the
+    object is touched, not even through dir().
+    """
+
+    if tree is None:
+        return materialize(obj)
+
+    if obj is None or isinstance(obj, SCALARS):
+        return obj
+
+    if hasattr(obj, "items"):
+
+        if "*" in tree:
+            return {
+                str(k): materialize_projected(v, tree.get(str(k), tree["*"]))
+                for k, v in obj.items()
+            }
+
+        out = {}
+
+        for key, sub in tree.items():
+            try:
+                out[key] = materialize_projected(lookup_key(obj, key), sub)
             except Exception:
                 continue
 
-        if out:
-            return out
+        return out
+
+    if isinstance(obj, (list, tuple)):
+        sub = tree.get("*", tree)
+        return [materialize_projected(x, sub) for x in obj]
+
+    if "*" in tree:
+        names = sorted(set(accessor_plan(obj)[0]) | (set(tree) - {"*"}))
+    else:
+        # dir() order, so projected records keep materialize()'s key order
+        names = sorted(tree)
+
+    out = {}
+
+    for attr in names:
 
-    if hasattr(obj, "__iter__") and not isinstance(obj, (str, bytes)):
         try:
-            return [materialize(x) for x in obj]
+            val = getattr(obj, attr)
+
+            if callable(val):
+                continue
+
+            out[attr] = materialize_projected(val, tree.get(attr, tree.get("*")))
+
         except Exception:
-            pass
+            continue
 
-    return str(obj)
+    return out
+
+
+def parse_fields(lines):
+    """
+    Parse "container: path, path" lines into {container: [paths]}.
+
+    Blank lines and # comments are ignored; a container may appear on
+    several lines.
+    """
+
+    spec = {}
+
+    for line in lines:
+
+        line = line.split("#", 1)[0].strip()
+
+        if not line:
+            continue
+
+        container, sep, paths = line.partition(":")
+
+        if not sep:
+            raise ValueError(f"bad field spec {line!r} (expected 'container: path, path')")
+
+        spec.setdefault(container.strip(), []).extend(
+            p.strip() for p in paths.split(",") if p.strip()
+        )
+
+    return spec
 
 
 # ------------------------------------------------------------
@@ -106,39 +608,36 @@ def materialize(obj):
 
 def load_built_fsd(game_path: Path, container: str, fsd_file: Path):
 
-    ext = ".pyd" if IS_WIN else ".so"
-    wanted = f"{container}loader{ext}".lower()
-
     root = bin64_root(game_path)
 
-    for p in root.rglob(f"*{ext}"):
-
-        if p.name.lower() == wanted:
+    p = find_loader(root, container)
 
-            sys.path.insert(0, str(root))
+    if p is None:
+        return None
 
-            try:
-                spec = importlib.util.spec_from_file_location(p.stem, p)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+    sys.path.insert(0, str(root))
 
-                return module.load(str(fsd_file))
+    try:
+        spec = importlib.util.spec_from_file_location(p.stem, p)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
 
-            finally:
-                sys.path.remove(str(root))
+        return module.load(str(fsd_file))
 
-    return None
+    finally:
+        sys.path.remove(str(root))
 
 
-def load_schema_fsd(game_path: Path, fsd_file: Path, schema_file: Path | None):
+def load_schema_fsd(game_path: Path, fsd_file: Path, schema_file: Path | None, optimized=None):
 
     sys.path.insert(0, str(codeccp_root(game_path)))
 
     try:
         from fsd.schemas.binaryLoader import LoadFSDDataInPython
 
-        # fsdbinary → optimized
-        optimized = fsd_file.name.endswith(".fsdbinary")
+        if optimized is None:
+            # fsdbinary → optimized
+            optimized = fsd_file.name.endswith(".fsdbinary")
 
         return LoadFSDDataInPython(
             str(fsd_file),
@@ -151,8 +650,46 @@ def load_schema_fsd(game_path: Path, fsd_file: Path, schema_file: Path | None):
         sys.path.remove(str(codeccp_root(game_path)))
 
 
+def default_loader(game_path, container, fsd_file):
+    """The loader path load_fsd() takes without a profile."""
+
+    if find_loader(bin64_root(game_path), container) is not None:
+        return "built"
+
+    if Path(fsd_file).name.endswith(".fsdbinary"):
+        return "schema-optimized"
+
+    return "schema"
+
+
+def load_with(loader, game_path, container, fsd_file, schema_file):
+    """Load through one loader path; None if it has no BUILT loader."""
+
+    if loader == "built":
+        return load_built_fsd(game_path, container, fsd_file)
+
+    return load_schema_fsd(
+        game_path, fsd_file, schema_file, optimized=loader == "schema-optimized"
+    )
+
+
 def load_fsd(game_path, container, fsd_file, schema_file):
 
+    loader = profiled_loader(bin64_root(game_path), container)
+
+    if loader is not None:
+
+        print("   LOADER:", loader, "(calibrated)")
+
+        try:
+            data = load_with(loader, game_path, container, fsd_file, schema_file)
+        except Exception as exc:
+            print(f"[WARN] {container}: {loader} loader failed ({type(exc).__name__}: {exc}), recalibrate")
+            data = None
+
+        if data is not None:
+            return data
+
     data = load_built_fsd(game_path, container, fsd_file)
 
     if data is not None:
@@ -161,9 +698,9 @@ def load_fsd(game_path, container, fsd_file, schema_file):
     return load_schema_fsd(game_path, fsd_file, schema_file)
 
 
-def load_fsd_data(game_path, container, fsd_file, schema_file):
+def load_fsd_data(game_path, container, fsd_file, schema_file, load=load_fsd):
 
-    data = load_fsd(game_path, container, fsd_file, schema_file)
+    data = load(game_path, container, fsd_file, schema_file)
 
     if hasattr(data, "items"):
         return {k: v for k, v in data.items()}
@@ -172,104 +709,407 @@ def load_fsd_data(game_path, container, fsd_file, schema_file):
 
 
 # ------------------------------------------------------------
-# RESFILEINDEX
+# OUTPUT
 # ------------------------------------------------------------
 
-def load_resfileindex(index_path: Path):
+def iter_records(data, projection=None, extractor=None):
 
-    mapping = {}
+    for k, v in data.items():
 
-    with index_path.open("r", encoding="utf-8") as f:
+        if projection is not None:
+            record = materialize_projected(v, projection)
+        elif extractor is not None:
+            record = extractor(v)
+        else:
+            record = materialize(v)
 
-        for line in f:
+        end_record()
 
-            if not (
-                line.startswith("res:/staticdata/")
-                or line.startswith("res:/localizationfsd/")
-            ):
-                continue
+        yield str(k), record
 
-            respath, folder, *_ = line.strip().split(",")
 
-            name = respath.split("/")[-1]
+def write_container(
+    data,
+    out: Path,
+    stream=False,
+    projection=None,
+    message_ids=None,
+    extractor=None,
+    hashes=None,
+):
+    """
+    Write a container in the format given by the output file name.
 
-            if name.endswith(".static"):
-                key = name[:-7]
+    With stream (always for ndjson), only the record being written is
+    materialized, so peak memory follows the largest record instead of the
+    whole container. JSON text is the same either way.
 
-            elif name.endswith(".fsdbinary"):
-                key = name[:-10]
+    If message_ids is a set, the localization IDs the records refer to are
+    added to it on the way out. extractor (a schema_extractors
+    RecordExtractor) replaces materialize() per record. If hashes is a
+    dict, it receives {key: content hash} for every record.
+    """
 
-            elif name.endswith(".schema"):
-                key = name[:-7] + ".schema"
+    fmt = file_format(out)
 
-            else:
-                key = name
+    with open_text(out, "w") as f:
 
-            mapping[key] = folder
+        if not hasattr(data, "items"):
+            value = materialize_projected(data, projection)
+            end_record()
 
-    return mapping
+            if hashes is not None:
+                for _ in tap_hashes(indexed_records(value), hashes):
+                    pass
 
+            write_value(f, value, fmt)
 
-def resolve_paths(game_path, mapping, container):
+        elif stream or projection is not None or fmt.startswith("ndjson"):
 
-    if container not in mapping:
-        raise RuntimeError(f"No FSD file for container: {container}")
+            records = iter_records(data, projection, extractor)
 
-    fsd_file = resfiles_root(game_path) / mapping[container]
+            if message_ids is not None:
+                records = tap_message_ids(records, message_ids)
 
-    schema = None
-    schema_key = f"{container}.schema"
+            if hashes is not None:
+                records = tap_hashes(records, hashes)
 
-    if schema_key in mapping:
-        schema = resfiles_root(game_path) / mapping[schema_key]
+            write_records(f, records, fmt)
 
-    print("   FSD:", fsd_file)
-    print("   SCHEMA:", schema)
+        else:
+            value = dict(iter_records(data, extractor=extractor))
 
-    return fsd_file, schema
+            if message_ids is not None:
+                for _ in tap_message_ids(value.items(), message_ids):
+                    pass
+
+            if hashes is not None:
+                for _ in tap_hashes(value.items(), hashes):
+                    pass
+
+            json.dump(value, f, ensure_ascii=False, indent=2)
 
 
 # ------------------------------------------------------------
-# LOCALIZATION
+# CHUNKED EXTRACTION
 # ------------------------------------------------------------
+# --chunk-size N: the container is read N keys at a time. Each chunk is
+# written to output/.partial/<container>/ as NDJSON and recorded in a
+# checkpoint, so an interrupted run resumes after the last complete
+# chunk. The final file is assembled from the chunks at the end.
 
-def normalize_localization(data):
+PARTIAL_DIR = ".partial"
+CHECKPOINT_NAME = "checkpoint.json"
 
-    if isinstance(data, dict):
-        return data
 
-    if isinstance(data, tuple):
-        for item in data:
-            if isinstance(item, dict):
-                return item
-            if isinstance(item, list):
-                try:
-                    return dict(item)
-                except Exception:
-                    pass
+class KeyChunk:
+    """The records of some keys of a loader container, read on access."""
 
-    if isinstance(data, list):
-        try:
-            return dict(data)
-        except Exception:
-            pass
+    def __init__(self, data, keys):
+        self.data = data
+        self.keys = keys
 
-    raise RuntimeError(
+    def items(self):
+        for key in self.keys:
+            yield key, self.data[key]
+
+
+def container_keys(data):
+
+    if hasattr(data, "keys"):
+        return list(data.keys())
+
+    # values are dropped as soon as they are read
+    return [k for k, _ in data.items()]
+
+
+def read_checkpoint(path: Path, source, settings):
+
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if checkpoint.get("source") != source or checkpoint.get("settings") != settings:
+        return None
+
+    return checkpoint
+
+
+def write_checkpoint(path: Path, checkpoint):
+
+    tmp = path.with_name(path.name + ".tmp")
+
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+
+    tmp.replace(path)
+
+
+def chunk_path(work: Path, i):
+    return work / f"chunk_{i:06d}.ndjson"
+
+
+def write_chunked(
+    data,
+    out: Path,
+    container,
+    source,
+    chunk_size,
+    projection=None,
+    message_ids=None,
+    extractor=None,
+    hashes=None,
+):
+    """
+    write_container() for a dict-like loader container, chunk by chunk
+    with checkpoints. source identifies the resfile; a checkpoint from a
+    different resfile or different settings is discarded.
+    """
+
+    work = out.parent / PARTIAL_DIR / container
+    checkpoint_file = work / CHECKPOINT_NAME
+
+    settings = {
+        "chunk_size": chunk_size,
+        "projection": projection,
+        "schema_extractor": extractor is not None,
+        "message_ids": message_ids is not None,
+        "hashes": hashes is not None,
+    }
+
+    keys = container_keys(data)
+    total = -(-len(keys) // chunk_size)
+
+    # the chunks are only valid for the same keys in the same order
+    keys_digest = hashlib.sha1(repr(keys).encode("utf-8")).hexdigest()
+
+    checkpoint = read_checkpoint(checkpoint_file, source, settings)
+
+    if checkpoint is not None and checkpoint["keys"] != keys_digest:
+        checkpoint = None
+
+    if checkpoint is None:
+        shutil.rmtree(work, ignore_errors=True)
+        work.mkdir(parents=True)
+        checkpoint = {"source": source, "settings": settings, "keys": keys_digest, "chunks": 0}
+        write_checkpoint(checkpoint_file, checkpoint)
+    else:
+        print(f"[INFO] {container}: resuming after chunk {checkpoint['chunks']} of {total}")
+
+    for i in range(checkpoint["chunks"], total):
+
+        chunk = KeyChunk(data, keys[i * chunk_size:(i + 1) * chunk_size])
+
+        chunk_ids = set() if message_ids is not None else None
+        chunk_hashes = {} if hashes is not None else None
+
+        records = iter_records(chunk, projection, extractor)
+
+        if chunk_ids is not None:
+            records = tap_message_ids(records, chunk_ids)
+
+        if chunk_hashes is not None:
+            records = tap_hashes(records, chunk_hashes)
+
+        path = chunk_path(work, i)
+        tmp = path.with_name(path.name + ".tmp")
+
+        with tmp.open("w", encoding="utf-8") as f:
+            write_records(f, records, "ndjson")
+
+            # IDs / hashes of the chunk, so a resumed run does not need
+            # to read the chunk again
+            f.write(json.dumps({
+                "chunk": i,
+                "message_ids": sorted(chunk_ids) if chunk_ids is not None else None,
+                "hashes": chunk_hashes,
+            }))
+            f.write("\n")
+
+        tmp.replace(path)
+
+        checkpoint["chunks"] = i + 1
+        write_checkpoint(checkpoint_file, checkpoint)
+
+        print(f"[INFO] {container}: chunk {i + 1} of {total} written")
+
+    def assembled():
+
+        for i in range(checkpoint["chunks"]):
+
+            with chunk_path(work, i).open("r", encoding="utf-8") as f:
+
+                for line in f:
+
+                    row = json.loads(line)
+
+                    if "chunk" in row:
+                        if message_ids is not None:
+                            message_ids.update(row["message_ids"])
+                        if hashes is not None:
+                            hashes.update(row["hashes"])
+                        continue
+
+                    yield row["id"], row["record"]
+
+    with open_text(out, "w") as f:
+        write_records(f, assembled(), file_format(out))
+
+    shutil.rmtree(work, ignore_errors=True)
+
+    try:
+        (out.parent / PARTIAL_DIR).rmdir()
+    except OSError:
+        pass  # other containers still have chunks
+
+
+def remove_other_formats(out: Path, container: str):
+
+    for fmt in FORMATS:
+
+        other = container_path(out.parent, container, fmt)
+
+        if other != out and other.exists():
+            other.unlink()
+            print("[INFO] Removed old output:", other.name)
+
+
+# ------------------------------------------------------------
+# RESFILEINDEX
+# ------------------------------------------------------------
+
+def resolve_paths(game_path, mapping, container):
+
+    if container not in mapping:
+        raise RuntimeError(f"No FSD file for container: {container}")
+
+    fsd_file = resfiles_root(game_path) / mapping[container]
+
+    schema = None
+    schema_key = f"{container}.schema"
+
+    if schema_key in mapping:
+        schema = resfiles_root(game_path) / mapping[schema_key]
+
+    print("   FSD:", fsd_file)
+    print("   SCHEMA:", schema)
+
+    return fsd_file, schema
+
+
+# ------------------------------------------------------------
+# LOCALIZATION
+# ------------------------------------------------------------
+
+def normalize_localization(data):
+
+    if isinstance(data, dict):
+        return data
+
+    if isinstance(data, tuple):
+        for item in data:
+            if isinstance(item, dict):
+                return item
+            if isinstance(item, list):
+                try:
+                    return dict(item)
+                except Exception:
+                    pass
+
+    if isinstance(data, list):
+        try:
+            return dict(data)
+        except Exception:
+            pass
+
+    raise RuntimeError(
         f"Unsupported localization pickle format: {type(data)}"
     )
 
-def extract_localization(game_path: Path, mapping: dict, out_dir: Path):
+LANGUAGE_KEY = re.compile(r"localization_fsd_([A-Za-z0-9_-]+)\.")
+
+# Record fields whose values are localization message IDs
+LOCALIZATION_ID_FIELDS = ("typeNameID", "nameID", "descriptionID")
+
+
+def tap_message_ids(records, message_ids):
+    """Pass (key, record) pairs through, collecting their message IDs."""
+
+    for key, record in records:
+
+        if isinstance(record, dict):
+
+            for field in LOCALIZATION_ID_FIELDS:
+
+                value = record.get(field)
+
+                if isinstance(value, int) and not isinstance(value, bool):
+                    message_ids.add(value)
+                elif isinstance(value, str) and value.isdigit():
+                    message_ids.add(int(value))
+
+        yield key, record
+
+
+def prune_localization(clean, message_ids):
+    """
+    Keep only the referenced messages, plus the messages that a kept
+    entry points to through a numeric token (what the converters'
+    resolve_localized_text() dereferences).
+    """
+
+    keep = {str(mid) for mid in message_ids}
+
+    for key in list(keep):
+
+        text = display_text(clean.get(key))
+
+        if isinstance(text, str) and text.isdigit():
+            keep.add(text)
+
+    return {k: v for k, v in clean.items() if k in keep}
 
-    loc_key = None
+
+def message_ids_digest(message_ids):
+
+    h = hashlib.sha1()
+
+    for mid in sorted(message_ids):
+        h.update(b"%d," % mid)
+
+    return h.hexdigest()
+
+
+def find_localization_key(mapping: dict, language="en-us"):
 
     for k in mapping:
-        if "localization_fsd_en-us" in k:
-            loc_key = k
-            break
+        if f"localization_fsd_{language}." in k:
+            return k
+
+    return None
+
+
+def available_languages(mapping: dict):
+
+    languages = set()
+
+    for k in mapping:
+        m = LANGUAGE_KEY.search(k)
+        if m:
+            languages.add(m.group(1))
+
+    return sorted(languages)
+
+
+def load_localization(game_path: Path, mapping: dict, language="en-us"):
+
+    loc_key = find_localization_key(mapping, language)
 
     if not loc_key:
-        print("[WARN] localization not found")
-        return
+        print(f"[WARN] localization ({language}) not found")
+        return None
 
     path = game_path / "ResFiles" / mapping[loc_key]
 
@@ -282,17 +1122,687 @@ def extract_localization(game_path: Path, mapping: dict, out_dir: Path):
         data = normalize_localization(raw)
     except Exception as exc:
         print("[WARN] localization pickle format unexpected:", exc)
-        return
+        return None
+
+    return {str(k): v for k, v in data.items()}
+
+
+def extract_localization(game_path: Path, mapping: dict, out_dir: Path, message_ids=None):
+
+    clean = load_localization(game_path, mapping)
 
-    clean = {str(k): v for k, v in data.items()}
+    if clean is None:
+        return None
 
-    out = out_dir / "localization.json"
+    if message_ids is not None:
+
+        total = len(clean)
+        clean = prune_localization(clean, message_ids)
+
+        print(f"[INFO] localization pruned to {len(clean)} of {total} entries")
+
+    out = out_dir / JSON_NAME
 
     with out.open("w", encoding="utf-8") as f:
         json.dump(clean, f, ensure_ascii=False, indent=2)
 
     print("[OK] localization →", out)
 
+    # Indexed copy of the display texts, for the converters
+    store = out_dir / STORE_NAME
+    count = write_store(store, clean)
+
+    print(f"[OK] localization store → {store} ({count} entries)")
+
+    return out
+
+
+# ------------------------------------------------------------
+# MANIFEST
+# ------------------------------------------------------------
+
+MANIFEST_NAME = "manifest.json"
+
+
+def load_manifest(out_dir: Path):
+
+    path = out_dir / MANIFEST_NAME
+
+    if path.exists():
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if isinstance(manifest.get("containers"), dict):
+                return manifest
+        except (OSError, ValueError) as exc:
+            print("[WARN] ignoring unreadable manifest:", exc)
+
+    return {"version": 1, "containers": {}}
+
+
+def save_manifest(out_dir: Path, manifest):
+
+    path = out_dir / MANIFEST_NAME
+    tmp = path.with_name(path.name + ".tmp")
+
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    tmp.replace(path)
+
+
+def resfile_fingerprint(entries, key):
+    """
+    Identify the resfile (and schema) a container is built from.
+
+    The folder is part of the fingerprint because resfile folders embed the
+    content hash; it keeps old indexes without a hash column working.
+    """
+
+    entry = entries.get(key)
+
+    if entry is None:
+        return None
+
+    schema = entries.get(f"{key}.schema")
+
+    return {
+        "folder": entry["folder"],
+        "hash": entry["hash"],
+        "size": entry["size"],
+        "schema_hash": (schema["hash"] or schema["folder"]) if schema else None,
+    }
+
+
+def is_up_to_date(manifest, out_dir: Path, name, fingerprint, output, settings=None):
+
+    if fingerprint is None:
+        return False
+
+    recorded = manifest["containers"].get(name)
+
+    if not recorded or recorded.get("resfile") != fingerprint:
+        return False
+
+    # Same resfile but a different --format still needs a new file.
+    if recorded.get("output") != output:
+        return False
+
+    # --fields projection, localization pruning, ...
+    if recorded.get("settings") != settings:
+        return False
+
+    return (out_dir / recorded["output"]).exists()
+
+
+def record_extraction(manifest, name, fingerprint, out, settings=None, cost=None):
+
+    manifest["containers"][name] = {
+        "resfile": fingerprint,
+        "output": Path(out).name,
+        "settings": settings,
+        # {"bytes", "seconds"} of this run, for later cost estimates
+        "cost": cost,
+        "extracted_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+# ------------------------------------------------------------
+# EXTRACTION
+# ------------------------------------------------------------
+
+def extract_container(game_path, mapping, container, out_dir, options, load=load_fsd):
+    """
+    Extract one container to out_dir.
+
+    load(game_path, container, fsd_file, schema) returns the loader data;
+    extract_server.py passes one that reuses already opened containers.
+    """
+
+    print("[INFO] Processing:", container)
+
+    set_dedup(options.get("dedup", False))
+    reset_materialize_stats()
+
+    start = time.perf_counter()
+
+    fsd_file, schema = resolve_paths(game_path, mapping, container)
+
+    out = container_path(out_dir, container, options["format"])
+
+    projection = options["projections"].get(container)
+
+    chunk_size = options.get("chunk_size")
+
+    stream = (
+        options["stream"]
+        or chunk_size
+        or projection is not None
+        or options["format"].startswith("ndjson")
+    )
+
+    if stream:
+        data = load(game_path, container, fsd_file, schema)
+    else:
+        data = load_fsd_data(game_path, container, fsd_file, schema, load)
+
+    message_ids = set() if options["prune_localization"] else None
+
+    extractor = None
+
+    if projection is None and options.get("schema_extractors", True):
+        extractor = schema_extractor(container, schema, materialize)
+
+    hashes = {} if options.get("hashes", True) else None
+
+    if chunk_size and hasattr(data, "items"):
+
+        st = fsd_file.stat()
+
+        source = {
+            "resfile": str(fsd_file),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "schema": str(schema) if schema else None,
+        }
+
+        write_chunked(
+            data, out, container, source, chunk_size,
+            projection, message_ids, extractor, hashes,
+        )
+
+    else:
+        write_container(data, out, stream, projection, message_ids, extractor, hashes)
+
+    remove_other_formats(out, container)
+
+    sidecar = hashes_path(out_dir, container)
+
+    if hashes is not None:
+        write_hashes(sidecar, container, hashes)
+    elif sidecar.exists():
+        # would describe an older extraction
+        sidecar.unlink()
+
+    print("[OK]", container, "→", out)
+    print("[INFO]", plan_stats_line())
+    print("[INFO]", dedup_stats_line())
+
+    if extractor is not None:
+        print("[INFO]", extractor.stats_line())
+
+    return {
+        "container": container,
+        "out": str(out),
+        "message_ids": sorted(message_ids) if message_ids is not None else None,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def resfile_size(game_path, mapping, container):
+
+    try:
+        return (resfiles_root(game_path) / mapping[container]).stat().st_size
+    except (KeyError, OSError):
+        return 0
+
+
+def worker_job(conn, func, args):
+
+    try:
+        conn.send(("ok", func(*args)))
+    except Exception as exc:
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+def extract_parallel(game_path, mapping, containers, out_dir, options, jobs):
+    """
+    Extract each container in its own worker process.
+
+    Every worker handles exactly one container and then exits, so the
+    CCP loader modules it imported are released with the process.
+    Containers are started in the order given (main() passes them most
+    expensive first). A failing or crashing worker is reported for its
+    container only; the rest of the run continues.
+    """
+
+    results = run_workers(
+        [
+            (c, extract_container, (game_path, mapping, c, out_dir, options))
+            for c in containers
+        ],
+        jobs,
+    )
+
+    return [(c, *results[c]) for c in containers]
+
+
+def run_workers(tasks, jobs):
+    """
+    Run (name, func, args) tasks in spawned worker processes, at most
+    jobs at a time, in the order given.
+
+    Returns {name: ("ok", result) | ("error", message)}.
+    """
+
+    ctx = multiprocessing.get_context("spawn")
+
+    pending = list(tasks)
+    running = {}
+    results = {}
+
+    while pending or running:
+
+        while pending and len(running) < jobs:
+
+            name, func, args = pending.pop(0)
+
+            recv_conn, send_conn = ctx.Pipe(duplex=False)
+
+            proc = ctx.Process(
+                target=worker_job,
+                args=(send_conn, func, args),
+                name=f"extract-{name}",
+            )
+            proc.start()
+            send_conn.close()
+
+            running[proc.sentinel] = (proc, recv_conn, name)
+
+            print(f"[INFO] Started {name} (pid {proc.pid})")
+
+        ready = mp_connection.wait(
+            [c for _, c, _ in running.values()] + list(running)
+        )
+
+        for sentinel, (proc, recv_conn, name) in list(running.items()):
+
+            if recv_conn in ready and name not in results:
+                try:
+                    results[name] = recv_conn.recv()
+                except EOFError:
+                    pass
+
+            if sentinel not in ready:
+                continue
+
+            proc.join()
+            recv_conn.close()
+            del running[sentinel]
+
+            if name not in results:
+                results[name] = (
+                    "error",
+                    f"worker exited with code {proc.exitcode}",
+                )
+
+    return results
+
+
+def language_job(game_path, mapping, language, message_ids):
+    """Load one language pickle and return {messageID: display text}."""
+
+    start = time.perf_counter()
+
+    clean = load_localization(game_path, mapping, language)
+
+    if clean is None:
+        raise RuntimeError(f"localization_fsd_{language} could not be loaded")
+
+    if message_ids is not None:
+        clean = prune_localization(clean, message_ids)
+
+    return {
+        "texts": {k: display_text(v) for k, v in clean.items()},
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def extract_languages(game_path, mapping, languages, out_dir: Path, message_ids, jobs):
+    """
+    Load every language pickle in its own worker process and merge them
+    into one (messageID, language) store.
+
+    Returns (output path or None, [failed languages]).
+    """
+
+    results = run_workers(
+        [
+            (f"localization-{lang}", language_job, (game_path, mapping, lang, message_ids))
+            for lang in languages
+        ],
+        jobs,
+    )
+
+    by_language = {}
+    failed = []
+
+    for lang in languages:
+
+        status, detail = results[f"localization-{lang}"]
+
+        if status == "ok":
+            by_language[lang] = detail["texts"]
+            print(f"   {lang:<24} OK     {detail['seconds']:8.1f}s  {len(detail['texts'])} entries")
+        else:
+            print(f"   {lang:<24} FAILED {detail}")
+            failed.append(lang)
+
+    if not by_language:
+        return None, failed
+
+    out = out_dir / LANGUAGES_STORE_NAME
+    count = write_language_store(out, by_language)
+
+    print(f"[OK] localization languages → {out} ({count} entries, {len(by_language)} languages)")
+
+    return out, failed
+
+
+# ------------------------------------------------------------
+# CALIBRATION
+# ------------------------------------------------------------
+
+# A path must beat the default one by this fraction to replace it, so
+# timing noise does not flip the profile between runs.
+CALIBRATION_MARGIN = 0.05
+
+
+def calibrate_job(game_path, mapping, container, loader):
+    """
+    Time one loader path on one container: load plus reading every
+    record. The output digest lets calibrate() reject paths that read the
+    data differently.
+    """
+
+    fsd_file, schema = resolve_paths(game_path, mapping, container)
+
+    reset_materialize_stats()
+
+    start = time.perf_counter()
+
+    data = load_with(loader, game_path, container, fsd_file, schema)
+
+    if data is None:
+        raise RuntimeError("no BUILT loader")
+
+    digest = hashlib.sha1()
+    records = 0
+    hashing = 0.0
+
+    if hasattr(data, "items"):
+        items = iter_records(data)
+    else:
+        items = [("", materialize(data))]
+        end_record()
+
+    for key, record in items:
+
+        t = time.perf_counter()
+        digest.update(json.dumps([key, record], ensure_ascii=False).encode("utf-8"))
+        hashing += time.perf_counter() - t
+
+        records += 1
+
+    return {
+        "seconds": time.perf_counter() - start - hashing,
+        "records": records,
+        "digest": digest.hexdigest(),
+    }
+
+
+def calibrate(game_path, mapping, containers):
+    """
+    Time every loader path on every container, one worker process per
+    trial (a loader that crashes only loses its own trial), and store the
+    fastest path that reads the same records as the default one.
+    """
+
+    bin64 = bin64_root(game_path)
+    profile = load_profile(bin64)
+
+    tasks = []
+    defaults = {}
+
+    for container in containers:
+
+        fsd_file = resfiles_root(game_path) / mapping[container]
+        defaults[container] = default_loader(game_path, container, fsd_file)
+
+        for loader in LOADER_PATHS:
+
+            if loader == "built" and defaults[container] != "built":
+                continue
+
+            tasks.append(
+                (f"{container}:{loader}", calibrate_job, (game_path, mapping, container, loader))
+            )
+
+    # one at a time, so trials do not slow each other down
+    results = run_workers(tasks, 1)
+
+    print()
+    print("[INFO] Loader calibration:")
+    print(f"   {'container':<32} {'loader':<18} {'seconds':>9} {'records':>9}")
+
+    for container in containers:
+
+        trials = {
+            loader: results[f"{container}:{loader}"]
+            for loader in LOADER_PATHS
+            if f"{container}:{loader}" in results
+        }
+
+        reference = trials.get(defaults[container])
+        reference = reference[1] if reference and reference[0] == "ok" else None
+
+        seconds = {}
+        errors = {}
+        candidates = []
+
+        for loader, (status, detail) in trials.items():
+
+            if status != "ok":
+                errors[loader] = detail
+                print(f"   {container:<32} {loader:<18} {'FAILED':>9}  {detail}")
+                continue
+
+            seconds[loader] = round(detail["seconds"], 4)
+
+            same = reference is None or (
+                detail["digest"] == reference["digest"]
+                and detail["records"] == reference["records"]
+            )
+
+            note = "" if same else "  (different records, not used)"
+            print(f"   {container:<32} {loader:<18} {detail['seconds']:9.3f} {detail['records']:>9}{note}")
+
+            if same:
+                candidates.append((detail["seconds"], loader))
+
+        if not candidates:
+            print(f"[WARN] {container}: no loader path worked; profile unchanged")
+            continue
+
+        fastest, best = min(candidates)
+
+        if reference is not None and fastest > reference["seconds"] * (1 - CALIBRATION_MARGIN):
+            best = defaults[container]
+
+        print(f"   {container:<32} → {best}")
+
+        profile["containers"][container] = {
+            "loader": best,
+            "default": defaults[container],
+            "seconds": seconds,
+            "errors": errors,
+            "calibrated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+    path = save_profile(bin64, profile)
+
+    print()
+    print("[OK] loader profile →", path)
+
+
+# ------------------------------------------------------------
+# SCHEDULING
+# ------------------------------------------------------------
+
+# Extraction throughput assumed before any run has been timed
+DEFAULT_RATE = 4 * 1024 * 1024
+
+
+def history_rate(manifest):
+    """Resfile bytes per second over every timed extraction in the manifest."""
+
+    total_bytes = 0
+    total_seconds = 0.0
+
+    for entry in manifest["containers"].values():
+
+        cost = entry.get("cost") or {}
+
+        if cost.get("bytes") and cost.get("seconds"):
+            total_bytes += cost["bytes"]
+            total_seconds += cost["seconds"]
+
+    if total_seconds > 0:
+        return total_bytes / total_seconds
+
+    return DEFAULT_RATE
+
+
+def estimate_costs(manifest, sizes):
+    """
+    Projected seconds per container.
+
+    A container extracted before is scaled from its own last run (the
+    resfile may have grown); others use the average rate of all timed
+    runs, or DEFAULT_RATE on the first run.
+    """
+
+    rate = history_rate(manifest)
+    costs = {}
+
+    for container, size in sizes.items():
+
+        entry = manifest["containers"].get(container) or {}
+        cost = entry.get("cost") or {}
+
+        if cost.get("bytes") and cost.get("seconds"):
+            costs[container] = cost["seconds"] * size / cost["bytes"]
+        else:
+            costs[container] = size / rate
+
+    return costs
+
+
+def projected_wall_time(costs, jobs):
+    """Wall time of running costs largest-first on jobs workers."""
+
+    workers = [0.0] * max(1, jobs)
+
+    for cost in sorted(costs, reverse=True):
+        i = workers.index(min(workers))
+        workers[i] += cost
+
+    return max(workers)
+
+
+def print_schedule(results, sizes, costs, jobs, wall_seconds):
+
+    print()
+    print("[INFO] Container results (projected vs actual):")
+    print(f"   {'container':<32} {'status':<7} {'MiB':>9} {'projected':>10} {'actual':>10}")
+
+    for container, status, detail in results:
+
+        actual = f"{detail['seconds']:9.2f}s" if status == "ok" else "-"
+
+        print(
+            f"   {container:<32} {'OK' if status == 'ok' else 'FAILED':<7} "
+            f"{sizes[container] / 2**20:9.1f} {costs[container]:9.2f}s {actual:>10}"
+        )
+
+        if status != "ok":
+            print(f"      {detail}")
+
+    projected = projected_wall_time([costs[c] for c, _, _ in results], jobs)
+
+    print(f"   {'total (wall)':<32} {'':<7} {sum(sizes.values()) / 2**20:9.1f} {projected:9.2f}s {wall_seconds:9.2f}s")
+    print()
+
+
+def parse_sink(spec: str):
+
+    scheme, sep, target = spec.partition(":")
+
+    if scheme != "sqlite" or not sep or not target:
+        raise ValueError(f"unsupported sink {spec!r} (expected sqlite:<path>)")
+
+    return Path(target)
+
+
+def extract_to_sqlite(game_path, mapping, containers, db_path: Path, projections=None, schema_extractors=True):
+    """
+    Feed containers straight into an eve_universe.db-style database,
+    skipping the JSON files and the convert/ step.
+    """
+
+    localization = load_localization(game_path, mapping) or {}
+
+    sink = SqliteSink(db_path, localization).open(containers)
+
+    try:
+        for container in containers:
+
+            if not SqliteSink.supports(container):
+                print(f"[WARN] {container}: no SQLite tables for this container, skipped")
+                continue
+
+            print("[INFO] Processing:", container)
+
+            reset_materialize_stats()
+
+            fsd_file, schema = resolve_paths(game_path, mapping, container)
+
+            data = load_fsd(game_path, container, fsd_file, schema)
+
+            projection = (projections or {}).get(container)
+
+            extractor = None
+
+            if projection is None and schema_extractors:
+                extractor = schema_extractor(container, schema, materialize)
+
+            if hasattr(data, "items"):
+                records = iter_records(data, projection, extractor)
+            else:
+                # e.g. locationcache as [[location_id, solar_system_id], ...]
+                records = value_records(materialize_projected(data, projection))
+                end_record()
+
+            n = sink.write(container, records)
+
+            print(f"[OK] {container} → {db_path} ({n} records)")
+            print("[INFO]", plan_stats_line())
+            print("[INFO]", dedup_stats_line())
+
+            if extractor is not None:
+                print("[INFO]", extractor.stats_line())
+
+        counts = sink.finish()
+
+    except BaseException:
+        sink.abort()
+        raise
+
+    for table, count in sorted(counts.items()):
+        print(f"   {table:<24} {count:>10} rows")
+
 
 # ------------------------------------------------------------
 # MAIN
@@ -304,39 +1814,393 @@ def main():
 
     ap.add_argument("-e", "--eve", required=True)
     ap.add_argument("-i", "--index", required=True)
-    ap.add_argument("-o", "--out", required=True)
-    ap.add_argument("-c", "--containers", required=True)
+    ap.add_argument("-o", "--out", help="output folder (required unless --calibrate)")
+    ap.add_argument(
+        "-c",
+        "--containers",
+        required=True,
+        help="comma-separated container names, or 'all' for every res:/staticdata/ container",
+    )
+    ap.add_argument(
+        "--stream",
+        action="store_true",
+        help="write each record as it is read instead of building the whole container in memory",
+    )
+    ap.add_argument(
+        "-f",
+        "--format",
+        choices=FORMATS,
+        default="json",
+        help="output format: pretty JSON (default) or NDJSON, optionally gzip/zstd compressed",
+    )
+    ap.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="extract containers in N worker processes (one process per container)",
+    )
+
+    ap.add_argument(
+        "--fields",
+        action="append",
+        default=[],
+        metavar="SPEC",
+        help="keep only these attribute paths, e.g. 'solarsystemcontent: planets.*.statistics.temperature' (repeatable)",
+    )
+    ap.add_argument(
+        "--fields-file",
+        help="file with one 'container: path, path' spec per line (see converter_fields.txt)",
+    )
+    ap.add_argument(
+        "--prune-localization",
+        action="store_true",
+        help="write only the localization entries referenced by the extracted containers",
+    )
+    ap.add_argument(
+        "--languages",
+        help="also build localization_languages.bin from these localization_fsd_<lang> pickles "
+        "(comma-separated, or 'all'), each loaded in its own worker process",
+    )
+    ap.add_argument(
+        "--sink",
+        help="write straight into a database instead of JSON, e.g. sqlite:db/eve_universe.db",
+    )
+    ap.add_argument(
+        "--no-schema-extractors",
+        action="store_true",
+        help="use the generic materialize() even for containers that ship a .schema",
+    )
+    ap.add_argument(
+        "--dedup",
+        action="store_true",
+        help="build small identical blocks (positions, statistics) once per record and share them; "
+        "off by default, as it has not lowered peak memory on the benchmark containers",
+    )
+    ap.add_argument(
+        "--chunk-size",
+        type=int,
+        metavar="N",
+        help="read the container N records at a time, checkpointing each chunk in "
+        "output/.partial/ so an interrupted run resumes where it stopped",
+    )
+    ap.add_argument(
+        "--no-hashes",
+        action="store_true",
+        help="do not write <container>.hashes.json (per-record content hashes for diff_extractions.py)",
+    )
+    ap.add_argument(
+        "--calibrate",
+        action="store_true",
+        help="time the BUILT / schema optimized / schema unoptimized loaders on each container, "
+        "store the fastest in the per-build loader profile and exit",
+    )
+    ap.add_argument(
+        "--force",
+        action="store_true",
+        help="re-extract every container even if its resfile is unchanged",
+    )
 
     args = ap.parse_args()
 
+    if not args.out and not args.calibrate:
+        ap.error("the following arguments are required: -o/--out")
+
+    if args.chunk_size is not None and args.chunk_size < 1:
+        ap.error("--chunk-size must be at least 1")
+
+    # for the --sink path; extract_container() sets it from options
+    set_dedup(args.dedup)
+
     game_path = Path(args.eve)
-    out_dir = Path(args.out)
+    out_dir = Path(args.out or ".")
+
+    if args.format.endswith(".zst") and zstandard is None:
+        ap.error("--format *.zst needs the 'zstandard' package (pip install zstandard)")
+
+    try:
+        field_lines = list(args.fields)
+
+        if args.fields_file:
+            with open(args.fields_file, "r", encoding="utf-8") as f:
+                field_lines.extend(f)
+
+        fields = {c: sorted(set(p)) for c, p in parse_fields(field_lines).items()}
+
+    except (OSError, ValueError) as exc:
+        ap.error(str(exc))
+
+    projections = {c: build_projection(p) for c, p in fields.items()}
+
+    settings = {c: {"fields": p} for c, p in fields.items()}
+
+    index = load_index(Path(args.index))
+    entries = index.containers
+    mapping = index.mapping()
+
+    discover = args.containers.strip().lower() == "all"
+
+    if discover:
+        requested = index.staticdata()
+        print(f"[INFO] {len(requested)} staticdata containers in resfileindex")
+    else:
+        requested = [c.strip() for c in args.containers.split(",") if c.strip()]
+
+    if args.calibrate:
+
+        missing = [c for c in requested if c not in mapping]
+
+        if missing:
+            ap.error(f"not in resfileindex: {', '.join(missing)}")
+
+        calibrate(game_path, mapping, requested)
+        return
+
+    if args.sink:
+
+        try:
+            db_path = parse_sink(args.sink)
+        except ValueError as exc:
+            ap.error(str(exc))
+
+        if args.jobs > 1:
+            print("[WARN] --sink writes from a single process; --jobs ignored")
+
+        if discover:
+            requested = [c for c in requested if SqliteSink.supports(c)]
+
+        try:
+            SqliteSink.check(requested)
+        except ValueError as exc:
+            ap.error(f"--sink: {exc}")
+
+        extract_to_sqlite(
+            game_path,
+            mapping,
+            requested,
+            db_path,
+            projections,
+            not args.no_schema_extractors,
+        )
+        return
 
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    mapping = load_resfileindex(Path(args.index))
+    manifest = load_manifest(out_dir)
 
-    containers = [c.strip() for c in args.containers.split(",")]
+    # Estimated before skipped / re-extracted entries change the manifest
+    sizes = {c: resfile_size(game_path, mapping, c) for c in requested}
+    costs = estimate_costs(manifest, sizes)
 
-    for container in containers:
+    containers = []
+
+    for container in requested:
+
+        fingerprint = resfile_fingerprint(entries, container)
+
+        output = container_path(out_dir, container, args.format).name
+
+        if not args.force and is_up_to_date(
+            manifest, out_dir, container, fingerprint, output, settings.get(container)
+        ):
+            print(f"[SKIP] {container}: resfile and schema unchanged")
+            continue
+
+        # Forget the old entry until the new output is complete.
+        manifest["containers"].pop(container, None)
+        containers.append(container)
+
+    save_manifest(out_dir, manifest)
+
+    # Most expensive first, so the long containers do not start last
+    containers.sort(key=lambda c: costs[c], reverse=True)
+
+    options = {
+        "stream": args.stream,
+        "format": args.format,
+        "projections": projections,
+        "prune_localization": args.prune_localization,
+        "schema_extractors": not args.no_schema_extractors,
+        "hashes": not args.no_hashes,
+        "chunk_size": args.chunk_size,
+        "dedup": args.dedup,
+    }
+
+    failed = []
+
+    # container -> message IDs its records refer to (--prune-localization)
+    referenced = {}
+
+    start = time.perf_counter()
+
+    if args.jobs > 1 and containers:
+
+        results = extract_parallel(
+            game_path, mapping, containers, out_dir, options, args.jobs
+        )
+
+        for container, status, detail in results:
+
+            if status == "ok":
+                record_extraction(
+                    manifest,
+                    container,
+                    resfile_fingerprint(entries, container),
+                    detail["out"],
+                    settings.get(container),
+                    {"bytes": sizes[container], "seconds": detail["seconds"]},
+                )
+                referenced[container] = detail["message_ids"]
+            else:
+                failed.append(container)
+
+        save_manifest(out_dir, manifest)
+
+    else:
+        results = []
+
+        for container in containers:
+
+            try:
+                result = extract_container(
+                    game_path, mapping, container, out_dir, options
+                )
+            except Exception as exc:
+                # A full dump keeps going past containers that cannot be
+                # loaded; an explicit list still stops at the first error.
+                if not discover:
+                    raise
+                print(f"[ERROR] {container}: {type(exc).__name__}: {exc}")
+                results.append((container, "error", f"{type(exc).__name__}: {exc}"))
+                failed.append(container)
+                continue
+
+            results.append((container, "ok", result))
+
+            record_extraction(
+                manifest,
+                container,
+                resfile_fingerprint(entries, container),
+                result["out"],
+                settings.get(container),
+                {"bytes": sizes[container], "seconds": result["seconds"]},
+            )
+            save_manifest(out_dir, manifest)
+
+            referenced[container] = result["message_ids"]
+
+    if results:
+        print_schedule(
+            results, sizes, costs, args.jobs, time.perf_counter() - start
+        )
+
+    message_ids = None
+    loc_settings = None
+
+    if args.prune_localization:
+
+        message_ids = set()
+
+        for container, recorded in manifest["containers"].items():
+
+            if container in ("localization", "localization_languages"):
+                continue
+
+            if container in referenced:
+                message_ids.update(referenced[container])
+            else:
+                # Skipped this run: read the IDs back from its output.
+                path = out_dir / recorded["output"]
+                for _ in tap_message_ids(iter_file(path), message_ids):
+                    pass
+
+        loc_settings = {"pruned": message_ids_digest(message_ids)}
+
+    loc_key = find_localization_key(mapping)
+    loc_fingerprint = resfile_fingerprint(entries, loc_key) if loc_key else None
+
+    if (
+        not args.force
+        and is_up_to_date(
+            manifest, out_dir, "localization", loc_fingerprint, JSON_NAME, loc_settings
+        )
+        and (out_dir / STORE_NAME).exists()
+    ):
+        print("[SKIP] localization: resfile unchanged")
+    else:
+        manifest["containers"].pop("localization", None)
+
+        out = extract_localization(game_path, mapping, out_dir, message_ids)
+
+        if out is not None:
+            record_extraction(
+                manifest, "localization", loc_fingerprint, out, loc_settings
+            )
+
+        save_manifest(out_dir, manifest)
+
+    if args.languages:
+
+        if args.languages.strip().lower() == "all":
+            languages = available_languages(mapping)
+        else:
+            languages = sorted({l.strip() for l in args.languages.split(",") if l.strip()})
+
+        missing = [l for l in languages if not find_localization_key(mapping, l)]
+
+        for lang in missing:
+            print(f"[WARN] localization_fsd_{lang} not in resfileindex, skipped")
+
+        languages = [l for l in languages if l not in missing]
+
+        lang_fingerprint = {
+            l: resfile_fingerprint(entries, find_localization_key(mapping, l))
+            for l in languages
+        }
+        lang_settings = {"languages": languages, **(loc_settings or {})}
+
+        if not languages:
+            print("[WARN] no localization languages to extract")
 
-        print("[INFO] Processing:", container)
+        elif not args.force and is_up_to_date(
+            manifest,
+            out_dir,
+            "localization_languages",
+            lang_fingerprint,
+            LANGUAGES_STORE_NAME,
+            lang_settings,
+        ):
+            print("[SKIP] localization languages: resfiles unchanged")
 
-        fsd_file, schema = resolve_paths(game_path, mapping, container)
+        else:
+            manifest["containers"].pop("localization_languages", None)
 
-        data = load_fsd_data(game_path, container, fsd_file, schema)
+            jobs = args.jobs if args.jobs > 1 else min(len(languages), os.cpu_count() or 1)
 
-        clean = materialize(data)
+            print(f"[INFO] Localization languages: {', '.join(languages)} ({jobs} workers)")
 
-        out = out_dir / f"{container}.json"
+            out, failed_languages = extract_languages(
+                game_path, mapping, languages, out_dir, message_ids, jobs
+            )
 
-        with out.open("w", encoding="utf-8") as f:
-            json.dump(clean, f, ensure_ascii=False, indent=2)
+            # A partial store is written, but not recorded, so the next
+            # run tries the failed languages again.
+            if out is not None and not failed_languages:
+                record_extraction(
+                    manifest,
+                    "localization_languages",
+                    lang_fingerprint,
+                    out,
+                    lang_settings,
+                )
+                save_manifest(out_dir, manifest)
 
-        print("[OK]", container, "→", out)
+            failed.extend(f"localization-{l}" for l in failed_languages)
 
-    extract_localization(game_path, mapping, out_dir)
+    if failed:
+        print("[ERROR] Failed containers:", ", ".join(failed))
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -37,7 +37,8 @@ py -3.12 EF_Extractor_V4.py ^
     -e "%GAME_PATH%" ^
     -i "%RESINDEX%" ^
     -o "%OUT%" ^
-    -c "%CONTAINERS%"
+    -c "%CONTAINERS%" ^
+    --stream
 
 echo.
 echo [DONE] Output ready in: "%OUT%" folder.
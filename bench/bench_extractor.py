@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Extractor benchmark on synthetic FSD data (bench/fake_loader.py).
+
+Times the extractor hot paths without an EVE Frontier install and reports
+records/s, peak traced memory and output size for each:
+
+  generate                    consuming the fake container alone (baseline)
+  materialize                 V4 materialize() of the whole container
+  materialize-dedup           same, record by record with --dedup
+  materialize-v3              V3 materialize()
+  schema-extractor            generated extractor from the container's schema
+  extract_systems             V3 extract_systems()
+  extract_solarsystemcontent  V3 extract_solarsystemcontent()
+  normalize_localization      V4 normalize_localization() + str keys
+  write-json                  V4 write_container(), pretty JSON
+  write-json-stream           same, --stream
+  write-ndjson / write-json.gz / write-ndjson.gz
+
+Peak memory is measured in a second run under tracemalloc, so the timing
+run is not slowed by tracing (skip it with --no-memory).
+
+  python3 bench/bench_extractor.py --records 10000
+  python3 bench/bench_extractor.py --records 100000 --paths materialize,write-json-stream --save before.txt
+  python3 bench/bench_extractor.py --records 100000 --paths materialize,write-json-stream --compare before.txt
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCH_DIR.parent
+
+# the extractors live in the repo root
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+import EF_Extractor as v3
+import EF_Extractor_V4 as v4
+import schema_extractors
+from fake_loader import SCHEMAS, make_container, make_localization
+
+
+# ------------------------------------------------------------
+# PATHS
+# ------------------------------------------------------------
+# Each path returns (records, result): result is either the extracted
+# value (its JSON size is reported) or the Path of the file written.
+
+def run_generate(ctx):
+
+    n = 0
+
+    for _k, _v in ctx["data"](ctx["container"]).items():
+        n += 1
+
+    return n, None
+
+
+def run_materialize(ctx):
+
+    v4.reset_materialize_stats()
+
+    data = ctx["data"](ctx["container"])
+    loaded = {k: v for k, v in data.items()}
+
+    return len(loaded), v4.materialize(loaded)
+
+
+def run_materialize_dedup(ctx):
+
+    v4.set_dedup(True)
+    v4.reset_materialize_stats()
+
+    data = ctx["data"](ctx["container"])
+    loaded = {k: v for k, v in data.items()}
+
+    try:
+        return len(loaded), dict(v4.iter_records(loaded))
+    finally:
+        print("[INFO]", v4.dedup_stats_line())
+        v4.set_dedup(False)
+
+
+def run_materialize_v3(ctx):
+
+    v3.PLAN_STATS.update(hits=0, misses=0, dir_calls=0)
+
+    data = ctx["data"](ctx["container"])
+    loaded = {k: v for k, v in data.items()}
+
+    return len(loaded), v3.materialize(loaded)
+
+
+def run_schema_extractor(ctx):
+
+    v4.reset_materialize_stats()
+
+    container = ctx["container"]
+    source = schema_extractors.generate_source(SCHEMAS[container], container)
+    extract = schema_extractors.compile_source(source, f"<{container} schema>", v4.materialize)
+    extractor = schema_extractors.RecordExtractor(container, extract, v4.materialize)
+
+    data = ctx["data"](container)
+    loaded = {k: v for k, v in data.items()}
+
+    return len(loaded), {str(k): extractor(v) for k, v in loaded.items()}
+
+
+def run_extract_systems(ctx):
+
+    data = ctx["data"]("systems")
+    loaded = {k: v for k, v in data.items()}
+
+    return len(loaded), v3.extract_systems(loaded)
+
+
+def run_extract_solarsystemcontent(ctx):
+
+    v3.PLAN_STATS.update(hits=0, misses=0, dir_calls=0)
+
+    data = ctx["data"]("solarsystemcontent")
+    loaded = {k: v for k, v in data.items()}
+
+    return len(loaded), v3.extract_solarsystemcontent(loaded)
+
+
+def run_normalize_localization(ctx):
+
+    raw = ctx["localization"]
+    data = v4.normalize_localization(raw)
+    clean = {str(k): v for k, v in data.items()}
+
+    return len(clean), clean
+
+
+def writer(fmt, stream):
+
+    def run(ctx):
+
+        v4.reset_materialize_stats()
+
+        data = ctx["data"](ctx["container"])
+
+        if not stream:
+            data = {k: v for k, v in data.items()}
+
+        out = Path(ctx["tmp"]) / f"{ctx['container']}.{fmt}"
+
+        v4.write_container(data, out, stream)
+
+        return len(data), out
+
+    return run
+
+
+PATHS = {
+    "generate": run_generate,
+    "materialize": run_materialize,
+    "materialize-dedup": run_materialize_dedup,
+    "materialize-v3": run_materialize_v3,
+    "schema-extractor": run_schema_extractor,
+    "extract_systems": run_extract_systems,
+    "extract_solarsystemcontent": run_extract_solarsystemcontent,
+    "normalize_localization": run_normalize_localization,
+    "write-json": writer("json", False),
+    "write-json-stream": writer("json", True),
+    "write-ndjson": writer("ndjson", True),
+    "write-json.gz": writer("json.gz", False),
+    "write-ndjson.gz": writer("ndjson.gz", True),
+}
+
+
+# ------------------------------------------------------------
+# MEASURE
+# ------------------------------------------------------------
+
+def output_bytes(result):
+
+    if result is None:
+        return 0
+
+    if isinstance(result, Path):
+        return result.stat().st_size
+
+    return len(json.dumps(result, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def measure(fn, ctx, memory=True):
+
+    gc.collect()
+
+    start = time.perf_counter()
+    records, result = fn(ctx)
+    seconds = time.perf_counter() - start
+
+    size = output_bytes(result)
+    del result
+
+    peak = None
+
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn(ctx)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "records": records,
+        "seconds": seconds,
+        "records_per_s": records / seconds if seconds else 0.0,
+        "peak_bytes": peak,
+        "output_bytes": size,
+    }
+
+
+def print_results(results, baseline=None, tolerance=0.2):
+
+    print()
+    print(f"   {'path':<28} {'records':>9} {'records/s':>11} {'peak MiB':>9} {'out MiB':>9}")
+
+    slower = []
+
+    for name, r in results.items():
+
+        peak = "-" if r["peak_bytes"] is None else f"{r['peak_bytes'] / 2**20:.1f}"
+        line = (
+            f"   {name:<28} {r['records']:>9} {r['records_per_s']:>11.0f} "
+            f"{peak:>9} {r['output_bytes'] / 2**20:>9.1f}"
+        )
+
+        before = (baseline or {}).get(name)
+
+        if before and before.get("records_per_s"):
+
+            change = r["records_per_s"] / before["records_per_s"] - 1
+            line += f"   {change * 100:+6.1f}%"
+
+            if change < -tolerance:
+                line += "  SLOWER"
+                slower.append(name)
+
+        print(line)
+
+    return slower
+
+
+def main():
+
+    ap = argparse.ArgumentParser(description="Benchmark the extractor on synthetic FSD data")
+    ap.add_argument("-n", "--records", type=int, default=10000, help="top-level records per container (default 10000)")
+    ap.add_argument("-c", "--container", default="solarsystemcontent",
+                    choices=("types", "systems", "solarsystemcontent", "regions"),
+                    help="container for the materialize / write paths")
+    ap.add_argument("-p", "--paths", default=",".join(PATHS), help="comma-separated paths to run")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    ap.add_argument("--save", help="write the results to this file")
+    ap.add_argument("--compare", help="compare records/s with results saved earlier")
+    ap.add_argument("--tolerance", type=float, default=0.2,
+                    help="slowdown (fraction) that counts as a regression with --compare (default 0.2)")
+    args = ap.parse_args()
+
+    names = [p.strip() for p in args.paths.split(",") if p.strip()]
+
+    unknown = [p for p in names if p not in PATHS]
+    if unknown:
+        ap.error(f"unknown path(s): {', '.join(unknown)} (choose from {', '.join(PATHS)})")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(f"[INFO] {args.records} records, container={args.container}, seed={args.seed}")
+
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="ef_bench_") as tmp:
+
+        ctx = {
+            "data": lambda container: make_container(container, args.records, args.seed),
+            "container": args.container,
+            "localization": make_localization(args.records, args.seed),
+            "tmp": tmp,
+        }
+
+        for name in names:
+            print(f"[INFO] {name} ...", flush=True)
+            results[name] = measure(PATHS[name], ctx, memory=not args.no_memory)
+
+    slower = print_results(results, baseline, args.tolerance)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(
+                {"records": args.records, "container": args.container, "results": results},
+                f,
+                indent=2,
+            )
+        print("\n[OK] results →", args.save)
+
+    if slower:
+        print(f"\n[ERROR] slower than {args.compare} by more than {args.tolerance:.0%}: {', '.join(slower)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
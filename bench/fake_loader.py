@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic stand-in for the CCP FSD loaders.
+
+Builds containers shaped like the objects the BUILT / schema loaders hand
+to the extractor, so the extractor paths can be timed without an EVE
+Frontier install:
+
+  • records are attribute-style objects with a fixed layout (__slots__,
+    like the compiled loader classes); unset optional fields are simply
+    missing, and obj["field"] returns "-- not present --" for them
+  • containers only expose items() / keys() / [] / len(), and build each
+    record when it is read, the way the loaders decode lazily
+  • positions and centers are vectors with .x / .y / .z
+  • a few sub-objects are shared between records, as in the real data
+
+Every record is derived from its key and the seed, so runs are repeatable.
+"""
+
+import random
+
+NOT_PRESENT = "-- not present --"
+
+FIRST_SYSTEM_ID = 30000001
+FIRST_REGION_ID = 10000001
+FIRST_CONSTELLATION_ID = 20000001
+
+
+# ------------------------------------------------------------
+# OBJECT SHAPES
+# ------------------------------------------------------------
+
+class FsdObject:
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            if value is not NOT_PRESENT:
+                setattr(self, name, value)
+
+    def __getitem__(self, key):
+        return getattr(self, key, NOT_PRESENT)
+
+
+def record_class(name, fields):
+    """A fixed-layout record class, one per loader type (cf. ObjectLoader)."""
+
+    return type(name, (FsdObject,), {"__slots__": tuple(fields)})
+
+
+class Vector3:
+
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __getitem__(self, i):
+        return (self.x, self.y, self.z)[i]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+
+class FsdDict:
+    """Dict-like loader container; values are built on access."""
+
+    def __init__(self, keys, build, seed=0):
+        self._keys = keys
+        self._build = build
+        self._seed = seed
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._build(key, random.Random(key * 7919 + self._seed))
+
+    def keys(self):
+        return iter(self._keys)
+
+    def items(self):
+        for key in self._keys:
+            yield key, self[key]
+
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+
+def small_dict(d):
+    """Nested DictLoader (planets, moons, npcStations, stargates)."""
+
+    keys = list(d)
+    return FsdDict(keys, lambda key, _r: d[key])
+
+
+Type = record_class("Type", (
+    "typeID", "typeNameID", "descriptionID", "groupID", "mass", "volume",
+    "capacity", "radius", "published", "basePrice", "graphicID", "raceID",
+    "portionSize", "platforms",
+))
+
+SolarSystem = record_class("SolarSystem", (
+    "solarSystemID", "nameID", "regionID", "constellationID", "securityStatus",
+    "securityClass", "center", "sunTypeID", "sunFlareGraphicID", "planetItemIDs",
+))
+
+SolarSystemContent = record_class("SolarSystemContent", (
+    "solarSystemID", "center", "radius", "security", "securityClass",
+    "habitableZone", "potential", "frostLine", "sunTypeID",
+    "sunFlareGraphicID", "star", "planets", "stargates",
+))
+
+Star = record_class("Star", ("id", "typeID", "radius", "statistics"))
+
+StarStatistics = record_class("StarStatistics", (
+    "age", "life", "luminosity", "mass", "spectralClass", "temperature",
+    "radius", "locked",
+))
+
+Planet = record_class("Planet", (
+    "celestialIndex", "typeID", "radius", "position", "statistics", "moons",
+    "npcStations",
+))
+
+Moon = record_class("Moon", (
+    "orbitID", "typeID", "radius", "position", "statistics", "npcStations",
+))
+
+CelestialStatistics = record_class("CelestialStatistics", (
+    "density", "eccentricity", "escapeVelocity", "locked", "massDust",
+    "orbitPeriod", "orbitRadius", "pressure", "spectralClass",
+    "surfaceGravity", "temperature",
+))
+
+NpcStation = record_class("NpcStation", (
+    "typeID", "ownerID", "solarSystemID", "operationID", "isConquerable",
+    "position",
+))
+
+Stargate = record_class("Stargate", ("destination", "typeID", "position"))
+
+Region = record_class("Region", (
+    "nameID", "descriptionID", "nebulaID", "nebulaPath", "potential",
+    "regionLevel", "sectorID", "wormholeClassID", "zoneLevel",
+    "constellationIDs", "center",
+))
+
+# Shared by many records, as the loaders do for common sub-structures.
+ORIGIN = Vector3(0.0, 0.0, 0.0)
+
+
+# ------------------------------------------------------------
+# RECORDS
+# ------------------------------------------------------------
+
+def maybe(r, value, chance=0.8):
+    return value if r.random() < chance else NOT_PRESENT
+
+
+def vector(r, scale=1e17):
+    return Vector3(r.uniform(-scale, scale), r.uniform(-scale, scale), r.uniform(-scale, scale))
+
+
+def celestial_statistics(r):
+
+    return CelestialStatistics(
+        density=r.uniform(1.0, 10.0),
+        eccentricity=r.random(),
+        escapeVelocity=r.uniform(1e3, 1e5),
+        locked=r.random() < 0.5,
+        massDust=r.uniform(1e20, 1e25),
+        orbitPeriod=r.uniform(1e5, 1e9),
+        orbitRadius=r.uniform(1e9, 1e12),
+        pressure=maybe(r, r.uniform(0.0, 1e7)),
+        spectralClass=maybe(r, "0.0", 0.2),
+        surfaceGravity=r.uniform(0.1, 30.0),
+        temperature=r.uniform(20.0, 800.0),
+    )
+
+
+def npc_stations(r, system_id, base_id):
+
+    if r.random() > 0.15:
+        return small_dict({})
+
+    return small_dict({
+        base_id + i: NpcStation(
+            typeID=r.choice((1529, 1926, 3866)),
+            ownerID=1000000 + r.randrange(100),
+            solarSystemID=system_id,
+            operationID=r.randrange(1, 50),
+            isConquerable=False,
+            position=vector(r, 1e11),
+        )
+        for i in range(r.randrange(1, 3))
+    })
+
+
+def build_type(key, r):
+
+    return Type(
+        typeID=key,
+        typeNameID=500000 + key,
+        descriptionID=maybe(r, 600000 + key),
+        groupID=r.randrange(1, 2000),
+        mass=r.uniform(0.0, 1e10),
+        volume=r.uniform(0.0, 1e6),
+        capacity=maybe(r, r.uniform(0.0, 1e5), 0.4),
+        radius=r.uniform(1.0, 1e4),
+        published=r.random() < 0.7,
+        basePrice=maybe(r, r.uniform(0.0, 1e9), 0.5),
+        graphicID=maybe(r, r.randrange(1, 30000), 0.6),
+        raceID=maybe(r, r.choice((1, 2, 4, 8)), 0.3),
+        portionSize=1,
+        platforms=r.choice((0, 1, 3)),
+    )
+
+
+def build_system(key, r):
+
+    index = key - FIRST_SYSTEM_ID
+
+    return SolarSystem(
+        solarSystemID=key,
+        nameID=700000 + index,
+        regionID=FIRST_REGION_ID + index // 1000,
+        constellationID=FIRST_CONSTELLATION_ID + index // 100,
+        securityStatus=r.uniform(-1.0, 1.0),
+        securityClass=maybe(r, r.choice("ABC"), 0.3),
+        center=vector(r),
+        sunTypeID=r.choice((45030, 45031, 45032)),
+        sunFlareGraphicID=maybe(r, r.randrange(1, 500), 0.5),
+        planetItemIDs=[40000000 + index * 16 + p for p in range(r.randrange(0, 8))],
+    )
+
+
+def build_solarsystemcontent(key, r):
+
+    index = key - FIRST_SYSTEM_ID
+    base = 40000000 + index * 256
+
+    planets = {}
+
+    for p in range(r.randrange(1, 9)):
+
+        planet_id = base + p * 16
+
+        moons = {
+            planet_id + m: Moon(
+                orbitID=planet_id,
+                typeID=r.choice((14, 2015)),
+                radius=r.uniform(1e5, 1e7),
+                position=vector(r, 1e12),
+                statistics=celestial_statistics(r),
+                npcStations=npc_stations(r, key, 60000000 + (planet_id + m) % 10000000 * 4),
+            )
+            for m in range(1, r.randrange(1, 5))
+        }
+
+        planets[planet_id] = Planet(
+            celestialIndex=p + 1,
+            typeID=r.choice((11, 12, 13, 2014, 2016)),
+            radius=r.uniform(1e6, 1e8),
+            position=vector(r, 1e12),
+            statistics=celestial_statistics(r),
+            moons=small_dict(moons),
+            npcStations=npc_stations(r, key, 60000000 + planet_id % 10000000 * 4),
+        )
+
+    stargates = {
+        50000000 + index * 8 + g: Stargate(
+            destination=50000000 + r.randrange(0, 8000000),
+            typeID=r.choice((16, 17, 3875)),
+            position=vector(r, 1e12) if r.random() < 0.9 else ORIGIN,
+        )
+        for g in range(r.randrange(0, 5))
+    }
+
+    star = Star(
+        id=base,
+        typeID=r.choice((45030, 45031, 45032)),
+        radius=r.uniform(1e8, 1e9),
+        statistics=StarStatistics(
+            age=r.uniform(1e16, 1e18),
+            life=r.uniform(1e17, 1e19),
+            luminosity=r.uniform(0.01, 10.0),
+            mass=maybe(r, r.uniform(1e29, 1e31)),
+            spectralClass=r.choice(("G2 V", "K5 V", "M0 V", "F7 V")),
+            temperature=r.uniform(2000.0, 9000.0),
+            radius=r.uniform(1e8, 1e9),
+            locked=False,
+        ),
+    )
+
+    return SolarSystemContent(
+        solarSystemID=key,
+        center=vector(r),
+        radius=r.uniform(1e12, 1e14),
+        security=r.uniform(-1.0, 1.0),
+        securityClass=maybe(r, r.choice("ABC"), 0.3),
+        habitableZone=maybe(r, r.uniform(1e10, 1e12)),
+        potential=maybe(r, r.random()),
+        frostLine=maybe(r, r.uniform(1e10, 1e12)),
+        sunTypeID=star.typeID,
+        sunFlareGraphicID=maybe(r, r.randrange(1, 500), 0.5),
+        star=star,
+        planets=small_dict(planets),
+        stargates=small_dict(stargates),
+    )
+
+
+def build_region(key, r):
+
+    index = key - FIRST_REGION_ID
+
+    return Region(
+        nameID=800000 + index,
+        descriptionID=maybe(r, 900000 + index),
+        nebulaID=r.randrange(1, 100),
+        nebulaPath=maybe(r, f"res:/dx9/scene/universe/nebula_{index % 50}.red", 0.5),
+        potential=r.random(),
+        regionLevel=maybe(r, r.randrange(0, 5), 0.5),
+        sectorID=maybe(r, r.randrange(0, 100), 0.5),
+        wormholeClassID=maybe(r, r.randrange(0, 25), 0.3),
+        zoneLevel=maybe(r, r.randrange(0, 5), 0.5),
+        constellationIDs=[FIRST_CONSTELLATION_ID + index * 10 + c for c in range(10)],
+        center=vector(r),
+    )
+
+
+BUILDERS = {
+    "types": (1, build_type),
+    "systems": (FIRST_SYSTEM_ID, build_system),
+    "solarsystemcontent": (FIRST_SYSTEM_ID, build_solarsystemcontent),
+    "regions": (FIRST_REGION_ID, build_region),
+}
+
+
+def make_container(container, records, seed=0):
+    """A lazily built FSD container with `records` top-level entries."""
+
+    first, build = BUILDERS[container]
+
+    return FsdDict(range(first, first + records), build, seed)
+
+
+# ------------------------------------------------------------
+# SCHEMAS
+# ------------------------------------------------------------
+# FSD-style schema nodes for the record shapes above, for the extractors
+# generated by schema_extractors.py.
+
+def scalar(kind):
+    return {"type": kind}
+
+
+def obj(**attributes):
+    return {"type": "object", "attributes": attributes}
+
+
+def dict_of(value, key="int"):
+    return {"type": "dict", "keyTypes": scalar(key), "valueTypes": value}
+
+
+def list_of(item):
+    return {"type": "list", "itemTypes": item}
+
+
+INT = scalar("int")
+FLOAT = scalar("float")
+BOOL = scalar("bool")
+STRING = scalar("string")
+VECTOR = scalar("vector3")
+
+CELESTIAL_STATISTICS = obj(
+    density=FLOAT, eccentricity=FLOAT, escapeVelocity=FLOAT, locked=BOOL,
+    massDust=FLOAT, orbitPeriod=FLOAT, orbitRadius=FLOAT, pressure=FLOAT,
+    spectralClass=STRING, surfaceGravity=FLOAT, temperature=FLOAT,
+)
+
+NPC_STATIONS = dict_of(obj(
+    typeID=INT, ownerID=INT, solarSystemID=INT, operationID=INT,
+    isConquerable=BOOL, position=VECTOR,
+))
+
+SCHEMAS = {
+    "types": dict_of(obj(
+        typeID=INT, typeNameID=INT, descriptionID=INT, groupID=INT,
+        mass=FLOAT, volume=FLOAT, capacity=FLOAT, radius=FLOAT,
+        published=BOOL, basePrice=FLOAT, graphicID=INT, raceID=INT,
+        portionSize=INT, platforms=INT,
+    )),
+    "systems": dict_of(obj(
+        solarSystemID=INT, nameID=INT, regionID=INT, constellationID=INT,
+        securityStatus=FLOAT, securityClass=STRING, center=VECTOR,
+        sunTypeID=INT, sunFlareGraphicID=INT, planetItemIDs=list_of(INT),
+    )),
+    "solarsystemcontent": dict_of(obj(
+        solarSystemID=INT, center=VECTOR, radius=FLOAT, security=FLOAT,
+        securityClass=STRING, habitableZone=FLOAT, potential=FLOAT,
+        frostLine=FLOAT, sunTypeID=INT, sunFlareGraphicID=INT,
+        star=obj(
+            id=INT, typeID=INT, radius=FLOAT,
+            statistics=obj(
+                age=FLOAT, life=FLOAT, luminosity=FLOAT, mass=FLOAT,
+                spectralClass=STRING, temperature=FLOAT, radius=FLOAT,
+                locked=BOOL,
+            ),
+        ),
+        planets=dict_of(obj(
+            celestialIndex=INT, typeID=INT, radius=FLOAT, position=VECTOR,
+            statistics=CELESTIAL_STATISTICS,
+            moons=dict_of(obj(
+                orbitID=INT, typeID=INT, radius=FLOAT, position=VECTOR,
+                statistics=CELESTIAL_STATISTICS, npcStations=NPC_STATIONS,
+            )),
+            npcStations=NPC_STATIONS,
+        )),
+        stargates=dict_of(obj(destination=INT, typeID=INT, position=VECTOR)),
+    )),
+    "regions": dict_of(obj(
+        nameID=INT, descriptionID=INT, nebulaID=INT, nebulaPath=STRING,
+        potential=FLOAT, regionLevel=INT, sectorID=INT, wormholeClassID=INT,
+        zoneLevel=INT, constellationIDs=list_of(INT), center=VECTOR,
+    )),
+}
+
+
+def make_localization(records, seed=0):
+    """
+    An en-us localization pickle payload: ("en-us", [(messageID, entry)]).
+
+    The list-of-pairs form is the one normalize_localization() has to
+    convert, so it is the one worth timing.
+    """
+
+    r = random.Random(seed)
+
+    pairs = [
+        (message_id, [f"Message {message_id} {r.random():.6f}", None, None])
+        for message_id in range(500000, 500000 + records)
+    ]
+
+    return ("en-us", pairs)
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import subprocess
+import argparse
+import importlib
 import sys
+import time
+import traceback
+import tracemalloc
 from pathlib import Path
 
 def find_repo_root(start_dir: Path) -> Path:
@@ -14,41 +18,83 @@ def find_repo_root(start_dir: Path) -> Path:
 # Path to the convert directory where converters are located
 CONVERT_DIR = Path(__file__).resolve().parent
 ROOT_DIR = find_repo_root(CONVERT_DIR)
+OUTPUT_DIR = ROOT_DIR / "output"
+SQLITE_DB = ROOT_DIR / "db" / "eve_universe.db"
 
-# List of converters to run, corresponding to JSON files in output/
+# converters are imported as modules; converter_inputs lives in the repo root
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(CONVERT_DIR))
+
+from converter_inputs import ConverterInputs
+from db_publish import PublishError, finish_build, previous_path, publish, rollback, start_build
+
+# List of converters to run, corresponding to JSON files in output/.
+# Each one is imported and its convert(inputs) run in this process, so
+# localization and systems are parsed once for all of them.
 converters = [
     'types_json_to_db.py',
     'systems_json_to_db.py',
     'regions_json_to_db.py',
     'locationcache_json_to_db.py',
     'solarsystemcontent_json_to_db.py',
+    'localized_names_to_db.py',
 ]
 
-def main():
-    for converter in converters:
-        converter_path = CONVERT_DIR / converter
-        if converter_path.exists():
-            print(f"Running {converter}...")
-            try:
-                result = subprocess.run([sys.executable, str(converter_path)], cwd=CONVERT_DIR, capture_output=True, text=True)
-                if result.returncode == 0:
-                    print(f"[OK] {converter} completed successfully.")
-                    print(result.stdout)
-                else:
-                    print(f"[ERROR] {converter} failed with return code {result.returncode}.")
-                    print(result.stderr)
-            except Exception as e:
-                print(f"[ERROR] Failed to run {converter}: {e}")
-        else:
-            print(f"[WARNING] {converter} not found.")
+def run_stage(name, func, memory):
+    """Run one stage; returns {"name", "ok", "seconds", "peak"} (peak None without memory)."""
+    if memory:
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    try:
+        func()
+        ok = True
+    except Exception:
+        traceback.print_exc(file=sys.stdout)
+        ok = False
+    seconds = time.perf_counter() - start
+
+    peak = tracemalloc.get_traced_memory()[1] if memory else None
 
+    return {"name": name, "ok": ok, "seconds": seconds, "peak": peak}
+
+def load_shared_inputs(inputs):
+    # read up front so the time is not charged to the first converter using them
+    inputs.localization
+    if inputs.has_container("systems"):
+        inputs.systems
+
+def run_converter(converter, inputs):
+    module = importlib.import_module(Path(converter).stem)
+    module.convert(inputs)
+
+def print_stages(stages, wall_seconds):
+    print()
+    print("[INFO] Stages:")
+    print(f"   {'stage':<36} {'status':<7} {'seconds':>9} {'peak MiB':>9}")
+    for stage in stages:
+        peak = f"{stage['peak'] / 2**20:9.1f}" if stage["peak"] is not None else f"{'-':>9}"
+        print(
+            f"   {stage['name']:<36} {'OK' if stage['ok'] else 'FAILED':<7} "
+            f"{stage['seconds']:9.2f} {peak}"
+        )
+    print(f"   {'total (wall)':<36} {'':<7} {wall_seconds:9.2f}")
+    if any(stage["peak"] is not None for stage in stages):
+        print("   (peak MiB: Python allocations traced by tracemalloc, not SQLite's own)")
+
+def publish_build(build):
+    # ANALYZE + PRAGMA optimize + integrity_check, then one rename over the live file
+    finish_build(build)
+    publish(SQLITE_DB)
+
+def delete_temporary_dbs(db_dir):
     # Delete temporary databases as they are integrated into eve_universe.db and no longer needed
-    regions_db = ROOT_DIR / 'db' / 'regions.db'
+    regions_db = db_dir / 'regions.db'
     if regions_db.exists():
         regions_db.unlink()
         print("Deleted regions.db as it's no longer needed.")
 
-    locationcache_db = ROOT_DIR / 'db' / 'locationcache.db'
+    locationcache_db = db_dir / 'locationcache.db'
     if locationcache_db.exists():
         try:
             locationcache_db.unlink()
@@ -56,7 +102,7 @@ def main():
         except PermissionError:
             print("Could not delete locationcache.db (file in use), but it's no longer needed.")
 
-    types_db = ROOT_DIR / 'db' / 'types.db'
+    types_db = db_dir / 'types.db'
     if types_db.exists():
         try:
             types_db.unlink()
@@ -64,5 +110,73 @@ def main():
         except PermissionError:
             print("Could not delete types.db (file in use), but it's no longer needed.")
 
+def main():
+    ap = argparse.ArgumentParser(description="Convert the extractor output in output/ to db/eve_universe.db")
+    ap.add_argument("--no-memory", action="store_true", help="do not trace peak memory per stage (tracemalloc slows the run)")
+    ap.add_argument("--rollback", action="store_true", help=f"swap {SQLITE_DB.name} with the previous generation and exit")
+    args = ap.parse_args()
+
+    if args.rollback:
+        try:
+            rollback(SQLITE_DB)
+        except (PublishError, OSError) as e:
+            print(f"[ERROR] Rollback failed: {e}")
+            sys.exit(1)
+        print(f"[OK] {SQLITE_DB.name} rolled back; run --rollback again to undo.")
+        return
+
+    memory = not args.no_memory
+    if memory:
+        tracemalloc.start()
+
+    wall_start = time.perf_counter()
+
+    # Converters write into a scratch copy; readers of the live database
+    # only ever see the old or the finished new one.
+    build = start_build(SQLITE_DB)
+    inputs = ConverterInputs(OUTPUT_DIR, build, scratch=True)
+    stages = []
+
+    try:
+        print("Loading shared inputs (localization, systems)...")
+        stages.append(run_stage("shared inputs", lambda: load_shared_inputs(inputs), memory))
+
+        for converter in converters:
+            converter_path = CONVERT_DIR / converter
+            if converter_path.exists():
+                print(f"Running {converter}...")
+                stage = run_stage(converter, lambda: run_converter(converter, inputs), memory)
+                stages.append(stage)
+                if stage["ok"]:
+                    print(f"[OK] {converter} completed successfully.")
+                else:
+                    print(f"[ERROR] {converter} failed.")
+                print()
+            else:
+                print(f"[WARNING] {converter} not found.")
+    finally:
+        inputs.close()
+
+    if all(stage["ok"] for stage in stages):
+        print(f"Publishing {SQLITE_DB.name}...")
+        replaces = SQLITE_DB.exists()
+        stage = run_stage("publish (analyze, check, swap)", lambda: publish_build(build), memory)
+        stages.append(stage)
+        if stage["ok"]:
+            print(f"[OK] {SQLITE_DB} published.")
+            if replaces:
+                print(f"[INFO] Previous generation kept as {previous_path(SQLITE_DB).name} (roll back with --rollback).")
+        else:
+            print(f"[ERROR] {SQLITE_DB.name} not replaced; the new database is left in {build.name}.")
+    else:
+        print(f"[ERROR] A converter failed; {SQLITE_DB.name} not replaced. The partial build is left in {build.name}.")
+
+    if memory:
+        tracemalloc.stop()
+
+    delete_temporary_dbs(inputs.db_dir)
+
+    print_stages(stages, time.perf_counter() - wall_start)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+from pathlib import Path
+
+# =====================
+# PATHS
+# =====================
+
+def find_repo_root(start_dir: Path) -> Path:
+    for candidate in (start_dir, *start_dir.parents):
+        if (candidate / "convert").is_dir() and (candidate / "db").is_dir():
+            return candidate
+    return start_dir.parent
+
+ROOT_DIR = find_repo_root(Path(__file__).resolve().parent)
+DB_DIR = ROOT_DIR / "db"
+OUTPUT_DIR = ROOT_DIR / "output"
+
+SQLITE_DB = DB_DIR / "eve_universe.db"
+
+# localization_store and converter_inputs live next to the extractor in the repo root
+sys.path.insert(0, str(ROOT_DIR))
+
+from localization_store import LANGUAGES_STORE_NAME, LanguageStore
+from converter_inputs import ConverterInputs
+
+# =====================
+# HELPERS
+# =====================
+
+def resolve_text(store, message_id, language, text):
+    # Some builds store an intermediate numeric token in localization.
+    # Example: nameID -> "30089267"; if that token exists as a key, dereference once.
+    if text.isdigit():
+        indirect = store.get(text, language)
+        if indirect:
+            return indirect
+    return text
+
+# =====================
+# CONVERT
+# =====================
+
+def convert(inputs):
+    """
+    Write the localized_names table from localization_languages.bin in
+    inputs.output_dir (the store is read directly, not through inputs).
+    """
+
+    # =====================
+    # LOAD STORE
+    # =====================
+
+    inputs.db_dir.mkdir(parents=True, exist_ok=True)
+
+    # Written by EF_Extractor_V4.py --languages; nothing to do without it.
+    store_path = inputs.output_dir / LANGUAGES_STORE_NAME
+
+    if not store_path.exists():
+        print(f"[INFO] {LANGUAGES_STORE_NAME} not found; localized_names skipped (extract with --languages)")
+        return
+
+    with LanguageStore(store_path) as store:
+
+        # =====================
+        # SQLITE SETUP
+        # =====================
+
+        conn = inputs.connect()
+        cur = conn.cursor()
+
+        cur.executescript("""
+        DROP TABLE IF EXISTS localized_names;
+
+        CREATE TABLE localized_names (
+            messageID  INTEGER,
+            language   TEXT,
+            text       TEXT,
+            PRIMARY KEY (messageID, language)
+        );
+        """)
+
+        # =====================
+        # INSERT DATA
+        # =====================
+
+        # One pass over the store, already in (messageID, language) order
+        cur.executemany(
+            "INSERT INTO localized_names VALUES (?, ?, ?)",
+            (
+                (message_id, language, resolve_text(store, message_id, language, text))
+                for message_id, language, text in store.entries()
+            ),
+        )
+
+        conn.commit()
+        conn.close()
+
+        print("[OK] SQLite DB created:", inputs.db_path)
+        print("[INFO] Languages:", ", ".join(store.languages))
+        print("[INFO] Localized names:", len(store))
+
+def main():
+    inputs = ConverterInputs(OUTPUT_DIR, SQLITE_DB)
+    try:
+        convert(inputs)
+    finally:
+        inputs.close()
+
+if __name__ == "__main__":
+    main()
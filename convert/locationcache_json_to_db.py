@@ -1,5 +1,5 @@
-import json
 import sqlite3
+import sys
 from pathlib import Path
 
 # -------- PATHS --------
@@ -13,27 +13,13 @@ ROOT_DIR = find_repo_root(Path(__file__).resolve().parent)
 OUTPUT_DIR = ROOT_DIR / "output"
 DB_DIR = ROOT_DIR / "db"
 
-JSON_PATH = OUTPUT_DIR / "locationcache.json"
-DB_PATH = DB_DIR / "locationcache.db"
+DB_NAME = "locationcache.db"
 
-DB_DIR.mkdir(parents=True, exist_ok=True)
+# record_io and converter_inputs live next to the extractor in the repo root
+sys.path.insert(0, str(ROOT_DIR))
 
-# -------- LOAD JSON --------
-with open(JSON_PATH, "r", encoding="utf-8") as f:
-    data = json.load(f)
-
-# -------- CONNECT DB --------
-conn = sqlite3.connect(DB_PATH)
-cur = conn.cursor()
-
-# -------- CREATE TABLE --------
-cur.execute("""
-CREATE TABLE IF NOT EXISTS locationcache_typed (
-    location_id INTEGER PRIMARY KEY,
-    solar_system_id INTEGER,
-    location_type TEXT
-)
-""")
+from record_io import iter_container
+from converter_inputs import ConverterInputs
 
 # -------- CLASSIFICATION --------
 def classify(location_id: int) -> str:
@@ -49,43 +35,69 @@ def classify(location_id: int) -> str:
         return "Station"
     return "Other"
 
-# -------- INSERT DATA --------
-rows = []
+# -------- CONVERT --------
+def convert(inputs):
+    """Write locationcache.db (location ID -> solar system, classified)."""
+
+    inputs.db_dir.mkdir(parents=True, exist_ok=True)
+    db_path = inputs.db_dir / DB_NAME
+
+    # -------- CONNECT DB --------
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+
+    # -------- CREATE TABLE --------
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS locationcache_typed (
+        location_id INTEGER PRIMARY KEY,
+        solar_system_id INTEGER,
+        location_type TEXT
+    )
+    """)
+
+    # -------- INSERT DATA --------
+    rows = []
+
+    for key, value in iter_container(inputs.output_dir, "locationcache"):
+        if key is not None:
+            # {"location_id": solar_system_id}
+            loc_id, sys_id = key, value
+        elif isinstance(value, list) and len(value) == 2:
+            # [[location_id, solar_system_id], ...]
+            loc_id, sys_id = value
+        else:
+            raise ValueError("Unknown JSON structure")
 
-if isinstance(data, dict):
-    # {"location_id": solar_system_id}
-    for loc_id_str, sys_id in data.items():
-        loc_id = int(loc_id_str)
-        rows.append((
-            loc_id,
-            int(sys_id),
-            classify(loc_id)
-        ))
-elif isinstance(data, list):
-    # [[location_id, solar_system_id], ...]
-    for loc_id, sys_id in data:
         rows.append((
             int(loc_id),
             int(sys_id),
             classify(int(loc_id))
         ))
-else:
-    raise ValueError("Unknown JSON structure")
-
-cur.executemany("""
-INSERT OR REPLACE INTO locationcache_typed (
-    location_id,
-    solar_system_id,
-    location_type
-) VALUES (?, ?, ?)
-""", rows)
-
-# -------- INDEXES --------
-cur.execute("CREATE INDEX IF NOT EXISTS idx_lct_type ON locationcache_typed(location_type)")
-cur.execute("CREATE INDEX IF NOT EXISTS idx_lct_system ON locationcache_typed(solar_system_id)")
-
-conn.commit()
-conn.close()
-
-print("[OK] locationcache JSON imported and classified")
-print(f"[INFO] DB: {DB_PATH}")
+
+    cur.executemany("""
+    INSERT OR REPLACE INTO locationcache_typed (
+        location_id,
+        solar_system_id,
+        location_type
+    ) VALUES (?, ?, ?)
+    """, rows)
+
+    # -------- INDEXES --------
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_lct_type ON locationcache_typed(location_type)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_lct_system ON locationcache_typed(solar_system_id)")
+
+    conn.commit()
+    conn.close()
+
+    print("[OK] locationcache JSON imported and classified")
+    print(f"[INFO] DB: {db_path}")
+
+def main():
+    inputs = ConverterInputs(OUTPUT_DIR, DB_DIR / "eve_universe.db")
+    try:
+        convert(inputs)
+    finally:
+        inputs.close()
+
+if __name__ == "__main__":
+    main()
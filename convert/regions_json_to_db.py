@@ -1,5 +1,5 @@
-import json
 import sqlite3
+import sys
 from pathlib import Path
 
 # ----- PATHS -----
@@ -13,24 +13,15 @@ ROOT_DIR = find_repo_root(Path(__file__).resolve().parent)
 OUTPUT_DIR = ROOT_DIR / "output"
 DB_DIR = ROOT_DIR / "db"
 
-JSON_PATH = OUTPUT_DIR / "regions.json"
-LOCALIZATION_JSON = OUTPUT_DIR / "localization.json"
-DB_PATH = DB_DIR / "regions.db"
+DB_NAME = "regions.db"
 
-# ----- ENSURE DB DIR EXISTS -----
-DB_DIR.mkdir(parents=True, exist_ok=True)
+# record_io and converter_inputs live next to the extractor in the repo root
+sys.path.insert(0, str(ROOT_DIR))
 
-# ----- LOAD JSON -----
-with open(JSON_PATH, "r", encoding="utf-8") as f:
-    data = json.load(f)
-
-if LOCALIZATION_JSON.exists():
-    with open(LOCALIZATION_JSON, "r", encoding="utf-8") as f:
-        localization = json.load(f)
-else:
-    localization = {}
-    print("[WARN] localization.json not found; names will be missing")
+from record_io import iter_container
+from converter_inputs import ConverterInputs
 
+# ----- HELPERS -----
 def normalize_name(value):
     if value is None:
         return None
@@ -68,86 +59,109 @@ def resolve_region_name(region_data, localization_map):
 
     return direct_name
 
-# ----- CONNECT SQLITE -----
-conn = sqlite3.connect(DB_PATH)
-cur = conn.cursor()
-
-# ----- DROP TABLES -----
-cur.executescript("""
-DROP TABLE IF EXISTS region_constellations;
-DROP TABLE IF EXISTS regions;
-""")
-
-# ----- CREATE TABLES -----
-cur.executescript("""
-CREATE TABLE IF NOT EXISTS regions (
-    regionId INTEGER PRIMARY KEY,
-    descriptionId INTEGER,
-    nameId INTEGER,
-    name TEXT,
-    nebulaId INTEGER,
-    nebulaPath TEXT,
-    potential REAL,
-    regionLevel INTEGER,
-    sectorId INTEGER,
-    wormholeClassId INTEGER,
-    zoneLevel INTEGER
-);
-
-CREATE TABLE IF NOT EXISTS region_constellations (
-    regionId INTEGER,
-    constellationId INTEGER,
-    PRIMARY KEY (regionId, constellationId)
-);
-""")
-
-# ----- INSERT DATA -----
-for regionId_str, region in data.items():
-    regionId = int(regionId_str)
-
-    name_id = region.get("nameID")
-    name = resolve_region_name(region, localization)
-
-    cur.execute("""
-        INSERT OR REPLACE INTO regions (
+# ----- CONVERT -----
+def convert(inputs):
+    """Write regions.db, merged into eve_universe.db by solarsystemcontent."""
+
+    # ----- ENSURE DB DIR EXISTS -----
+    inputs.db_dir.mkdir(parents=True, exist_ok=True)
+    db_path = inputs.db_dir / DB_NAME
+
+    # ----- LOAD JSON -----
+    # localization.bin (indexed, mmap'ed) if present, else localization.json
+    localization = inputs.localization
+
+    # ----- CONNECT SQLITE -----
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+
+    # ----- DROP TABLES -----
+    cur.executescript("""
+    DROP TABLE IF EXISTS region_constellations;
+    DROP TABLE IF EXISTS regions;
+    """)
+
+    # ----- CREATE TABLES -----
+    cur.executescript("""
+    CREATE TABLE IF NOT EXISTS regions (
+        regionId INTEGER PRIMARY KEY,
+        descriptionId INTEGER,
+        nameId INTEGER,
+        name TEXT,
+        nebulaId INTEGER,
+        nebulaPath TEXT,
+        potential REAL,
+        regionLevel INTEGER,
+        sectorId INTEGER,
+        wormholeClassId INTEGER,
+        zoneLevel INTEGER
+    );
+
+    CREATE TABLE IF NOT EXISTS region_constellations (
+        regionId INTEGER,
+        constellationId INTEGER,
+        PRIMARY KEY (regionId, constellationId)
+    );
+    """)
+
+    # ----- INSERT DATA -----
+    # regions.json / .ndjson / compressed variants, read record by record
+    for regionId_str, region in iter_container(inputs.output_dir, "regions"):
+        regionId = int(regionId_str)
+
+        name_id = region.get("nameID")
+        name = resolve_region_name(region, localization)
+
+        cur.execute("""
+            INSERT OR REPLACE INTO regions (
+                regionId,
+                descriptionId,
+                nameId,
+                name,
+                nebulaId,
+                nebulaPath,
+                potential,
+                regionLevel,
+                sectorId,
+                wormholeClassId,
+                zoneLevel
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
             regionId,
-            descriptionId,
-            nameId,
+            region.get("descriptionID"),
+            name_id,
             name,
-            nebulaId,
-            nebulaPath,
-            potential,
-            regionLevel,
-            sectorId,
-            wormholeClassId,
-            zoneLevel
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        regionId,
-        region.get("descriptionID"),
-        name_id,
-        name,
-        region.get("nebulaID"),
-        region.get("nebulaPath"),
-        region.get("potential"),
-        region.get("regionLevel"),
-        region.get("sectorID"),
-        region.get("wormholeClassID"),
-        region.get("zoneLevel"),
-    ))
-
-    # constellations
-    for cid in region.get("constellationIDs", region.get("regionLevels", [])):
-        cur.execute("""
-            INSERT OR IGNORE INTO region_constellations
-            (regionId, constellationId)
-            VALUES (?, ?)
-        """, (regionId, cid))
-
-
-# ----- COMMIT & CLOSE -----
-conn.commit()
-conn.close()
-
-print("[OK] JSON successfully converted to SQLite database.")
-print(f"[INFO] DB location: {DB_PATH}")
+            region.get("nebulaID"),
+            region.get("nebulaPath"),
+            region.get("potential"),
+            region.get("regionLevel"),
+            region.get("sectorID"),
+            region.get("wormholeClassID"),
+            region.get("zoneLevel"),
+        ))
+
+        # constellations
+        for cid in region.get("constellationIDs", region.get("regionLevels", [])):
+            cur.execute("""
+                INSERT OR IGNORE INTO region_constellations
+                (regionId, constellationId)
+                VALUES (?, ?)
+            """, (regionId, cid))
+
+
+    # ----- COMMIT & CLOSE -----
+    conn.commit()
+    conn.close()
+
+    print("[OK] JSON successfully converted to SQLite database.")
+    print(f"[INFO] DB location: {db_path}")
+
+def main():
+    inputs = ConverterInputs(OUTPUT_DIR, DB_DIR / "eve_universe.db")
+    try:
+        convert(inputs)
+    finally:
+        inputs.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
-import json
-import sqlite3
+import sys
+import time
 from pathlib import Path
 
 # =====================
@@ -16,201 +16,18 @@ ROOT_DIR = find_repo_root(Path(__file__).resolve().parent)
 DB_DIR = ROOT_DIR / "db"
 OUTPUT_DIR = ROOT_DIR / "output"
 
-SOLARSYSTEMCONTENT_JSON = OUTPUT_DIR / "solarsystemcontent.json"
-LOCALIZATION_JSON = OUTPUT_DIR / "localization.json"
 SQLITE_DB = DB_DIR / "eve_universe.db"
 
-# =====================
-# LOAD JSON FILES
-# =====================
-
-DB_DIR.mkdir(parents=True, exist_ok=True)
+# record_io and converter_inputs live next to the extractor in the repo root
+sys.path.insert(0, str(ROOT_DIR))
 
-with SOLARSYSTEMCONTENT_JSON.open("r", encoding="utf-8") as f:
-    solarsystemcontent = json.load(f)
-
-if LOCALIZATION_JSON.exists():
-    with LOCALIZATION_JSON.open("r", encoding="utf-8") as f:
-        localization = json.load(f)
-else:
-    localization = {}
-    print("[WARN] localization.json not found; names will be missing")
-
-# Load systems.json for nameID etc.
-SYSTEMS_JSON = OUTPUT_DIR / "systems.json"
-with SYSTEMS_JSON.open("r", encoding="utf-8") as f:
-    systems_data = json.load(f)
+from record_io import iter_container
+from converter_inputs import ConverterInputs
 
 # =====================
-# SQLITE SETUP
+# HELPERS
 # =====================
 
-conn = sqlite3.connect(SQLITE_DB)
-cur = conn.cursor()
-
-# --- DROP ---
-cur.execute("DROP TABLE IF EXISTS system_planets")
-cur.execute("DROP TABLE IF EXISTS stars")
-cur.execute("DROP TABLE IF EXISTS stargates")
-cur.execute("DROP TABLE IF EXISTS planets")
-cur.execute("DROP TABLE IF EXISTS moons")
-cur.execute("DROP TABLE IF EXISTS npc_stations")
-cur.execute("DROP TABLE IF EXISTS systems")
-cur.execute("DROP TABLE IF EXISTS regions")
-cur.execute("DROP TABLE IF EXISTS region_constellations")
-cur.execute("DROP TABLE IF EXISTS region_solar_systems")
-cur.execute("DROP TABLE IF EXISTS region_neighbours")
-
-# --- CREATE ---
-cur.executescript("""
-CREATE TABLE systems (
-    solarSystemID      INTEGER PRIMARY KEY,
-    nameID             INTEGER,
-    name               TEXT,
-    securityStatus     REAL,
-    securityClass      TEXT,
-    regionID           INTEGER,
-    constellationID    INTEGER,
-    center_x           REAL,
-    center_y           REAL,
-    center_z           REAL,
-    sunTypeID          INTEGER,
-    sunFlareGraphicID  INTEGER
-);
-
-CREATE TABLE system_planets (
-    solarSystemID INTEGER,
-    planetItemID  INTEGER,
-    PRIMARY KEY (solarSystemID, planetItemID)
-);
-
-CREATE TABLE stargates (
-    solarSystemID INTEGER,
-    stargateID INTEGER,
-    destination INTEGER,
-    typeID INTEGER,
-    position_x REAL,
-    position_y REAL,
-    position_z REAL,
-    PRIMARY KEY (solarSystemID, stargateID)
-);
-
-CREATE TABLE planets (
-    solarSystemID INTEGER,
-    planetID INTEGER,
-    celestialIndex INTEGER,
-    typeID INTEGER,
-    radius REAL,
-    density REAL,
-    eccentricity REAL,
-    escapeVelocity REAL,
-    fragmented INTEGER,
-    life REAL,
-    locked INTEGER,
-    massDust REAL,
-    massGas REAL,
-    orbitClockwise INTEGER,
-    orbitPeriod REAL,
-    orbitRadius REAL,
-    pressure REAL,
-    rotationRate REAL,
-    spectralClass TEXT,
-    surfaceGravity REAL,
-    temperature REAL,
-    typeDescription TEXT,
-    PRIMARY KEY (solarSystemID, planetID)
-);
-
-CREATE TABLE moons (
-    planetID INTEGER,
-    moonID INTEGER,
-    orbitID INTEGER,
-    typeID INTEGER,
-    radius REAL,
-    density REAL,
-    eccentricity REAL,
-    escapeVelocity REAL,
-    fragmented INTEGER,
-    life REAL,
-    locked INTEGER,
-    massDust REAL,
-    massGas REAL,
-    orbitClockwise INTEGER,
-    orbitPeriod REAL,
-    orbitRadius REAL,
-    pressure REAL,
-    rotationRate REAL,
-    spectralClass TEXT,
-    surfaceGravity REAL,
-    temperature REAL,
-    typeDescription TEXT,
-    PRIMARY KEY (planetID, moonID)
-);
-
-CREATE TABLE npc_stations (
-    celestialID INTEGER,  -- planetID or moonID
-    stationID INTEGER,
-    constructableTypeListID INTEGER,
-    isConquerable INTEGER,
-    lagrangePoint INTEGER,
-    operationID INTEGER,
-    orbitID INTEGER,
-    ownerID INTEGER,
-    reprocessingEfficiency REAL,
-    reprocessingHangarFlag INTEGER,
-    reprocessingStationsTake REAL,
-    solarSystemID INTEGER,
-    stationName TEXT,
-    typeID INTEGER,
-    useOperationName INTEGER,
-    PRIMARY KEY (celestialID, stationID)
-);
-
-CREATE TABLE regions (
-    regionId INTEGER PRIMARY KEY,
-    descriptionId INTEGER,
-    nameId INTEGER,
-    name TEXT,
-    nebulaId INTEGER,
-    nebulaPath TEXT,
-    potential REAL,
-    regionLevel INTEGER,
-    sectorId INTEGER,
-    wormholeClassId INTEGER,
-    zoneLevel INTEGER
-);
-
-CREATE TABLE region_constellations (
-    regionId INTEGER,
-    constellationId INTEGER,
-    PRIMARY KEY (regionId, constellationId)
-);
-
-CREATE TABLE stars (
-    solarSystemID INTEGER PRIMARY KEY,
-    starID        INTEGER,
-    typeID        INTEGER,
-    radius        REAL,
-    stats_radius  REAL,
-    age           REAL,
-    life          REAL,
-    locked        INTEGER,
-    luminosity    REAL,
-    mass          REAL,
-    metallicity   REAL,
-    spectralClass TEXT,
-    temperature   REAL
-);
-""")
-
-# =====================
-# INSERT DATA
-# =====================
-
-
-
-missing_names = 0
-
 def normalize_name(value):
     if value is None:
         return None
@@ -254,129 +71,396 @@ def resolve_system_name(system_basic, localization_map):
 
     return None
 
-for system in solarsystemcontent.values():
-    system_id = system.get("solarSystemID")
-    system_basic = systems_data.get(str(system_id), {})
-    name_id = system_basic.get("nameID")
-    region_id = system_basic.get("regionID")
-    constellation_id = system_basic.get("constellationID")
-    name = resolve_system_name(system_basic, localization)
-
-    if not name:
-        missing_names += 1
-
-    center = system.get("center") or {}
-
-    # --- systems ---
-    cur.execute("""
-        INSERT INTO systems VALUES (
-            ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-        )
-    """, (
-        system_id,
-        name_id,
-        name,
-        system.get("security"),
-        system.get("securityClass"),
-        region_id,
-        constellation_id,
-        center.get("x"),
-        center.get("y"),
-        center.get("z"),
-        system.get("sunTypeID"),
-        system.get("sunFlareGraphicID"),
-    ))
-
-
-    # --- system_planets ---
-    for planet_id in system.get("planets", {}):
-        planet_data = system["planets"][planet_id]
-        stats = planet_data.get("statistics", {})
-        cur.execute("""
-            INSERT INTO planets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+# =====================
+# BULK LOAD
+# =====================
+
+BATCH_SIZE = 5000
+
+INSERTS = {
+    "systems": "INSERT INTO systems VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "planets": "INSERT INTO planets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "moons": "INSERT INTO moons VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "npc_stations": "INSERT INTO npc_stations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "stargates": "INSERT INTO stargates VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "stars": "INSERT INTO stars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+}
+
+# While loading: no rollback journal, no fsync, 256 MiB page cache.
+# json_to_sqlite_main.py loads into a scratch copy of eve_universe.db, so
+# a crash mid-load never reaches the live file; a converter run on its own
+# writes the live file and is simply run again.
+BULK_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA cache_size = -262144",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Journal and sync back to SQLite's defaults once the data is committed;
+# cache_size and temp_store end with the connection anyway
+SAFE_PRAGMAS = (
+    "PRAGMA journal_mode = DELETE",
+    "PRAGMA synchronous = FULL",
+)
+
+# Secondary indexes for the usual lookups, built after the rows are in
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_systems_region ON systems(regionID)",
+    "CREATE INDEX IF NOT EXISTS idx_systems_constellation ON systems(constellationID)",
+    "CREATE INDEX IF NOT EXISTS idx_planets_planet ON planets(planetID)",
+    "CREATE INDEX IF NOT EXISTS idx_moons_moon ON moons(moonID)",
+    "CREATE INDEX IF NOT EXISTS idx_npc_stations_system ON npc_stations(solarSystemID)",
+    "CREATE INDEX IF NOT EXISTS idx_stargates_destination ON stargates(destination)",
+)
+
+class BulkLoader:
+    """Collect rows per table and insert them with executemany, timing each table."""
+
+    def __init__(self, cur, batch_size=BATCH_SIZE):
+        self.cur = cur
+        self.batch_size = batch_size
+        self.pending = {}
+        self.counts = {}
+        self.seconds = {}
+
+    def add(self, table, row):
+        rows = self.pending.setdefault(table, [])
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table):
+        rows = self.pending.get(table)
+        if rows:
+            start = time.perf_counter()
+            self.cur.executemany(INSERTS[table], rows)
+            self.seconds[table] = self.seconds.get(table, 0.0) + time.perf_counter() - start
+            self.counts[table] = self.counts.get(table, 0) + len(rows)
+            rows.clear()
+
+    def flush_all(self):
+        for table in list(self.pending):
+            self.flush(table)
+
+    def print_rates(self, load_seconds):
+        print("[INFO] Bulk load (insert time per table):")
+        print(f"   {'table':<16} {'rows':>10} {'seconds':>9} {'rows/s':>12}")
+        for table in INSERTS:
+            rows = self.counts.get(table, 0)
+            seconds = self.seconds.get(table, 0.0)
+            rate = f"{rows / seconds:12,.0f}" if seconds > 0 else f"{'-':>12}"
+            print(f"   {table:<16} {rows:>10} {seconds:9.2f} {rate}")
+        total = sum(self.counts.values())
+        rate = f"{total / load_seconds:12,.0f}" if load_seconds > 0 else f"{'-':>12}"
+        print(f"   {'total (load)':<16} {total:>10} {load_seconds:9.2f} {rate}")
+
+# =====================
+# MERGE
+# =====================
+
+# Statements run against the side databases written by the regions and
+# locationcache converters, ATTACHed to eve_universe.db so no row passes
+# through Python. {label: (attached database file, statements)}
+MERGES = {
+    "lc": ("locationcache.db", (
+        ("station systems", """
+            UPDATE systems SET station = 1
+            WHERE solarSystemID IN (
+                SELECT solar_system_id FROM lc.locationcache_typed
+                WHERE location_type = 'Station'
+            )
+        """),
+    )),
+    "rg": ("regions.db", (
+        ("regions", "INSERT OR REPLACE INTO regions SELECT * FROM rg.regions"),
+        ("region constellations", "INSERT OR REPLACE INTO region_constellations SELECT * FROM rg.region_constellations"),
+    )),
+}
+
+def merge(conn, db_dir):
+    """Apply MERGES for the side databases in db_dir that exist; returns {what: rows changed}."""
+    counts = {}
+
+    # ATTACH / DETACH are not allowed inside a transaction
+    conn.commit()
+
+    attached = []
+    try:
+        for schema, (filename, _) in MERGES.items():
+            path = Path(db_dir) / filename
+            if path.exists():
+                conn.execute("ATTACH DATABASE ? AS " + schema, (str(path),))
+                attached.append(schema)
+
+        for schema in attached:
+            for what, statement in MERGES[schema][1]:
+                counts[what] = conn.execute(statement).rowcount
+
+        conn.commit()
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        for schema in attached:
+            conn.execute("DETACH DATABASE " + schema)
+
+    return counts
+
+# =====================
+# CONVERT
+# =====================
+
+def convert(inputs):
+    """Rebuild the universe tables of eve_universe.db from solarsystemcontent."""
+
+    inputs.db_dir.mkdir(parents=True, exist_ok=True)
+
+    # localization.bin (indexed, mmap'ed) if present, else localization.json
+    localization = inputs.localization
+
+    # systems.json for nameID etc.
+    systems_data = inputs.systems
+
+    # =====================
+    # SQLITE SETUP
+    # =====================
+
+    conn = inputs.connect()
+    cur = conn.cursor()
+
+    for pragma in BULK_PRAGMAS:
+        cur.execute(pragma)
+
+    # --- DROP ---
+    cur.execute("DROP TABLE IF EXISTS system_planets")
+    cur.execute("DROP TABLE IF EXISTS stars")
+    cur.execute("DROP TABLE IF EXISTS stargates")
+    cur.execute("DROP TABLE IF EXISTS planets")
+    cur.execute("DROP TABLE IF EXISTS moons")
+    cur.execute("DROP TABLE IF EXISTS npc_stations")
+    cur.execute("DROP TABLE IF EXISTS systems")
+    cur.execute("DROP TABLE IF EXISTS regions")
+    cur.execute("DROP TABLE IF EXISTS region_constellations")
+    cur.execute("DROP TABLE IF EXISTS region_solar_systems")
+    cur.execute("DROP TABLE IF EXISTS region_neighbours")
+
+    # --- CREATE ---
+    cur.executescript("""
+    CREATE TABLE systems (
+        solarSystemID      INTEGER PRIMARY KEY,
+        nameID             INTEGER,
+        name               TEXT,
+        securityStatus     REAL,
+        securityClass      TEXT,
+        regionID           INTEGER,
+        constellationID    INTEGER,
+        center_x           REAL,
+        center_y           REAL,
+        center_z           REAL,
+        sunTypeID          INTEGER,
+        sunFlareGraphicID  INTEGER
+    );
+
+    CREATE TABLE system_planets (
+        solarSystemID INTEGER,
+        planetItemID  INTEGER,
+        PRIMARY KEY (solarSystemID, planetItemID)
+    );
+
+    CREATE TABLE stargates (
+        solarSystemID INTEGER,
+        stargateID INTEGER,
+        destination INTEGER,
+        typeID INTEGER,
+        position_x REAL,
+        position_y REAL,
+        position_z REAL,
+        PRIMARY KEY (solarSystemID, stargateID)
+    );
+
+    CREATE TABLE planets (
+        solarSystemID INTEGER,
+        planetID INTEGER,
+        celestialIndex INTEGER,
+        typeID INTEGER,
+        radius REAL,
+        density REAL,
+        eccentricity REAL,
+        escapeVelocity REAL,
+        fragmented INTEGER,
+        life REAL,
+        locked INTEGER,
+        massDust REAL,
+        massGas REAL,
+        orbitClockwise INTEGER,
+        orbitPeriod REAL,
+        orbitRadius REAL,
+        pressure REAL,
+        rotationRate REAL,
+        spectralClass TEXT,
+        surfaceGravity REAL,
+        temperature REAL,
+        typeDescription TEXT,
+        PRIMARY KEY (solarSystemID, planetID)
+    );
+
+    CREATE TABLE moons (
+        planetID INTEGER,
+        moonID INTEGER,
+        orbitID INTEGER,
+        typeID INTEGER,
+        radius REAL,
+        density REAL,
+        eccentricity REAL,
+        escapeVelocity REAL,
+        fragmented INTEGER,
+        life REAL,
+        locked INTEGER,
+        massDust REAL,
+        massGas REAL,
+        orbitClockwise INTEGER,
+        orbitPeriod REAL,
+        orbitRadius REAL,
+        pressure REAL,
+        rotationRate REAL,
+        spectralClass TEXT,
+        surfaceGravity REAL,
+        temperature REAL,
+        typeDescription TEXT,
+        PRIMARY KEY (planetID, moonID)
+    );
+
+    CREATE TABLE npc_stations (
+        celestialID INTEGER,  -- planetID or moonID
+        stationID INTEGER,
+        constructableTypeListID INTEGER,
+        isConquerable INTEGER,
+        lagrangePoint INTEGER,
+        operationID INTEGER,
+        orbitID INTEGER,
+        ownerID INTEGER,
+        reprocessingEfficiency REAL,
+        reprocessingHangarFlag INTEGER,
+        reprocessingStationsTake REAL,
+        solarSystemID INTEGER,
+        stationName TEXT,
+        typeID INTEGER,
+        useOperationName INTEGER,
+        PRIMARY KEY (celestialID, stationID)
+    );
+
+    CREATE TABLE regions (
+        regionId INTEGER PRIMARY KEY,
+        descriptionId INTEGER,
+        nameId INTEGER,
+        name TEXT,
+        nebulaId INTEGER,
+        nebulaPath TEXT,
+        potential REAL,
+        regionLevel INTEGER,
+        sectorId INTEGER,
+        wormholeClassId INTEGER,
+        zoneLevel INTEGER
+    );
+
+    CREATE TABLE region_constellations (
+        regionId INTEGER,
+        constellationId INTEGER,
+        PRIMARY KEY (regionId, constellationId)
+    );
+
+    CREATE TABLE stars (
+        solarSystemID INTEGER PRIMARY KEY,
+        starID        INTEGER,
+        typeID        INTEGER,
+        radius        REAL,
+        stats_radius  REAL,
+        age           REAL,
+        life          REAL,
+        locked        INTEGER,
+        luminosity    REAL,
+        mass          REAL,
+        metallicity   REAL,
+        spectralClass TEXT,
+        temperature   REAL
+    );
+    """)
+
+    # =====================
+    # INSERT DATA
+    # =====================
+
+    missing_names = 0
+    system_count = 0
+
+    loader = BulkLoader(cur)
+    load_start = time.perf_counter()
+
+    # solarsystemcontent.json / .ndjson / compressed variants, read record by record
+    for _, system in iter_container(inputs.output_dir, "solarsystemcontent"):
+        system_count += 1
+        system_id = system.get("solarSystemID")
+        system_basic = systems_data.get(str(system_id), {})
+        name_id = system_basic.get("nameID")
+        region_id = system_basic.get("regionID")
+        constellation_id = system_basic.get("constellationID")
+        name = resolve_system_name(system_basic, localization)
+
+        if not name:
+            missing_names += 1
+
+        center = system.get("center") or {}
+
+        # --- systems ---
+        loader.add("systems", (
             system_id,
-            int(planet_id),
-            planet_data.get("celestialIndex"),
-            planet_data.get("typeID"),
-            planet_data.get("radius"),
-            stats.get("density"),
-            stats.get("eccentricity"),
-            stats.get("escapeVelocity"),
-            1 if stats.get("fragmented") else 0,
-            stats.get("life"),
-            1 if stats.get("locked") else 0,
-            stats.get("massDust"),
-            stats.get("massGas"),
-            1 if stats.get("orbitClockwise") else 0,
-            stats.get("orbitPeriod"),
-            stats.get("orbitRadius"),
-            stats.get("pressure"),
-            stats.get("rotationRate"),
-            stats.get("spectralClass"),
-            stats.get("surfaceGravity"),
-            stats.get("temperature"),
-            stats.get("typeDescription"),
+            name_id,
+            name,
+            system.get("security"),
+            system.get("securityClass"),
+            region_id,
+            constellation_id,
+            center.get("x"),
+            center.get("y"),
+            center.get("z"),
+            system.get("sunTypeID"),
+            system.get("sunFlareGraphicID"),
         ))
-        # --- npcStations on planet ---
-        for station_id in planet_data.get("npcStations", {}):
-            station_data = planet_data["npcStations"][station_id]
-            cur.execute("""
-                INSERT INTO npc_stations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                int(planet_id),
-                int(station_id),
-                station_data.get("constructableTypeListID"),
-                1 if station_data.get("isConquerable") else 0,
-                station_data.get("lagrangePoint"),
-                station_data.get("operationID"),
-                station_data.get("orbitID"),
-                station_data.get("ownerID"),
-                station_data.get("reprocessingEfficiency"),
-                station_data.get("reprocessingHangarFlag"),
-                station_data.get("reprocessingStationsTake"),
-                station_data.get("solarSystemID"),
-                station_data.get("stationName"),
-                station_data.get("typeID"),
-                1 if station_data.get("useOperationName") else 0,
-            ))
-        # --- moons ---
-        for moon_id in planet_data.get("moons", {}):
-            moon_data = planet_data["moons"][moon_id]
-            stats_m = moon_data.get("statistics", {})
-            cur.execute("""
-                INSERT INTO moons VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+
+
+        # --- system_planets ---
+        for planet_id in system.get("planets", {}):
+            planet_data = system["planets"][planet_id]
+            stats = planet_data.get("statistics", {})
+            loader.add("planets", (
+                system_id,
                 int(planet_id),
-                int(moon_id),
-                moon_data.get("orbitID"),
-                moon_data.get("typeID"),
-                moon_data.get("radius"),
-                stats_m.get("density"),
-                stats_m.get("eccentricity"),
-                stats_m.get("escapeVelocity"),
-                1 if stats_m.get("fragmented") else 0,
-                stats_m.get("life"),
-                1 if stats_m.get("locked") else 0,
-                stats_m.get("massDust"),
-                stats_m.get("massGas"),
-                1 if stats_m.get("orbitClockwise") else 0,
-                stats_m.get("orbitPeriod"),
-                stats_m.get("orbitRadius"),
-                stats_m.get("pressure"),
-                stats_m.get("rotationRate"),
-                stats_m.get("spectralClass"),
-                stats_m.get("surfaceGravity"),
-                stats_m.get("temperature"),
-                stats_m.get("typeDescription"),
+                planet_data.get("celestialIndex"),
+                planet_data.get("typeID"),
+                planet_data.get("radius"),
+                stats.get("density"),
+                stats.get("eccentricity"),
+                stats.get("escapeVelocity"),
+                1 if stats.get("fragmented") else 0,
+                stats.get("life"),
+                1 if stats.get("locked") else 0,
+                stats.get("massDust"),
+                stats.get("massGas"),
+                1 if stats.get("orbitClockwise") else 0,
+                stats.get("orbitPeriod"),
+                stats.get("orbitRadius"),
+                stats.get("pressure"),
+                stats.get("rotationRate"),
+                stats.get("spectralClass"),
+                stats.get("surfaceGravity"),
+                stats.get("temperature"),
+                stats.get("typeDescription"),
             ))
-            # --- npcStations on moon ---
-            for station_id in moon_data.get("npcStations", {}):
-                station_data = moon_data["npcStations"][station_id]
-                cur.execute("""
-                    INSERT INTO npc_stations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    int(moon_id),
+            # --- npcStations on planet ---
+            for station_id in planet_data.get("npcStations", {}):
+                station_data = planet_data["npcStations"][station_id]
+                loader.add("npc_stations", (
+                    int(planet_id),
                     int(station_id),
                     station_data.get("constructableTypeListID"),
                     1 if station_data.get("isConquerable") else 0,
@@ -392,80 +476,123 @@ for system in solarsystemcontent.values():
                     station_data.get("typeID"),
                     1 if station_data.get("useOperationName") else 0,
                 ))
+            # --- moons ---
+            for moon_id in planet_data.get("moons", {}):
+                moon_data = planet_data["moons"][moon_id]
+                stats_m = moon_data.get("statistics", {})
+                loader.add("moons", (
+                    int(planet_id),
+                    int(moon_id),
+                    moon_data.get("orbitID"),
+                    moon_data.get("typeID"),
+                    moon_data.get("radius"),
+                    stats_m.get("density"),
+                    stats_m.get("eccentricity"),
+                    stats_m.get("escapeVelocity"),
+                    1 if stats_m.get("fragmented") else 0,
+                    stats_m.get("life"),
+                    1 if stats_m.get("locked") else 0,
+                    stats_m.get("massDust"),
+                    stats_m.get("massGas"),
+                    1 if stats_m.get("orbitClockwise") else 0,
+                    stats_m.get("orbitPeriod"),
+                    stats_m.get("orbitRadius"),
+                    stats_m.get("pressure"),
+                    stats_m.get("rotationRate"),
+                    stats_m.get("spectralClass"),
+                    stats_m.get("surfaceGravity"),
+                    stats_m.get("temperature"),
+                    stats_m.get("typeDescription"),
+                ))
+                # --- npcStations on moon ---
+                for station_id in moon_data.get("npcStations", {}):
+                    station_data = moon_data["npcStations"][station_id]
+                    loader.add("npc_stations", (
+                        int(moon_id),
+                        int(station_id),
+                        station_data.get("constructableTypeListID"),
+                        1 if station_data.get("isConquerable") else 0,
+                        station_data.get("lagrangePoint"),
+                        station_data.get("operationID"),
+                        station_data.get("orbitID"),
+                        station_data.get("ownerID"),
+                        station_data.get("reprocessingEfficiency"),
+                        station_data.get("reprocessingHangarFlag"),
+                        station_data.get("reprocessingStationsTake"),
+                        station_data.get("solarSystemID"),
+                        station_data.get("stationName"),
+                        station_data.get("typeID"),
+                        1 if station_data.get("useOperationName") else 0,
+                    ))
+
+        # --- stargates ---
+        for stargate_id in system.get("stargates", {}):
+            stargate_data = system["stargates"][stargate_id]
+            position = stargate_data.get("position", {})
+            loader.add("stargates", (
+                system_id,
+                int(stargate_id),
+                stargate_data.get("destination"),
+                stargate_data.get("typeID"),
+                position.get("x"),
+                position.get("y"),
+                position.get("z"),
+            ))
 
-    # --- stargates ---
-    for stargate_id in system.get("stargates", {}):
-        stargate_data = system["stargates"][stargate_id]
-        position = stargate_data.get("position", {})
-        cur.execute("""
-            INSERT INTO stargates VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            system_id,
-            int(stargate_id),
-            stargate_data.get("destination"),
-            stargate_data.get("typeID"),
-            position.get("x"),
-            position.get("y"),
-            position.get("z"),
-        ))
+        # --- stars ---
+        star = system.get("star")
+        if star:
+            star_stats = star.get("statistics", {})
+            loader.add("stars", (
+                system_id,
+                star.get("id"),
+                star.get("typeID"),
+                star.get("radius"),
+                star_stats.get("radius"),
+                star_stats.get("age"),
+                star_stats.get("life"),
+                1 if star_stats.get("locked") else 0,
+                star_stats.get("luminosity"),
+                star_stats.get("mass"),
+                star_stats.get("metallicity"),
+                star_stats.get("spectralClass"),
+                star_stats.get("temperature"),
+            ))
 
-    # --- stars ---
-    star = system.get("star")
-    if star:
-        star_stats = star.get("statistics", {})
-        cur.execute("""
-            INSERT INTO stars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            system_id,
-            star.get("id"),
-            star.get("typeID"),
-            star.get("radius"),
-            star_stats.get("radius"),
-            star_stats.get("age"),
-            star_stats.get("life"),
-            1 if star_stats.get("locked") else 0,
-            star_stats.get("luminosity"),
-            star_stats.get("mass"),
-            star_stats.get("metallicity"),
-            star_stats.get("spectralClass"),
-            star_stats.get("temperature"),
-        ))
+    loader.flush_all()
+    conn.commit()
+    load_seconds = time.perf_counter() - load_start
+
+    # --- Add station column, merge locationcache.db and regions.db ---
+    cur.execute("ALTER TABLE systems ADD COLUMN station INTEGER DEFAULT 0")
+    merged = merge(conn, inputs.db_dir)
+
+    # --- Secondary indexes ---
+    index_start = time.perf_counter()
+    for statement in INDEXES:
+        cur.execute(statement)
+    index_seconds = time.perf_counter() - index_start
+
+    conn.commit()
+
+    for pragma in SAFE_PRAGMAS:
+        cur.execute(pragma)
+
+    conn.close()
+
+    print("[OK] SQLite DB updated:", inputs.db_path)
+    print("[INFO] Systems:", system_count)
+    print("[INFO] Missing names:", missing_names)
+    loader.print_rates(load_seconds)
+    print("[INFO] Merged:", ", ".join(f"{name} {count}" for name, count in merged.items()) or "nothing")
+    print(f"[INFO] Indexes: {len(INDEXES)} in {index_seconds:.2f}s")
+
+def main():
+    inputs = ConverterInputs(OUTPUT_DIR, SQLITE_DB)
+    try:
+        convert(inputs)
+    finally:
+        inputs.close()
 
-conn.commit()
-
-# --- Add station column and populate from locationcache.db ---
-cur.execute("ALTER TABLE systems ADD COLUMN station INTEGER DEFAULT 0")
-locationcache_db_path = DB_DIR / "locationcache.db"
-if locationcache_db_path.exists():
-    locationcache_conn = sqlite3.connect(locationcache_db_path)
-    locationcache_cur = locationcache_conn.cursor()
-    locationcache_cur.execute("SELECT DISTINCT solar_system_id FROM locationcache_typed WHERE location_type = 'Station'")
-    for row in locationcache_cur:
-        solar_system_id = row[0]
-        cur.execute("UPDATE systems SET station = 1 WHERE solarSystemID = ?", (solar_system_id,))
-    locationcache_conn.close()
-
-# --- Import regions.db tables into eve_universe.db ---
-regions_db_path = DB_DIR / "regions.db"
-if regions_db_path.exists():
-    regions_conn = sqlite3.connect(regions_db_path)
-    regions_cur = regions_conn.cursor()
-    
-    # Copy regions table
-    regions_cur.execute("SELECT * FROM regions")
-    regions_data = regions_cur.fetchall()
-    cur.executemany("INSERT OR REPLACE INTO regions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", regions_data)
-    
-    # Copy region_constellations
-    regions_cur.execute("SELECT * FROM region_constellations")
-    constellations_data = regions_cur.fetchall()
-    cur.executemany("INSERT OR REPLACE INTO region_constellations VALUES (?, ?)", constellations_data)
-    
-    regions_conn.close()
-
-conn.commit()
-conn.close()
-
-print("[OK] SQLite DB updated:", SQLITE_DB)
-print("[INFO] Systems:", len(solarsystemcontent))
-print("[INFO] Missing names:", missing_names)
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
-import json
-import sqlite3
+import sys
 from pathlib import Path
 
 # =====================
@@ -16,71 +15,17 @@ ROOT_DIR = find_repo_root(Path(__file__).resolve().parent)
 DB_DIR = ROOT_DIR / "db"
 OUTPUT_DIR = ROOT_DIR / "output"
 
-SYSTEMS_JSON = OUTPUT_DIR / "systems.json"
-LOCALIZATION_JSON = OUTPUT_DIR / "localization.json"
 SQLITE_DB = DB_DIR / "eve_universe.db"
 
-# =====================
-# LOAD JSON FILES
-# =====================
-
-DB_DIR.mkdir(parents=True, exist_ok=True)
+# converter_inputs lives next to the extractor in the repo root
+sys.path.insert(0, str(ROOT_DIR))
 
-with SYSTEMS_JSON.open("r", encoding="utf-8") as f:
-    systems = json.load(f)
-
-if LOCALIZATION_JSON.exists():
-    with LOCALIZATION_JSON.open("r", encoding="utf-8") as f:
-        localization = json.load(f)
-else:
-    localization = {}
-    print("[WARN] localization.json not found; names will be missing")
+from converter_inputs import ConverterInputs
 
 # =====================
-# SQLITE SETUP
+# HELPERS
 # =====================
 
-conn = sqlite3.connect(SQLITE_DB)
-cur = conn.cursor()
-
-# --- DROP ---
-cur.executescript("""
-DROP TABLE IF EXISTS system_planets;
-DROP TABLE IF EXISTS systems;
-""")
-
-# --- CREATE ---
-cur.executescript("""
-CREATE TABLE systems (
-    solarSystemID      INTEGER PRIMARY KEY,
-    nameID             INTEGER,
-    name               TEXT,
-    securityStatus     REAL,
-    securityClass      TEXT,
-    regionID           INTEGER,
-    constellationID    INTEGER,
-    center_x           REAL,
-    center_y           REAL,
-    center_z           REAL,
-    sunTypeID          INTEGER,
-    sunFlareGraphicID  INTEGER
-);
-
-CREATE TABLE system_planets (
-    solarSystemID INTEGER,
-    planetItemID  INTEGER,
-    PRIMARY KEY (solarSystemID, planetItemID)
-);
-""")
-
-# =====================
-# INSERT DATA
-# =====================
-
-
-
-missing_names = 0
-
 def normalize_name(value):
     if value is None:
         return None
@@ -124,46 +69,115 @@ def resolve_system_name(system, localization_map):
 
     return None
 
-for system in systems.values():
-    system_id = system.get("solarSystemID")
-    name_id = system.get("nameID")
-    name = resolve_system_name(system, localization)
-
-    if not name:
-        missing_names += 1
-
-    center = system.get("center") or {}
-
-    # --- systems ---
-    cur.execute("""
-        INSERT INTO systems VALUES (
-            ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-        )
-    """, (
-        system_id,
-        name_id,
-        name,
-        system.get("securityStatus"),
-        system.get("securityClass"),
-        system.get("regionID"),
-        system.get("constellationID"),
-        center.get("x"),
-        center.get("y"),
-        center.get("z"),
-        system.get("sunTypeID"),
-        system.get("sunFlareGraphicID"),
-    ))
-
-
-    # --- system_planets ---
-    for planet_id in system.get("planetItemIDs", []):
-        cur.execute("""
-            INSERT INTO system_planets VALUES (?, ?)
-        """, (system_id, planet_id))
-
-conn.commit()
-conn.close()
+# =====================
+# CONVERT
+# =====================
 
-print("[OK] SQLite DB created:", SQLITE_DB)
-print("[INFO] Systems:", len(systems))
-print("[INFO] Missing names:", missing_names)
+def convert(inputs):
+    """Write the systems and system_planets tables of eve_universe.db."""
+
+    inputs.db_dir.mkdir(parents=True, exist_ok=True)
+
+    # localization.bin (indexed, mmap'ed) if present, else localization.json
+    localization = inputs.localization
+
+    # =====================
+    # SQLITE SETUP
+    # =====================
+
+    conn = inputs.connect()
+    cur = conn.cursor()
+
+    # --- DROP ---
+    cur.executescript("""
+    DROP TABLE IF EXISTS system_planets;
+    DROP TABLE IF EXISTS systems;
+    """)
+
+    # --- CREATE ---
+    cur.executescript("""
+    CREATE TABLE systems (
+        solarSystemID      INTEGER PRIMARY KEY,
+        nameID             INTEGER,
+        name               TEXT,
+        securityStatus     REAL,
+        securityClass      TEXT,
+        regionID           INTEGER,
+        constellationID    INTEGER,
+        center_x           REAL,
+        center_y           REAL,
+        center_z           REAL,
+        sunTypeID          INTEGER,
+        sunFlareGraphicID  INTEGER
+    );
+
+    CREATE TABLE system_planets (
+        solarSystemID INTEGER,
+        planetItemID  INTEGER,
+        PRIMARY KEY (solarSystemID, planetItemID)
+    );
+    """)
+
+    # =====================
+    # INSERT DATA
+    # =====================
+
+    missing_names = 0
+    system_count = 0
+
+    # systems.json / .ndjson / compressed variants, parsed once and shared
+    # with solarsystemcontent when run from json_to_sqlite_main.py
+    for _, system in inputs.systems.items():
+        system_count += 1
+        system_id = system.get("solarSystemID")
+        name_id = system.get("nameID")
+        name = resolve_system_name(system, localization)
+
+        if not name:
+            missing_names += 1
+
+        center = system.get("center") or {}
+
+        # --- systems ---
+        cur.execute("""
+            INSERT INTO systems VALUES (
+                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+            )
+        """, (
+            system_id,
+            name_id,
+            name,
+            system.get("securityStatus"),
+            system.get("securityClass"),
+            system.get("regionID"),
+            system.get("constellationID"),
+            center.get("x"),
+            center.get("y"),
+            center.get("z"),
+            system.get("sunTypeID"),
+            system.get("sunFlareGraphicID"),
+        ))
+
+
+        # --- system_planets ---
+        for planet_id in system.get("planetItemIDs", []):
+            cur.execute("""
+                INSERT INTO system_planets VALUES (?, ?)
+            """, (system_id, planet_id))
+
+    conn.commit()
+    conn.close()
+
+    print("[OK] SQLite DB created:", inputs.db_path)
+    print("[INFO] Systems:", system_count)
+    print("[INFO] Missing names:", missing_names)
+
+def main():
+    inputs = ConverterInputs(OUTPUT_DIR, SQLITE_DB)
+    try:
+        convert(inputs)
+    finally:
+        inputs.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
-import json
-import sqlite3
+import sys
 from pathlib import Path
 
 # =====================
@@ -16,10 +15,14 @@ ROOT_DIR = find_repo_root(Path(__file__).resolve().parent)
 DB_DIR = ROOT_DIR / "db"
 OUTPUT_DIR = ROOT_DIR / "output"
 
-TYPES_JSON = OUTPUT_DIR / "types.json"
-LOCALIZATION_JSON = OUTPUT_DIR / "localization.json"
 SQLITE_DB = DB_DIR / "eve_universe.db"
 
+# record_io and converter_inputs live next to the extractor in the repo root
+sys.path.insert(0, str(ROOT_DIR))
+
+from record_io import iter_container
+from converter_inputs import ConverterInputs
+
 # =====================
 # HELPERS
 # =====================
@@ -62,88 +65,97 @@ def resolve_type_name(type_data, localization_map):
     return direct_name
 
 # =====================
-# LOAD JSON
-# =====================
-
-DB_DIR.mkdir(parents=True, exist_ok=True)
-
-with TYPES_JSON.open("r", encoding="utf-8") as f:
-    types = json.load(f)
-
-if LOCALIZATION_JSON.exists():
-    with LOCALIZATION_JSON.open("r", encoding="utf-8") as f:
-        localization = json.load(f)
-else:
-    localization = {}
-    print("[WARN] localization.json not found; names will be missing")
-
-# =====================
-# SQLITE SETUP
-# =====================
-
-conn = sqlite3.connect(SQLITE_DB)
-cur = conn.cursor()
-
-cur.executescript("""
-DROP TABLE IF EXISTS types;
-
-CREATE TABLE types (
-    typeID          INTEGER PRIMARY KEY,
-    typeNameID      INTEGER,
-    name            TEXT,
-    groupID         INTEGER,
-    volume          REAL,
-    mass            REAL,
-    capacity        REAL,
-    radius          REAL,
-    published       INTEGER,
-    basePrice       REAL,
-    descriptionID   INTEGER,
-    graphicID       INTEGER,
-    raceID          INTEGER,
-    portionSize     INTEGER,
-    platforms       INTEGER
-);
-""")
-
-# =====================
-# INSERT DATA
+# CONVERT
 # =====================
 
-missing_names = 0
-
-for type_id_str, t in types.items():
-    type_id = int(type_id_str)
-
-    name_id = t.get("typeNameID")
-    name = resolve_type_name(t, localization)
-
-    if not name:
-        missing_names += 1
-
-    cur.execute("""
-        INSERT INTO types VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        type_id,
-        name_id,
-        name,
-        t.get("groupID"),
-        t.get("volume"),
-        t.get("mass"),
-        t.get("capacity"),
-        t.get("radius"),
-        t.get("published"),
-        t.get("basePrice"),
-        t.get("descriptionID"),
-        t.get("graphicID"),
-        t.get("raceID"),
-        t.get("portionSize"),
-        t.get("platforms"),
-    ))
-
-conn.commit()
-conn.close()
-
-print("[OK] types imported into SQLite")
-print("[INFO] types:", len(types))
-print("[INFO] missing names:", missing_names)
+def convert(inputs):
+    """Write the types table of eve_universe.db; inputs is a ConverterInputs."""
+
+    inputs.db_dir.mkdir(parents=True, exist_ok=True)
+
+    # localization.bin (indexed, mmap'ed) if present, else localization.json
+    localization = inputs.localization
+
+    # =====================
+    # SQLITE SETUP
+    # =====================
+
+    conn = inputs.connect()
+    cur = conn.cursor()
+
+    cur.executescript("""
+    DROP TABLE IF EXISTS types;
+
+    CREATE TABLE types (
+        typeID          INTEGER PRIMARY KEY,
+        typeNameID      INTEGER,
+        name            TEXT,
+        groupID         INTEGER,
+        volume          REAL,
+        mass            REAL,
+        capacity        REAL,
+        radius          REAL,
+        published       INTEGER,
+        basePrice       REAL,
+        descriptionID   INTEGER,
+        graphicID       INTEGER,
+        raceID          INTEGER,
+        portionSize     INTEGER,
+        platforms       INTEGER
+    );
+    """)
+
+    # =====================
+    # INSERT DATA
+    # =====================
+
+    missing_names = 0
+    type_count = 0
+
+    # types.json / .ndjson / compressed variants, read record by record
+    for type_id_str, t in iter_container(inputs.output_dir, "types"):
+        type_id = int(type_id_str)
+        type_count += 1
+
+        name_id = t.get("typeNameID")
+        name = resolve_type_name(t, localization)
+
+        if not name:
+            missing_names += 1
+
+        cur.execute("""
+            INSERT INTO types VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            type_id,
+            name_id,
+            name,
+            t.get("groupID"),
+            t.get("volume"),
+            t.get("mass"),
+            t.get("capacity"),
+            t.get("radius"),
+            t.get("published"),
+            t.get("basePrice"),
+            t.get("descriptionID"),
+            t.get("graphicID"),
+            t.get("raceID"),
+            t.get("portionSize"),
+            t.get("platforms"),
+        ))
+
+    conn.commit()
+    conn.close()
+
+    print("[OK] types imported into SQLite")
+    print("[INFO] types:", type_count)
+    print("[INFO] missing names:", missing_names)
+
+def main():
+    inputs = ConverterInputs(OUTPUT_DIR, SQLITE_DB)
+    try:
+        convert(inputs)
+    finally:
+        inputs.close()
+
+if __name__ == "__main__":
+    main()
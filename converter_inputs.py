@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Inputs shared by the JSON -> SQLite converters in convert/.
+
+Several converters need the same parsed inputs: every one that writes
+names reads localization, and solarsystemcontent also needs systems for
+the nameIDs and region / constellation IDs. convert/json_to_sqlite_main.py
+runs all converters in one process and hands them one ConverterInputs, so
+each input is parsed once. A converter run on its own makes its own.
+
+Inputs are read on first use and kept until close(). connect() opens the
+eve_universe.db being written: the live file for a converter run on its
+own, or the scratch copy json_to_sqlite_main.py publishes afterwards (see
+db_publish.py).
+"""
+
+import sqlite3
+from pathlib import Path
+
+from localization_store import open_localization
+from record_io import find_container_file, load_container
+
+# marks an input that has not been read yet
+UNREAD = object()
+
+
+class ConverterInputs:
+
+    def __init__(self, output_dir: Path, db_path: Path, scratch=False):
+
+        self.output_dir = Path(output_dir)
+        self.db_path = Path(db_path)
+
+        # side databases (regions.db, locationcache.db) sit next to it
+        self.db_dir = self.db_path.parent
+
+        # nobody reads a scratch database until it is published, so it is
+        # written without a rollback journal or fsyncs
+        self.scratch = scratch
+
+        self._localization = UNREAD
+        self._systems = UNREAD
+
+    @property
+    def localization(self):
+        """localization.bin / .json as a mapping; {} if there is none."""
+
+        if self._localization is UNREAD:
+
+            # localization.bin (indexed, mmap'ed) if present, else localization.json
+            localization = open_localization(self.output_dir)
+
+            if localization is None:
+                localization = {}
+                print("[WARN] localization not found; names will be missing")
+
+            self._localization = localization
+
+        return self._localization
+
+    @property
+    def systems(self):
+        """The systems container as {solarSystemID (str): record}."""
+
+        if self._systems is UNREAD:
+            self._systems = load_container(self.output_dir, "systems")
+
+        return self._systems
+
+    def connect(self):
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path)
+
+        if self.scratch:
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+
+        return conn
+
+    def has_container(self, container):
+        return find_container_file(self.output_dir, container) is not None
+
+    def close(self):
+
+        if self._localization is not UNREAD and hasattr(self._localization, "close"):
+            self._localization.close()
+
+        self._localization = UNREAD
+        self._systems = UNREAD
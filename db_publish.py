@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Build-then-swap publishing for db/eve_universe.db.
+
+The converters write into a scratch copy next to the live database
+
+  db/eve_universe.db.building
+
+which is checked (ANALYZE, PRAGMA optimize, integrity_check) and then
+renamed over db/eve_universe.db in one os.replace(). Readers such as the
+browser open either the old or the new file, never a half-built one. The
+replaced database is kept as
+
+  db/eve_universe.db.previous
+
+and rollback() swaps the two back.
+"""
+
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+
+BUILD_SUFFIX = ".building"
+PREVIOUS_SUFFIX = ".previous"
+
+
+class PublishError(Exception):
+    pass
+
+
+def build_path(db_path: Path):
+    return Path(db_path).with_name(Path(db_path).name + BUILD_SUFFIX)
+
+
+def previous_path(db_path: Path):
+    return Path(db_path).with_name(Path(db_path).name + PREVIOUS_SUFFIX)
+
+
+def side_files(path: Path):
+    """Rollback journal / WAL files SQLite may leave next to a database."""
+
+    return [
+        path.with_name(path.name + suffix)
+        for suffix in ("-journal", "-wal", "-shm")
+        if path.with_name(path.name + suffix).exists()
+    ]
+
+
+def start_build(db_path: Path):
+    """
+    Create the scratch database as a copy of the live one, so tables this
+    run does not rewrite (e.g. localized_names without --languages) carry
+    over as before. Returns its path.
+    """
+
+    db_path = Path(db_path)
+    build = build_path(db_path)
+
+    build.parent.mkdir(parents=True, exist_ok=True)
+
+    for path in [build, *side_files(build)]:
+        path.unlink(missing_ok=True)
+
+    if db_path.exists():
+        # backup API: a consistent copy even if someone is reading the live file
+        src = sqlite3.connect(db_path.resolve().as_uri() + "?mode=ro", uri=True)
+        dst = sqlite3.connect(build)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+
+    return build
+
+
+def finish_build(build: Path):
+    """Refresh planner statistics and check the scratch database."""
+
+    conn = sqlite3.connect(build)
+    try:
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+
+        result = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    finally:
+        conn.close()
+
+    if result != ["ok"]:
+        raise PublishError(f"integrity check failed for {build}: {'; '.join(result[:5])}")
+
+
+def keep_copy(src: Path, dst: Path):
+    """Make dst a copy of src (a hard link where possible) without touching src."""
+
+    tmp = dst.with_name(dst.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+
+    os.replace(tmp, dst)
+
+
+def publish(db_path: Path):
+    """
+    Swap the finished scratch database in for the live one and keep the
+    replaced one as the previous generation.
+    """
+
+    db_path = Path(db_path)
+    build = build_path(db_path)
+
+    if not build.exists():
+        raise PublishError(f"nothing to publish: {build} does not exist")
+
+    # a hot journal next to the live name would be replayed into the new file
+    busy = side_files(db_path)
+    if busy:
+        raise PublishError(
+            f"{db_path.name} is being written ({', '.join(p.name for p in busy)}); not replaced"
+        )
+
+    if db_path.exists():
+        keep_copy(db_path, previous_path(db_path))
+
+    os.replace(build, db_path)
+
+
+def rollback(db_path: Path):
+    """Swap the live and previous databases (running it twice undoes it)."""
+
+    db_path = Path(db_path)
+    previous = previous_path(db_path)
+
+    if not previous.exists():
+        raise PublishError(f"no previous database to roll back to ({previous.name} not found)")
+
+    busy = side_files(db_path)
+    if busy:
+        raise PublishError(
+            f"{db_path.name} is being written ({', '.join(p.name for p in busy)}); not replaced"
+        )
+
+    swap = db_path.with_name(db_path.name + ".rollback")
+
+    if db_path.exists():
+        keep_copy(db_path, swap)
+
+    os.replace(previous, db_path)
+
+    if swap.exists():
+        os.replace(swap, previous)
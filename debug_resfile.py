@@ -25,6 +25,9 @@ import sys
 from pathlib import Path
 import importlib.util
 
+from loader_index import find_loader
+from resfileindex import load_index
+
 IS_WIN = sys.platform.startswith("win")
 IS_MAC = sys.platform == "darwin"
 
@@ -43,50 +46,16 @@ def resfiles_root(game_path: Path) -> Path:
     return game_path / "ResFiles"
 
 
-# ------------------------------------------------------------
-# RESFILEINDEX
-# ------------------------------------------------------------
-
-def load_resfileindex(index_path: Path):
-    mapping = {}
-    with index_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            if not (
-                line.startswith("res:/staticdata/")
-                or line.startswith("res:/localizationfsd/")
-            ):
-                continue
-
-            respath, folder, *_ = line.strip().split(",")
-
-            container = (
-                respath
-                .replace("res:/staticdata/", "")
-                .replace("res:/localizationfsd/", "")
-            )
-
-            for ext in (".static", ".fsdbinary", ".pickle"):
-                if container.endswith(ext):
-                    container = container[: -len(ext)]
-
-            mapping[container.lower()] = folder
-
-    return mapping
-
-
 # ------------------------------------------------------------
 # LOADER DETECTION
 # ------------------------------------------------------------
 
 def find_builtin_loader(game_path: Path, container: str):
-    ext = ".pyd" if IS_WIN else ".so"
-    wanted = f"{container}loader{ext}".lower()
-
-    print("[DEBUG] Scanning bin64 for loaders...")
-    for p in bin64_root(game_path).rglob(f"*{ext}"):
-        if wanted == p.name.lower():
-            print("[FOUND] BUILT loader:", p.name)
-            return p
+    print("[DEBUG] Looking up loader in bin64 index...")
+    p = find_loader(bin64_root(game_path), container)
+    if p is not None:
+        print("[FOUND] BUILT loader:", p.name)
+        return p
 
     print("[INFO] No BUILT loader found")
     return None
@@ -126,6 +95,44 @@ def find_schema(mapping, container):
     return mapping.get(key)
 
 
+# ------------------------------------------------------------
+# INSPECT LOADED DATA
+# ------------------------------------------------------------
+
+def inspect_data(data):
+    """Print what the loader returned and the first object's fields.
+    Returns False if there is nothing to write an extractor for."""
+
+    print()
+    print("[DEBUG] data type:", type(data))
+    print("[DEBUG] has items:", hasattr(data, "items"))
+    print("[DEBUG] length:", len(data) if hasattr(data, "__len__") else "N/A")
+
+    if not hasattr(data, "items"):
+        print("[WARN] Data is not dict-like")
+        return False
+
+    # --- SAFE FIRST ELEMENT EXTRACTION ---
+    try:
+        first_key, first_obj = next(iter(data.items()))
+    except Exception as e:
+        print("[ERROR] Failed to extract first element:", e)
+        return False
+
+
+    print()
+    print("[DEBUG] First key:", first_key)
+    print("[DEBUG] First object type:", type(first_obj))
+    print("[DEBUG] First object repr:", repr(first_obj))
+
+    print()
+    print("[DEBUG] Accessible fields:")
+    for f in safe_fields(first_obj):
+        print(" ", f)
+
+    return True
+
+
 # ------------------------------------------------------------
 # MAIN DEBUG LOGIC
 # ------------------------------------------------------------
@@ -138,18 +145,26 @@ def main():
     args = ap.parse_args()
 
     game_path = Path(args.eve)
-    container = args.container.lower()
+    container = args.container
 
     print("=" * 60)
     print("EVE FRONTIER RESFILE DEBUGGER")
     print("=" * 60)
 
-    mapping = load_resfileindex(Path(args.index))
+    index = load_index(Path(args.index))
+    mapping = index.mapping()
 
-    if container not in mapping:
+    key = index.resolve(container)
+
+    if key is None:
         print("[ERROR] Container not found in resfileindex")
+        similar = index.glob(f"*{container}*")[:20]
+        if similar:
+            print("[INFO] Similar containers:", ", ".join(similar))
         return
 
+    container = key
+
     fsd_file = resfiles_root(game_path) / mapping[container]
 
     print("[INFO] Container:", container)
@@ -196,36 +211,9 @@ def main():
 
 
 
-    print()
-    print("[DEBUG] data type:", type(data))
-    print("[DEBUG] has items:", hasattr(data, "items"))
-    print("[DEBUG] length:", len(data) if hasattr(data, "__len__") else "N/A")
-
-    if not hasattr(data, "items"):
-        print("[WARN] Data is not dict-like")
-        return
-
-    # --- SAFE FIRST ELEMENT EXTRACTION ---
-    try:
-        if hasattr(data, "items"):
-            first_key, first_obj = next(iter(data.items()))
-        else:
-            raise RuntimeError("Data is not dict-like")
-    except Exception as e:
-        print("[ERROR] Failed to extract first element:", e)
+    if not inspect_data(data):
         return
 
-
-    print()
-    print("[DEBUG] First key:", first_key)
-    print("[DEBUG] First object type:", type(first_obj))
-    print("[DEBUG] First object repr:", repr(first_obj))
-
-    print()
-    print("[DEBUG] Accessible fields:")
-    for f in safe_fields(first_obj):
-        print(" ", f)
-
     print()
     print("✔ Debug complete.")
     print("You can now write a proper extractor for this container.")
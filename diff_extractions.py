@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compare two extractor output folders (for example two game builds).
+
+For every container in the manifests the per-record hashes written by the
+extractor (<container>.hashes.json) are compared key by key. Only the
+records whose hash differs are read back from the container files, to list
+the fields that changed. Containers built from the same resfile with the
+same settings are reported unchanged without reading anything (--full
+compares their hashes anyway). Output from before the hash sidecars
+existed is hashed from the container file instead, which is slower.
+
+  python3 diff_extractions.py output_c4 output_c5
+  python3 diff_extractions.py output_c4 output_c5 -c types,systems --show 20 --report diff.json
+
+Exits with status 1 if anything differs, like diff.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from record_hashes import hash_records, hashes_path, read_hashes
+from record_io import iter_keyed, iter_selected
+
+MANIFEST_NAME = "manifest.json"
+
+# manifest entries that are not record containers
+NOT_CONTAINERS = ("localization_languages",)
+
+# field differences kept per changed record
+MAX_FIELDS = 50
+
+
+# ------------------------------------------------------------
+# LOAD
+# ------------------------------------------------------------
+
+def load_manifest(out_dir: Path):
+
+    path = Path(out_dir) / MANIFEST_NAME
+
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f).get("containers", {})
+    except (OSError, ValueError) as exc:
+        raise SystemExit(f"[ERROR] cannot read {path}: {exc}")
+
+
+def container_hashes(out_dir: Path, container, entry):
+
+    hashes = read_hashes(hashes_path(out_dir, container))
+
+    if hashes is not None:
+        return hashes
+
+    path = Path(out_dir) / entry["output"]
+
+    print(f"[INFO] {container}: no hash sidecar in {out_dir}, hashing {path.name}")
+
+    return hash_records(iter_keyed(path))
+
+
+# ------------------------------------------------------------
+# COMPARE
+# ------------------------------------------------------------
+
+def changed_fields(old, new, path=""):
+    """Yield (path, old value, new value) for every leaf that differs."""
+
+    if type(old) is dict and type(new) is dict:
+
+        for key in sorted(old.keys() | new.keys()):
+
+            sub = f"{path}.{key}" if path else str(key)
+
+            if key not in old:
+                yield sub, None, new[key]
+            elif key not in new:
+                yield sub, old[key], None
+            else:
+                yield from changed_fields(old[key], new[key], sub)
+
+        return
+
+    if type(old) is list and type(new) is list:
+
+        for i in range(max(len(old), len(new))):
+
+            sub = f"{path}[{i}]"
+
+            if i >= len(old):
+                yield sub, None, new[i]
+            elif i >= len(new):
+                yield sub, old[i], None
+            else:
+                yield from changed_fields(old[i], new[i], sub)
+
+        return
+
+    if old != new or type(old) is not type(new):
+        yield path, old, new
+
+
+def diff_container(old_dir, new_dir, container, old_entry, new_entry):
+
+    old_hashes = container_hashes(old_dir, container, old_entry)
+    new_hashes = container_hashes(new_dir, container, new_entry)
+
+    added = sorted(new_hashes.keys() - old_hashes.keys())
+    removed = sorted(old_hashes.keys() - new_hashes.keys())
+
+    changed_keys = sorted(
+        k for k in old_hashes.keys() & new_hashes.keys() if old_hashes[k] != new_hashes[k]
+    )
+
+    changed = {}
+
+    if changed_keys:
+
+        old_records = dict(iter_selected(Path(old_dir) / old_entry["output"], changed_keys))
+        new_records = dict(iter_selected(Path(new_dir) / new_entry["output"], changed_keys))
+
+        for key in changed_keys:
+
+            fields = []
+
+            for diff in changed_fields(old_records.get(key), new_records.get(key)):
+                fields.append(list(diff))
+                if len(fields) >= MAX_FIELDS:
+                    break
+
+            changed[key] = fields
+
+    return {
+        "old": len(old_hashes),
+        "new": len(new_hashes),
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+    }
+
+
+# ------------------------------------------------------------
+# REPORT
+# ------------------------------------------------------------
+
+def short(value, limit=60):
+
+    text = json.dumps(value, ensure_ascii=False)
+
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def print_summary(results):
+
+    print()
+    print(f"   {'container':<28} {'old':>9} {'new':>9} {'added':>8} {'removed':>8} {'changed':>8}")
+
+    for container, r in results.items():
+
+        if r is None:
+            print(f"   {container:<28} {'-':>9} {'-':>9} {'unchanged (same resfile)':>35}")
+            continue
+
+        print(
+            f"   {container:<28} {r['old']:>9} {r['new']:>9} "
+            f"{len(r['added']):>8} {len(r['removed']):>8} {len(r['changed']):>8}"
+        )
+
+
+def print_examples(results, show):
+
+    for container, r in results.items():
+
+        if not r or not (r["added"] or r["removed"] or r["changed"]):
+            continue
+
+        print()
+        print(f"[{container}]")
+
+        for key in r["added"][:show]:
+            print(f"   + {key}")
+
+        for key in r["removed"][:show]:
+            print(f"   - {key}")
+
+        for key, fields in list(r["changed"].items())[:show]:
+
+            print(f"   ~ {key}")
+
+            for path, old, new in fields[:show]:
+                print(f"       {path or '(record)'}: {short(old)} → {short(new)}")
+
+
+def main():
+
+    ap = argparse.ArgumentParser(description="Compare two extractor output folders record by record")
+    ap.add_argument("old", help="older output folder (with manifest.json)")
+    ap.add_argument("new", help="newer output folder (with manifest.json)")
+    ap.add_argument("-c", "--containers", help="comma-separated containers (default: all in either manifest)")
+    ap.add_argument("--show", type=int, default=10, help="example keys / fields to print per container (default 10)")
+    ap.add_argument("--report", help="write every added / removed / changed key and field to this JSON file")
+    ap.add_argument("--full", action="store_true", help="compare hashes even for containers with the same resfile")
+    args = ap.parse_args()
+
+    old_dir = Path(args.old)
+    new_dir = Path(args.new)
+
+    old_manifest = load_manifest(old_dir)
+    new_manifest = load_manifest(new_dir)
+
+    if args.containers:
+        containers = [c.strip() for c in args.containers.split(",") if c.strip()]
+    else:
+        containers = sorted((old_manifest.keys() | new_manifest.keys()) - set(NOT_CONTAINERS))
+
+    results = {}
+    only = []
+
+    for container in containers:
+
+        old_entry = old_manifest.get(container)
+        new_entry = new_manifest.get(container)
+
+        if old_entry is None or new_entry is None:
+            side = old_dir if old_entry is not None else new_dir
+            only.append(f"{container} (only in {side})")
+            continue
+
+        if (
+            not args.full
+            and old_entry.get("resfile") is not None
+            and old_entry.get("resfile") == new_entry.get("resfile")
+            and old_entry.get("settings") == new_entry.get("settings")
+        ):
+            results[container] = None
+            continue
+
+        results[container] = diff_container(old_dir, new_dir, container, old_entry, new_entry)
+
+    print_summary(results)
+
+    for line in only:
+        print("   [WARN]", line)
+
+    if args.show > 0:
+        print_examples(results, args.show)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(
+                {c: r for c, r in results.items() if r is not None},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print()
+        print("[OK] report →", args.report)
+
+    differs = bool(only) or any(
+        r and (r["added"] or r["removed"] or r["changed"]) for r in results.values()
+    )
+
+    sys.exit(1 if differs else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Long-lived extraction server and its thin client.
+
+Every EF_Extractor_V4.py / debug_resfile.py run starts a new interpreter,
+imports fsd.schemas.binaryLoader and execs the *loader.so modules again.
+The server pays for that once: it keeps the loader modules imported and
+the most recently opened containers in an LRU cache, and answers extract
+and inspect requests from the client commands in this same file.
+
+  python3 extract_server.py serve -e "<game>" -i "<game>/stillness/resfileindex.txt"
+  python3 extract_server.py extract -o output -c types,systems
+  python3 extract_server.py inspect -c solarsystemcontent
+  python3 extract_server.py status
+  python3 extract_server.py stop
+
+Protocol: one JSON object per line in each direction, over a Unix socket
+(.cache/extract_server.sock, owner only) or, with --port or where AF_UNIX
+is missing, 127.0.0.1:PORT. Over TCP every request carries the token the
+server writes to .cache/extract_server.token (owner only), so other local
+users cannot drive it. Output goes only below the server's --out-root.
+Requests are served one at a time; the CCP loaders are not thread-safe.
+
+EF_Extractor_V4.py and debug_resfile.py are re-imported when their source
+changes, so edits to an extractor apply to the next request. A loader that
+crashes the interpreter takes the server down with it; start it again.
+"""
+
+import argparse
+import contextlib
+import hmac
+import importlib
+import importlib.util
+import io
+import json
+import os
+import secrets
+import socket
+import sys
+import time
+import traceback
+from collections import OrderedDict
+from pathlib import Path
+
+import EF_Extractor_V4 as v4
+import debug_resfile as debugger
+from loader_index import find_loader
+from loader_profile import profiled_loader
+from resfileindex import CACHE_DIR, load_index
+
+SOCKET_PATH = CACHE_DIR / "extract_server.sock"
+TOKEN_PATH = CACHE_DIR / "extract_server.token"
+DEFAULT_PORT = 47651
+
+# extract requests may only write below this (serve --out-root)
+OUT_ROOT = Path(__file__).resolve().parent / "output"
+
+# opened containers kept by default
+DEFAULT_CACHE = 8
+
+
+# ------------------------------------------------------------
+# CACHES
+# ------------------------------------------------------------
+
+class ContainerCache:
+    """
+    LRU of loader results, keyed by resfile path.
+
+    An entry is reused only while the resfile (and schema) are unchanged;
+    the least recently used container is dropped beyond `limit`.
+    """
+
+    def __init__(self, limit=DEFAULT_CACHE):
+
+        self.limit = limit
+        self.hits = 0
+        self.misses = 0
+
+        # fsd path -> (stamp, container, data, opened at)
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, fsd_file: Path, schema_file, container, load):
+
+        st = fsd_file.stat()
+        stamp = (st.st_mtime_ns, st.st_size, str(schema_file))
+
+        key = str(fsd_file)
+        entry = self._entries.get(key)
+
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+
+        data = load()
+
+        if self.limit > 0:
+            self._entries[key] = (stamp, container, data, time.time())
+            self._entries.move_to_end(key)
+
+        while len(self._entries) > self.limit:
+            self._entries.popitem(last=False)
+
+        return data
+
+    def describe(self):
+        """[(container, seconds since opened)], most recently used last."""
+
+        now = time.time()
+
+        return [(c, round(now - opened, 1)) for _, c, _, opened in self._entries.values()]
+
+
+class ExtractionServer:
+
+    def __init__(self, game_path: Path, index_path: Path, cache_size=DEFAULT_CACHE, out_root: Path = OUT_ROOT):
+
+        self.game_path = Path(game_path)
+        self.index_path = Path(index_path)
+        self.out_root = Path(out_root).resolve()
+
+        self.cache = ContainerCache(cache_size)
+
+        # loader .so / .pyd path -> imported module
+        self.modules = {}
+
+        # the extractor / debugger modules, replaced when their source changes
+        self.v4 = v4
+        self.debugger = debugger
+
+        # module name -> source mtime when imported
+        self.sources = {m.__name__: source_mtime(m) for m in (v4, debugger)}
+
+        self.started = time.time()
+        self.requests = 0
+        self.running = True
+
+    # --------------------------------------------------------
+    # loading
+    # --------------------------------------------------------
+
+    def loader_module(self, path: Path):
+
+        module = self.modules.get(str(path))
+
+        if module is None:
+
+            print("[INFO] Importing loader:", path.name)
+
+            spec = importlib.util.spec_from_file_location(path.stem, path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+
+            self.modules[str(path)] = module
+
+        return module
+
+    def load(self, game_path, container, fsd_file, schema_file):
+        """Drop-in for v4.load_fsd() that reuses modules and containers."""
+
+        def open_container():
+
+            root = self.v4.bin64_root(game_path)
+            loader = profiled_loader(root, container)
+
+            # calibrated schema path (v4 --calibrate)
+            if loader is not None and loader != "built":
+                return self.v4.load_with(loader, game_path, container, fsd_file, schema_file)
+
+            p = find_loader(root, container)
+
+            if p is None:
+                return self.v4.load_schema_fsd(game_path, fsd_file, schema_file)
+
+            sys.path.insert(0, str(root))
+
+            try:
+                return self.loader_module(p).load(str(fsd_file))
+            finally:
+                sys.path.remove(str(root))
+
+        return self.cache.get(Path(fsd_file), schema_file, container, open_container)
+
+    def refresh_modules(self):
+        """Re-import the extractor / debugger if their source changed."""
+
+        for attr in ("v4", "debugger"):
+
+            module = getattr(self, attr)
+            mtime = source_mtime(module)
+
+            if self.sources.get(module.__name__) == mtime:
+                continue
+
+            print("[INFO] Reloading", module.__name__)
+
+            self.sources[module.__name__] = mtime
+            setattr(self, attr, importlib.reload(module))
+
+    # --------------------------------------------------------
+    # requests
+    # --------------------------------------------------------
+
+    def handle(self, request):
+        """Answer one request; everything printed goes back in "log"."""
+
+        self.requests += 1
+
+        op = request.get("op")
+        handler = getattr(self, f"op_{op}", None)
+
+        if handler is None:
+            return {"ok": False, "error": f"unknown op: {op!r}", "log": ""}
+
+        log = io.StringIO()
+
+        try:
+            with contextlib.redirect_stdout(log):
+                self.refresh_modules()
+                response = handler(request)
+        except Exception as exc:
+            log.write(traceback.format_exc())
+            response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+        response.setdefault("ok", True)
+        response["log"] = log.getvalue()
+
+        return response
+
+    def index(self):
+        return load_index(self.index_path)
+
+    def output_dir(self, out):
+        """out resolved (relative to out_root); refused unless it is below out_root."""
+
+        out_dir = (self.out_root / out).resolve()
+
+        if not out_dir.is_relative_to(self.out_root):
+            raise PermissionError(f"{out_dir} is outside the server's output root {self.out_root}")
+
+        return out_dir
+
+    def op_extract(self, request):
+
+        v4 = self.v4
+
+        index = self.index()
+        entries = index.containers
+        mapping = index.mapping()
+
+        out_dir = self.output_dir(request["out"])
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        containers = request["containers"]
+
+        if containers == ["all"]:
+            containers = index.staticdata()
+
+        fields = {
+            c: sorted(set(p))
+            for c, p in v4.parse_fields(request.get("fields", [])).items()
+        }
+
+        options = {
+            "stream": request.get("stream", False),
+            "format": request.get("format", "json"),
+            "projections": {c: v4.build_projection(p) for c, p in fields.items()},
+            "prune_localization": False,
+        }
+
+        if options["format"] not in v4.FORMATS:
+            raise ValueError(f"unknown format: {options['format']}")
+
+        manifest = v4.load_manifest(out_dir)
+        results = []
+
+        for container in containers:
+
+            # Always re-extracted: the server is for iterating on extractors
+            manifest["containers"].pop(container, None)
+
+            try:
+                result = v4.extract_container(
+                    self.game_path, mapping, container, out_dir, options, self.load
+                )
+            except Exception as exc:
+                print(f"[ERROR] {container}: {type(exc).__name__}: {exc}")
+                results.append([container, "error", f"{type(exc).__name__}: {exc}"])
+                continue
+
+            v4.record_extraction(
+                manifest,
+                container,
+                v4.resfile_fingerprint(entries, container),
+                result["out"],
+                {"fields": fields[container]} if container in fields else None,
+                {
+                    "bytes": v4.resfile_size(self.game_path, mapping, container),
+                    "seconds": result["seconds"],
+                },
+            )
+            v4.save_manifest(out_dir, manifest)
+
+            results.append([container, "ok", {"out": result["out"], "seconds": result["seconds"]}])
+
+        return {
+            "ok": all(status == "ok" for _, status, _ in results),
+            "results": results,
+        }
+
+    def op_inspect(self, request):
+
+        index = self.index()
+        mapping = index.mapping()
+
+        name = request["container"]
+        container = index.resolve(name)
+
+        if container is None:
+            similar = index.glob(f"*{name}*")[:20]
+            hint = f" (similar: {', '.join(similar)})" if similar else ""
+            return {"ok": False, "error": f"container not in resfileindex: {name}{hint}"}
+
+        fsd_file, schema = self.v4.resolve_paths(self.game_path, mapping, container)
+
+        data = self.load(self.game_path, container, fsd_file, schema)
+
+        return {"ok": self.debugger.inspect_data(data), "container": container}
+
+    def op_status(self, request):
+
+        return {
+            "game": str(self.game_path),
+            "index": str(self.index_path),
+            "out_root": str(self.out_root),
+            "uptime": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "cache": {
+                "limit": self.cache.limit,
+                "hits": self.cache.hits,
+                "misses": self.cache.misses,
+                "containers": self.cache.describe(),
+            },
+            "loader_modules": sorted(Path(p).name for p in self.modules),
+        }
+
+    def op_stop(self, request):
+
+        self.running = False
+
+        return {}
+
+
+def source_mtime(module):
+    return Path(module.__file__).stat().st_mtime_ns
+
+
+# ------------------------------------------------------------
+# TRANSPORT
+# ------------------------------------------------------------
+
+def server_address(args):
+    """Unix socket path, or (host, port) for TCP."""
+
+    if args.port or not hasattr(socket, "AF_UNIX"):
+        return ("127.0.0.1", args.port or DEFAULT_PORT)
+
+    return str(Path(args.socket) if args.socket else SOCKET_PATH)
+
+
+def open_socket(address):
+
+    family = socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+
+    return socket.socket(family, socket.SOCK_STREAM)
+
+
+def write_token(path: Path = TOKEN_PATH):
+    """A fresh shared secret for TCP clients, readable by this user only."""
+
+    token = secrets.token_hex(32)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+
+    # created 0600, never readable by anyone else even for a moment
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+
+    with os.fdopen(fd, "w", encoding="ascii") as f:
+        f.write(token)
+
+    return token
+
+
+def read_token(path: Path = TOKEN_PATH):
+
+    try:
+        return path.read_text(encoding="ascii").strip()
+    except FileNotFoundError:
+        return None
+
+
+def authorized(request, token):
+    """True unless token is set and the request does not carry it."""
+
+    if token is None:
+        return True
+
+    sent = request.get("token") if isinstance(request, dict) else None
+
+    return isinstance(sent, str) and hmac.compare_digest(sent, token)
+
+
+def serve(server: ExtractionServer, address):
+
+    unix = not isinstance(address, tuple)
+
+    if unix:
+        Path(address).parent.mkdir(parents=True, exist_ok=True)
+
+        if Path(address).exists():
+            try:
+                request(address, {"op": "status"})
+            except OSError:
+                os.unlink(address)  # left behind by a server that died
+            else:
+                raise SystemExit(f"[ERROR] A server is already listening on {address}")
+
+    token = None
+
+    with open_socket(address) as sock:
+
+        if unix:
+            # the socket file gets its permissions at bind(), so there is no
+            # window in which others could connect
+            umask = os.umask(0o177)
+            try:
+                sock.bind(address)
+            finally:
+                os.umask(umask)
+        else:
+            sock.bind(address)
+
+            # anyone on the machine can reach the port: requests must carry
+            # the token only this user can read
+            token = write_token()
+
+        sock.listen()
+
+        print("[OK] Extraction server listening on", address)
+        print("[INFO] Output root:", server.out_root)
+
+        try:
+            while server.running:
+
+                conn, _ = sock.accept()
+
+                with conn, conn.makefile("rwb") as f:
+
+                    for line in f:
+
+                        try:
+                            request = json.loads(line)
+                        except ValueError as exc:
+                            response = {"ok": False, "error": f"bad request: {exc}", "log": ""}
+                        else:
+                            if authorized(request, token):
+                                response = server.handle(request)
+                            else:
+                                response = {"ok": False, "error": "unauthorized: missing or wrong token", "log": ""}
+
+                        f.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                        f.flush()
+
+                        if not server.running:
+                            break
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(address if unix else TOKEN_PATH)
+
+    print("[OK] Extraction server stopped")
+
+
+def request(address, payload):
+    """Send one request and return the server's response."""
+
+    if isinstance(address, tuple):
+        token = read_token()
+
+        if token is None:
+            raise ConnectionError(f"no server token in {TOKEN_PATH} (is the server running as this user?)")
+
+        payload = {**payload, "token": token}
+
+    with open_socket(address) as sock:
+
+        sock.connect(address)
+
+        with sock.makefile("rwb") as f:
+
+            f.write(json.dumps(payload).encode("utf-8") + b"\n")
+            f.flush()
+
+            line = f.readline()
+
+    if not line:
+        raise ConnectionError("server closed the connection without answering")
+
+    return json.loads(line)
+
+
+# ------------------------------------------------------------
+# CLIENT
+# ------------------------------------------------------------
+
+def print_response(response):
+
+    sys.stdout.write(response.get("log", ""))
+
+    if response.get("error"):
+        print("[ERROR]", response["error"])
+
+    for container, status, detail in response.get("results", []):
+
+        if status == "ok":
+            print(f"   {container:<32} OK     {detail['seconds']:8.2f}s")
+        else:
+            print(f"   {container:<32} FAILED {detail}")
+
+
+def print_status(status):
+
+    cache = status["cache"]
+
+    print("[INFO] game:", status["game"])
+    print("[INFO] index:", status["index"])
+    print("[INFO] output root:", status["out_root"])
+    print(f"[INFO] up {status['uptime']:.0f}s, {status['requests']} requests")
+    print(
+        f"[INFO] container cache: {len(cache['containers'])}/{cache['limit']}, "
+        f"{cache['hits']} hits, {cache['misses']} misses"
+    )
+
+    for container, age in cache["containers"]:
+        print(f"   {container:<32} opened {age:8.1f}s ago")
+
+    print("[INFO] loader modules:", ", ".join(status["loader_modules"]) or "-")
+
+
+def main():
+
+    ap = argparse.ArgumentParser(description="Long-lived EVE Frontier extraction server")
+
+    ap.add_argument("--socket", help=f"Unix socket path (default {SOCKET_PATH})")
+    ap.add_argument("--port", type=int, help=f"use TCP on 127.0.0.1 instead (default port {DEFAULT_PORT} where AF_UNIX is missing)")
+
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("serve", help="start the server in the foreground")
+    p.add_argument("-e", "--eve", required=True, help="Game root path")
+    p.add_argument("-i", "--index", required=True, help="resfileindex.txt path")
+    p.add_argument("--cache", type=int, default=DEFAULT_CACHE, help=f"opened containers to keep (default {DEFAULT_CACHE})")
+    p.add_argument("--out-root", default=str(OUT_ROOT), help=f"extract requests may only write below this folder (default {OUT_ROOT})")
+
+    p = sub.add_parser("extract", help="extract containers through the server")
+    p.add_argument("-o", "--out", required=True)
+    p.add_argument("-c", "--containers", required=True, help="comma-separated container names, or 'all'")
+    p.add_argument("-f", "--format", choices=v4.FORMATS, default="json")
+    p.add_argument("--stream", action="store_true")
+    p.add_argument("--fields", action="append", default=[], metavar="SPEC")
+    p.add_argument("--fields-file")
+
+    p = sub.add_parser("inspect", help="debug_resfile.py output for one container")
+    p.add_argument("-c", "--container", required=True)
+
+    sub.add_parser("status", help="show cached containers and loader modules")
+    sub.add_parser("stop", help="shut the server down")
+
+    args = ap.parse_args()
+
+    address = server_address(args)
+
+    if args.command == "serve":
+        serve(ExtractionServer(Path(args.eve), Path(args.index), args.cache, Path(args.out_root)), address)
+        return
+
+    if args.command == "extract":
+
+        fields = list(args.fields)
+
+        if args.fields_file:
+            with open(args.fields_file, "r", encoding="utf-8") as f:
+                fields.extend(f)
+
+        payload = {
+            "op": "extract",
+            # the server may run from another working directory
+            "out": str(Path(args.out).resolve()),
+            "containers": [c.strip() for c in args.containers.split(",") if c.strip()],
+            "format": args.format,
+            "stream": args.stream,
+            "fields": fields,
+        }
+
+    elif args.command == "inspect":
+        payload = {"op": "inspect", "container": args.container}
+
+    else:
+        payload = {"op": args.command}
+
+    try:
+        response = request(address, payload)
+    except OSError as exc:
+        print(f"[ERROR] No extraction server on {address}: {exc}")
+        print("        start one with: python3 extract_server.py serve -e <game> -i <resfileindex.txt>")
+        sys.exit(2)
+
+    if args.command == "status" and response.get("ok"):
+        print_status(response)
+        return
+
+    print_response(response)
+
+    if not response.get("ok"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Loader index for the CCP bin64 directory.
+
+Maps every "<container>loader" module name to its .so / .pyd path. The
+tree is walked once and the result is cached on disk, keyed on the bin64
+directory's mtime and the client build ID from start.ini, so later runs
+(and later containers in the same run) never rglob bin64 again.
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+IS_WIN = sys.platform.startswith("win")
+
+LOADER_EXT = ".pyd" if IS_WIN else ".so"
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+
+# bin64 path -> {name: Path}, so one process reads the cache file once
+_INDEXES = {}
+
+
+# ------------------------------------------------------------
+# BUILD INFO
+# ------------------------------------------------------------
+
+def read_build_id(bin64: Path):
+    """
+    Return the client build number from start.ini, or None.
+
+    start.ini sits next to bin64 ("stillness/" on Windows, the
+    "Resources/build/" folder of the macOS app bundle).
+    """
+
+    ini = bin64.parent / "start.ini"
+
+    try:
+        with ini.open("r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                key, sep, value = line.partition("=")
+                if sep and key.strip().lower() == "build":
+                    return value.strip()
+    except OSError:
+        pass
+
+    return None
+
+
+def cache_path(bin64: Path, cache_dir: Path = CACHE_DIR):
+
+    digest = hashlib.sha1(str(bin64.resolve()).encode("utf-8")).hexdigest()[:12]
+
+    return cache_dir / f"loader_index_{digest}.json"
+
+
+def index_key(bin64: Path):
+
+    try:
+        mtime = bin64.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+
+    return {
+        "bin64": str(bin64.resolve()),
+        "mtime_ns": mtime,
+        "build": read_build_id(bin64),
+        "ext": LOADER_EXT,
+    }
+
+
+# ------------------------------------------------------------
+# SCAN / CACHE
+# ------------------------------------------------------------
+
+def scan_loaders(bin64: Path):
+
+    loaders = {}
+
+    for p in bin64.rglob(f"*{LOADER_EXT}"):
+
+        name = p.name.lower()[: -len(LOADER_EXT)]
+
+        if name.endswith("loader"):
+            loaders.setdefault(name, str(p))
+
+    return loaders
+
+
+def read_cache(path: Path, key):
+
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cached.get("key") != key:
+        return None
+
+    return cached.get("loaders")
+
+
+def write_cache(path: Path, key, loaders):
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_name(path.name + ".tmp")
+
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"key": key, "loaders": loaders}, f, indent=2, sort_keys=True)
+
+        tmp.replace(path)
+
+    except OSError as exc:
+        print("[WARN] could not write loader index cache:", exc)
+
+
+def load_loader_index(bin64: Path, rebuild=False, cache_dir: Path = CACHE_DIR):
+    """
+    Return {"<container>loader": Path} for bin64, scanning only when the
+    cached index is missing or stale.
+    """
+
+    mem_key = str(bin64)
+
+    if not rebuild and mem_key in _INDEXES:
+        return _INDEXES[mem_key]
+
+    key = index_key(bin64)
+    path = cache_path(bin64, cache_dir)
+
+    loaders = None if rebuild else read_cache(path, key)
+
+    if loaders is None:
+        print("[INFO] Indexing loaders in", bin64)
+        loaders = scan_loaders(bin64) if bin64.is_dir() else {}
+        write_cache(path, key, loaders)
+        print(f"[INFO] {len(loaders)} loaders indexed")
+
+    index = {name: Path(p) for name, p in loaders.items()}
+
+    _INDEXES[mem_key] = index
+
+    return index
+
+
+def find_loader(bin64: Path, container: str, cache_dir: Path = CACHE_DIR):
+    """
+    Path of the BUILT loader for a container, or None.
+
+    A cached path that has disappeared (partial patch, moved install)
+    triggers one rescan before giving up.
+    """
+
+    name = f"{container}loader".lower()
+
+    path = load_loader_index(bin64, cache_dir=cache_dir).get(name)
+
+    if path is not None and not path.exists():
+        path = load_loader_index(bin64, rebuild=True, cache_dir=cache_dir).get(name)
+
+    return path
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Per-build loader profile.
+
+A container can be read through its BUILT loader, or through
+fsd.schemas.binaryLoader with or without the optimized flag, and the
+speed of these paths differs a lot. `EF_Extractor_V4.py --calibrate` times
+every path that works and stores the fastest one here. Later runs use it
+directly.
+
+The profile lives in .cache/, keyed like the loader index (bin64 path,
+mtime and client build number), so a patch starts with an empty profile
+and the old choices are never applied to new loaders.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from loader_index import CACHE_DIR, index_key
+
+# loader paths, in the order calibration tries them
+LOADER_PATHS = ("built", "schema-optimized", "schema")
+
+# bin64 path -> profile dict, so one process reads the file once
+_PROFILES = {}
+
+
+def profile_path(bin64: Path, cache_dir: Path = CACHE_DIR):
+
+    digest = hashlib.sha1(str(Path(bin64).resolve()).encode("utf-8")).hexdigest()[:12]
+
+    return cache_dir / f"loader_profile_{digest}.json"
+
+
+def load_profile(bin64: Path, cache_dir: Path = CACHE_DIR):
+    """
+    {"key": ..., "containers": {container: {"loader", "seconds", ...}}};
+    empty when there is no profile for the current build.
+    """
+
+    mem_key = str(bin64)
+
+    if mem_key in _PROFILES:
+        return _PROFILES[mem_key]
+
+    key = index_key(Path(bin64))
+    profile = {"key": key, "containers": {}}
+
+    try:
+        with profile_path(bin64, cache_dir).open("r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = None
+
+    if cached and cached.get("key") == key:
+        profile["containers"] = cached.get("containers", {})
+
+    _PROFILES[mem_key] = profile
+
+    return profile
+
+
+def save_profile(bin64: Path, profile, cache_dir: Path = CACHE_DIR):
+
+    path = profile_path(bin64, cache_dir)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_name(path.name + ".tmp")
+
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2, sort_keys=True)
+
+        tmp.replace(path)
+
+    except OSError as exc:
+        print("[WARN] could not write loader profile:", exc)
+
+    _PROFILES[str(bin64)] = profile
+
+    return path
+
+
+def profiled_loader(bin64: Path, container: str):
+    """The calibrated loader path for a container, or None."""
+
+    entry = load_profile(bin64)["containers"].get(container)
+
+    if entry and entry.get("loader") in LOADER_PATHS:
+        return entry["loader"]
+
+    return None
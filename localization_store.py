@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compact, memory-mapped localization store.
+
+localization.json holds every en-us message; the converters only need a
+few thousand display names out of it. localization.bin keeps the same
+display texts in a form that can be opened without parsing anything:
+
+  header    magic "EFLOC1\\0\\0", entry count (u64)
+  ids       count x int64, sorted ascending
+  offsets   (count + 1) x uint64, byte offsets into the blob
+  blob      UTF-8 text of every entry, back to back
+
+All integers are little-endian. A lookup is a binary search over the
+mmap'ed ID array plus one slice of the blob, so opening the store costs
+nothing and each name is O(log n).
+
+Only integer message IDs are stored, and each entry is reduced to its
+display text (the first element of the CCP (text, ...) tuples).
+"""
+
+import bisect
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+STORE_NAME = "localization.bin"
+JSON_NAME = "localization.json"
+
+MAGIC = b"EFLOC1\0\0"
+HEADER = struct.Struct("<8sQ")
+
+# memoryview.cast() uses native byte order
+NATIVE_LE = sys.byteorder == "little"
+
+
+# ------------------------------------------------------------
+# WRITE
+# ------------------------------------------------------------
+
+def display_text(value):
+    """The display text of one localization entry, or None."""
+
+    if value is None:
+        return None
+
+    if isinstance(value, str):
+        return value
+
+    if isinstance(value, (list, tuple)):
+        # Frontier localization: first element is usually the display name
+        return display_text(value[0]) if value else None
+
+    return str(value)
+
+
+def message_id(key):
+
+    if isinstance(key, int) and not isinstance(key, bool):
+        return key
+
+    if isinstance(key, str) and key.isdigit():
+        return int(key)
+
+    return None
+
+
+def write_store(path: Path, localization):
+    """Write {messageID: entry} as a localization store at path."""
+
+    entries = []
+
+    for key, value in localization.items():
+
+        mid = message_id(key)
+        text = display_text(value)
+
+        if mid is None or text is None:
+            continue
+
+        entries.append((mid, text.encode("utf-8")))
+
+    entries.sort()
+
+    ids = [mid for mid, _ in entries]
+    offsets = [0]
+
+    for _, data in entries:
+        offsets.append(offsets[-1] + len(data))
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+
+    with tmp.open("wb") as f:
+        f.write(HEADER.pack(MAGIC, len(ids)))
+        f.write(struct.pack(f"<{len(ids)}q", *ids))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        for _, data in entries:
+            f.write(data)
+
+    tmp.replace(path)
+
+    return len(ids)
+
+
+# ------------------------------------------------------------
+# READ
+# ------------------------------------------------------------
+
+class LocalizationStore:
+    """
+    Read-only {messageID: display text} view over a localization store.
+
+    get() accepts int or digit-string keys, so it is a drop-in for the
+    dict loaded from localization.json.
+    """
+
+    def __init__(self, path: Path):
+
+        self.path = Path(path)
+
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count = HEADER.unpack_from(self._mm, 0)
+
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path.name}: not a localization store")
+
+        self._count = count
+
+        ids_start = HEADER.size
+        offsets_start = ids_start + 8 * count
+
+        self._blob_start = offsets_start + 8 * (count + 1)
+
+        if NATIVE_LE:
+            view = memoryview(self._mm)
+            self._ids = view[ids_start:offsets_start].cast("q")
+            self._offsets = view[offsets_start:self._blob_start].cast("Q")
+        else:
+            self._ids = struct.unpack_from(f"<{count}q", self._mm, ids_start)
+            self._offsets = struct.unpack_from(f"<{count + 1}Q", self._mm, offsets_start)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        return self._index(key) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _index(self, key):
+
+        mid = message_id(key)
+
+        if mid is None:
+            return None
+
+        i = bisect.bisect_left(self._ids, mid)
+
+        if i < self._count and self._ids[i] == mid:
+            return i
+
+        return None
+
+    def get(self, key, default=None):
+
+        i = self._index(key)
+
+        if i is None:
+            return default
+
+        start = self._blob_start + self._offsets[i]
+        end = self._blob_start + self._offsets[i + 1]
+
+        return self._mm[start:end].decode("utf-8")
+
+    def __getitem__(self, key):
+
+        value = self.get(key)
+
+        if value is None:
+            raise KeyError(key)
+
+        return value
+
+    def close(self):
+
+        if isinstance(self._ids, memoryview):
+            self._ids.release()
+            self._offsets.release()
+
+        self._mm.close()
+
+
+def open_localization(out_dir: Path):
+    """
+    The localization map for an output folder, or None if there is none.
+
+    Prefers localization.bin; falls back to parsing localization.json when
+    the store is missing or older than the JSON (written by an earlier
+    extractor version).
+    """
+
+    store = Path(out_dir) / STORE_NAME
+    json_path = Path(out_dir) / JSON_NAME
+
+    if store.exists() and (
+        not json_path.exists() or store.stat().st_mtime >= json_path.stat().st_mtime
+    ):
+        return LocalizationStore(store)
+
+    if json_path.exists():
+        with json_path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    return None
+
+
+# ------------------------------------------------------------
+# MULTI-LANGUAGE STORE
+# ------------------------------------------------------------
+# localization_languages.bin: the same layout keyed by (messageID, language)
+#
+#   header     magic "EFLOC2\0\0", entry count (u64), language count (u64)
+#   languages  language count x 16 bytes, NUL-padded ASCII ("en-us", "de", ...)
+#   ids        count x int64, sorted by (id, language index)
+#   offsets    (count + 1) x uint64
+#   langs      count x uint16, language index of each entry
+#   blob       UTF-8 text
+
+LANGUAGES_STORE_NAME = "localization_languages.bin"
+
+LANGUAGES_MAGIC = b"EFLOC2\0\0"
+LANGUAGES_HEADER = struct.Struct("<8sQQ")
+LANGUAGE_CODE = struct.Struct("16s")
+
+
+def write_language_store(path: Path, by_language):
+    """Write {language: {messageID: entry}} as a multi-language store."""
+
+    languages = sorted(by_language)
+    entries = []
+
+    for index, language in enumerate(languages):
+
+        for key, value in by_language[language].items():
+
+            mid = message_id(key)
+            text = display_text(value)
+
+            if mid is None or text is None:
+                continue
+
+            entries.append((mid, index, text.encode("utf-8")))
+
+    entries.sort()
+
+    offsets = [0]
+
+    for _, _, data in entries:
+        offsets.append(offsets[-1] + len(data))
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+
+    with tmp.open("wb") as f:
+        f.write(LANGUAGES_HEADER.pack(LANGUAGES_MAGIC, len(entries), len(languages)))
+        for language in languages:
+            f.write(LANGUAGE_CODE.pack(language.encode("ascii")))
+        f.write(struct.pack(f"<{len(entries)}q", *(mid for mid, _, _ in entries)))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        f.write(struct.pack(f"<{len(entries)}H", *(index for _, index, _ in entries)))
+        for _, _, data in entries:
+            f.write(data)
+
+    tmp.replace(path)
+
+    return len(entries)
+
+
+class LanguageStore:
+    """Read-only {(messageID, language): display text} over a multi-language store."""
+
+    def __init__(self, path: Path):
+
+        self.path = Path(path)
+
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count, nlang = LANGUAGES_HEADER.unpack_from(self._mm, 0)
+
+        if magic != LANGUAGES_MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path.name}: not a multi-language localization store")
+
+        self._count = count
+
+        pos = LANGUAGES_HEADER.size
+
+        self.languages = []
+
+        for _ in range(nlang):
+            (code,) = LANGUAGE_CODE.unpack_from(self._mm, pos)
+            self.languages.append(code.rstrip(b"\0").decode("ascii"))
+            pos += LANGUAGE_CODE.size
+
+        self._lang_index = {lang: i for i, lang in enumerate(self.languages)}
+
+        ids_start = pos
+        offsets_start = ids_start + 8 * count
+        langs_start = offsets_start + 8 * (count + 1)
+
+        self._blob_start = langs_start + 2 * count
+
+        if NATIVE_LE:
+            view = memoryview(self._mm)
+            self._ids = view[ids_start:offsets_start].cast("q")
+            self._offsets = view[offsets_start:langs_start].cast("Q")
+            self._langs = view[langs_start:self._blob_start].cast("H")
+        else:
+            self._ids = struct.unpack_from(f"<{count}q", self._mm, ids_start)
+            self._offsets = struct.unpack_from(f"<{count + 1}Q", self._mm, offsets_start)
+            self._langs = struct.unpack_from(f"<{count}H", self._mm, langs_start)
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _text(self, i):
+
+        start = self._blob_start + self._offsets[i]
+        end = self._blob_start + self._offsets[i + 1]
+
+        return self._mm[start:end].decode("utf-8")
+
+    def get(self, key, language, default=None):
+
+        mid = message_id(key)
+        lang = self._lang_index.get(language)
+
+        if mid is None or lang is None:
+            return default
+
+        i = bisect.bisect_left(self._ids, mid)
+
+        # entries of one ID are adjacent, ordered by language index
+        while i < self._count and self._ids[i] == mid:
+            if self._langs[i] == lang:
+                return self._text(i)
+            i += 1
+
+        return default
+
+    def entries(self):
+        """Yield (messageID, language, text) in (ID, language) order."""
+
+        for i in range(self._count):
+            yield self._ids[i], self.languages[self._langs[i]], self._text(i)
+
+    def close(self):
+
+        if isinstance(self._ids, memoryview):
+            self._ids.release()
+            self._offsets.release()
+            self._langs.release()
+
+        self._mm.close()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Per-record content hashes, written next to each extracted container.
+
+  output/<container>.hashes.json
+    {"container": "types", "algorithm": "blake2b-128",
+     "records": {"<key>": "<hex digest>", ...}}
+
+The items of a container that is not a dict (locationcache as a list of
+pairs) are keyed by position, see record_io.indexed_records().
+
+A record's hash covers its canonical JSON (sorted keys, no whitespace),
+so it does not depend on the output format or on attribute order. Two
+extractions can then be compared key by key without reading the
+container files (see diff_extractions.py).
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+ALGORITHM = "blake2b-128"
+
+HASHES_SUFFIX = ".hashes.json"
+
+
+def record_hash(record):
+
+    text = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def tap_hashes(records, hashes):
+    """Pass (key, record) pairs through, adding {key: hash} to hashes."""
+
+    for key, record in records:
+        hashes[str(key)] = record_hash(record)
+        yield key, record
+
+
+def hashes_path(out_dir: Path, container: str):
+    return Path(out_dir) / f"{container}{HASHES_SUFFIX}"
+
+
+def write_hashes(path: Path, container: str, hashes):
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(
+            {"container": container, "algorithm": ALGORITHM, "records": hashes},
+            f,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+    tmp.replace(path)
+
+
+def read_hashes(path: Path):
+    """{key: hash} from a sidecar, or None if missing or incompatible."""
+
+    try:
+        with Path(path).open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if data.get("algorithm") != ALGORITHM:
+        return None
+
+    return data.get("records")
+
+
+def hash_records(records):
+    """{key: hash} for (key, record) pairs, e.g. read back from a container file."""
+
+    return {str(key): record_hash(record) for key, record in records}
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Container file formats shared by the extractor and the converters.
+
+  json        one pretty-printed object (the historical output)
+  ndjson      one {"id": ..., "record": ...} object per line (for a list
+              container, one {"id": null, ...} line per item)
+  *.gz        gzip-compressed variant of either
+  *.zst       zstd-compressed variant (needs the optional `zstandard` package)
+
+The extractor writes with open_output() / write_records(); the converters
+read any format with iter_container() and never need to know which one
+was produced. NDJSON files are read line by line, and a pretty JSON object
+one top-level member at a time, so memory stays at about the size of the
+largest record instead of the whole file.
+"""
+
+import gzip
+import json
+import re
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DECODER = json.JSONDecoder()
+
+# characters read per refill when streaming a JSON object
+STREAM_CHUNK = 1 << 20
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# characters that can continue a JSON number
+NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+FORMATS = ("json", "ndjson", "json.gz", "ndjson.gz", "json.zst", "ndjson.zst")
+
+
+# ------------------------------------------------------------
+# FILES
+# ------------------------------------------------------------
+
+def container_path(out_dir: Path, container: str, fmt: str):
+    return Path(out_dir) / f"{container}.{fmt}"
+
+
+def file_format(path: Path):
+
+    name = Path(path).name
+
+    for fmt in sorted(FORMATS, key=len, reverse=True):
+        if name.endswith("." + fmt):
+            return fmt
+
+    raise ValueError(f"unknown container file format: {name}")
+
+
+def open_text(path: Path, mode="r"):
+    """Open a container file as UTF-8 text, (de)compressing by suffix."""
+
+    path = Path(path)
+
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError(
+                f"{path.name}: zstd support needs the 'zstandard' package (pip install zstandard)"
+            )
+        return zstandard.open(path, mode + "t", encoding="utf-8")
+
+    return path.open(mode, encoding="utf-8")
+
+
+def find_container_file(out_dir: Path, container: str):
+    """
+    Locate the output file for a container in any format.
+
+    If several formats are present (the output folder was reused with a
+    different --format), the most recently written one wins.
+    """
+
+    found = [
+        p for p in (container_path(out_dir, container, fmt) for fmt in FORMATS)
+        if p.exists()
+    ]
+
+    if not found:
+        return None
+
+    return max(found, key=lambda p: p.stat().st_mtime)
+
+
+# ------------------------------------------------------------
+# WRITE
+# ------------------------------------------------------------
+
+def write_records(f, records, fmt: str):
+    """
+    Write (key, record) pairs to an open text file.
+
+    For json the text is identical to json.dump(dict(records), indent=2).
+    """
+
+    if fmt.startswith("ndjson"):
+
+        for key, record in records:
+            f.write(json.dumps({"id": key, "record": record}, ensure_ascii=False))
+            f.write("\n")
+
+        return
+
+    first = True
+
+    for key, record in records:
+
+        body = json.dumps(record, ensure_ascii=False, indent=2)
+
+        f.write("{\n  " if first else ",\n  ")
+        f.write(json.dumps(key, ensure_ascii=False))
+        f.write(": ")
+        f.write(body.replace("\n", "\n  "))
+
+        first = False
+
+    f.write("{}" if first else "\n}")
+
+
+def write_value(f, value, fmt: str):
+    """
+    Write a container that is not dict-like (a single value).
+
+    For ndjson a list is written one item per line, so it reads back like
+    the json file: (None, item) per item.
+    """
+
+    if fmt.startswith("ndjson"):
+        write_records(f, value_records(value), fmt)
+    else:
+        json.dump(value, f, ensure_ascii=False, indent=2)
+
+
+# ------------------------------------------------------------
+# READ
+# ------------------------------------------------------------
+
+def value_records(value):
+    """(None, item) per item of a list container, (None, value) for anything else."""
+
+    if isinstance(value, list):
+        for item in value:
+            yield None, item
+    else:
+        yield None, value
+
+
+def indexed_records(value):
+    """
+    value_records() keyed by position ("0", "1", ...): the keys the hash
+    sidecars and iter_selected() use for a container that is not a dict.
+    """
+
+    for i, (_, item) in enumerate(value_records(value)):
+        yield str(i), item
+
+
+def iter_keyed(path: Path):
+    """iter_file() with the items of a list container keyed as indexed_records()."""
+
+    index = 0
+
+    for key, record in iter_file(path):
+
+        if key is None:
+            key = str(index)
+            index += 1
+
+        yield key, record
+
+
+def iter_file(path: Path):
+    """
+    Yield (key, record) from a container file of any format.
+
+    A json file whose top level is a list yields (None, item) per item.
+    """
+
+    fmt = file_format(path)
+
+    with open_text(path) as f:
+
+        if fmt.startswith("ndjson"):
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield row["id"], row["record"]
+            return
+
+        head = f.read(STREAM_CHUNK)
+
+        if head.lstrip(" \t\n\r").startswith("{"):
+            yield from iter_json_object_items(f, head)
+            return
+
+        data = json.loads(head + f.read())
+
+    if isinstance(data, dict):
+        yield from data.items()
+    else:
+        yield from value_records(data)
+
+
+def iter_json_object_items(f, buf="", chunk_size=STREAM_CHUNK):
+    """
+    Yield (key, value) for each member of the JSON object in text file f,
+    decoding one member at a time with DECODER.raw_decode. buf is text
+    already read from f.
+
+    Only the current member and one chunk are held in memory. A member
+    that does not fit in the buffer makes it grow (doubling) until it does.
+    """
+
+    pos = 0
+    eof = False
+
+    def refill():
+        nonlocal buf, pos, eof
+        chunk = f.read(max(chunk_size, len(buf) - pos))
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            pos = WHITESPACE.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                return
+            refill()
+
+    def decode():
+        nonlocal pos
+        while True:
+            try:
+                value, end = DECODER.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                refill()
+                continue
+            # a number cut at the end of the buffer ("12" of "125", "1." of
+            # "1.5e3") may continue in the next chunk
+            if eof or (end < len(buf) and buf[end] not in NUMBER_CHARS):
+                pos = end
+                return value
+            refill()
+
+    def expect(chars):
+        nonlocal pos
+        skip_whitespace()
+        if pos >= len(buf) or buf[pos] not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", buf, pos)
+        pos += 1
+        return buf[pos - 1]
+
+    expect("{")
+
+    skip_whitespace()
+    if buf.startswith("}", pos):
+        return
+
+    while True:
+        skip_whitespace()
+        key = decode()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expecting property name", buf, pos)
+
+        expect(":")
+        skip_whitespace()
+
+        yield key, decode()
+
+        if expect(",}") == "}":
+            return
+
+
+def iter_selected(path: Path, keys):
+    """
+    Yield (key, record) for only the given keys of a container file.
+
+    NDJSON lines and the top-level entries of a pretty JSON file written by
+    write_records() / json.dump(indent=2) are recognised by their key text,
+    so only the selected records are parsed. Other files are read in full.
+    The items of a list container are keyed by position, as in
+    indexed_records().
+    """
+
+    wanted = {str(k) for k in keys}
+
+    if not wanted:
+        return
+
+    fmt = file_format(path)
+
+    with open_text(path) as f:
+
+        if fmt.startswith("ndjson"):
+
+            prefixes = {json.dumps({"id": k})[:-1] + ",": k for k in wanted}
+
+            # {"id": null, ...} lines are the items of a list container
+            unkeyed = json.dumps({"id": None})[:-1] + ","
+            index = 0
+
+            for line in f:
+
+                head = line[: line.find(",") + 1]
+
+                if head == unkeyed:
+                    if str(index) in wanted:
+                        yield str(index), json.loads(line)["record"]
+                    index += 1
+
+                elif head in prefixes:
+                    row = json.loads(line)
+                    yield str(row["id"]), row["record"]
+
+            return
+
+        first = f.readline()
+
+        if first.strip() != "{":
+            # not one-entry-per-key pretty JSON (list, scalar, compact)
+            rest = f.read()
+            data = json.loads(first + rest)
+            records = data.items() if isinstance(data, dict) else indexed_records(data)
+            for key, record in records:
+                if key in wanted:
+                    yield key, record
+            return
+
+        key = None
+        body = []
+
+        for line in f:
+
+            # top-level entries start at an indent of exactly two spaces
+            if line.startswith('  "') and key is None:
+
+                name, end = DECODER.raw_decode(line, 2)
+                rest = line[end + 2:]
+
+                if name in wanted:
+                    key = name
+                    body = [rest]
+
+                    if not rest.rstrip().endswith(("{", "[")):
+                        # scalar record on one line
+                        yield key, json.loads(body[0].rstrip().rstrip(","))
+                        key = None
+
+                continue
+
+            if key is None:
+                continue
+
+            body.append(line)
+
+            if line.startswith("  }") or line.startswith("  ]"):
+                yield key, json.loads("".join(body).rstrip().rstrip(","))
+                key = None
+
+
+def iter_container(out_dir: Path, container: str):
+
+    path = find_container_file(out_dir, container)
+
+    if path is None:
+        raise FileNotFoundError(
+            f"no output for container '{container}' in {out_dir} "
+            f"(looked for {', '.join(container + '.' + f for f in FORMATS)})"
+        )
+
+    return iter_file(path)
+
+
+def load_container(out_dir: Path, container: str):
+    """Read a whole container into a {key: record} dict."""
+
+    return dict(iter_container(out_dir, container))
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared resfileindex.txt parser for the extractors and the debugger.
+
+Every line ("respath,folder,hash,size,compressed_size"; older indexes
+may stop after the folder column) is parsed once. The result is pickled
+to .cache/, keyed on the index file's path, mtime and size, so later
+runs load the snapshot instead of re-splitting the whole file.
+
+Container keys (one naming rule for all tools):
+
+  res:/staticdata/types.static                        types
+  res:/staticdata/types.fsdbinary                     types
+  res:/staticdata/types.schema                        types.schema
+  res:/localizationfsd/localization_fsd_en-us.pickle  localization_fsd_en-us.pickle
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import pickle
+from pathlib import Path
+
+CONTAINER_PREFIXES = ("res:/staticdata/", "res:/localizationfsd/")
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+
+# bump when ResfileIndex or the key rules change
+SNAPSHOT_VERSION = 1
+
+# resolved index path -> ResfileIndex, so one process unpickles it once
+_INDEXES = {}
+
+
+# ------------------------------------------------------------
+# PARSE
+# ------------------------------------------------------------
+
+def container_key(respath: str):
+
+    name = respath.split("/")[-1]
+
+    if name.endswith(".static"):
+        return name[:-7]
+
+    if name.endswith(".fsdbinary"):
+        return name[:-10]
+
+    return name
+
+
+def parse_line(line: str):
+    """(respath, folder, hash, size, compressed_size), or None."""
+
+    parts = line.strip().split(",")
+
+    if len(parts) < 2 or not parts[0]:
+        return None
+
+    respath, folder, *rest = parts
+
+    def number(i):
+        return int(rest[i]) if len(rest) > i and rest[i].isdigit() else None
+
+    return (
+        respath,
+        folder,
+        rest[0] if rest and rest[0] else None,
+        number(1),
+        number(2),
+    )
+
+
+class ResfileIndex:
+    """
+    All entries of one resfileindex.txt.
+
+      rows        {respath: (respath, folder, hash, size, compressed_size)}
+      containers  {container key: {"respath", "folder", "hash", "size",
+                  "compressed_size"}} for staticdata / localizationfsd
+    """
+
+    def __init__(self, rows, key=None):
+
+        # snapshot key of the file this was parsed from
+        self.key = key
+
+        self.rows = {row[0]: row for row in rows}
+        self.containers = {}
+
+        for respath, folder, hash_, size, csize in self.rows.values():
+
+            if not respath.startswith(CONTAINER_PREFIXES):
+                continue
+
+            self.containers[container_key(respath)] = {
+                "respath": respath,
+                "folder": folder,
+                "hash": hash_,
+                "size": size,
+                "compressed_size": csize,
+            }
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, key):
+        return key in self.containers
+
+    def get(self, key):
+        return self.containers.get(key)
+
+    def mapping(self):
+        """{container key: ResFiles-relative path}"""
+
+        return {k: e["folder"] for k, e in self.containers.items()}
+
+    def names(self):
+        return sorted(self.containers)
+
+    def prefix(self, prefix: str):
+        """Container keys starting with prefix, sorted."""
+
+        return [k for k in self.names() if k.startswith(prefix)]
+
+    def glob(self, pattern: str):
+        """Container keys matching a shell pattern ("*loader", "types*")."""
+
+        return [k for k in self.names() if fnmatch.fnmatchcase(k, pattern)]
+
+    def glob_respaths(self, pattern: str):
+        """Any respath in the index matching a shell pattern ("res:/ui/*")."""
+
+        return sorted(p for p in self.rows if fnmatch.fnmatchcase(p, pattern))
+
+    def staticdata(self):
+        """Keys of every res:/staticdata/ data container (no schemas), sorted."""
+
+        return sorted(
+            k for k, e in self.containers.items()
+            if e["respath"].startswith("res:/staticdata/")
+            and e["respath"].endswith((".static", ".fsdbinary"))
+        )
+
+    def resolve(self, name: str):
+        """
+        The container key for a user-supplied name: the key itself, or a
+        key that only adds an extension ("localization_fsd_en-us"). Keys
+        keep the case of the resfileindex, so the name is matched without
+        regard to case when it is not a key as given.
+        """
+
+        if name in self.containers:
+            return name
+
+        folded = name.lower()
+
+        matches = [k for k in self.names() if k.lower() == folded]
+
+        if not matches:
+            matches = [
+                k for k in self.names()
+                if fnmatch.fnmatchcase(k.lower(), folded + ".*") and not k.endswith(".schema")
+            ]
+
+        return matches[0] if len(matches) == 1 else None
+
+
+def parse_rows(index_path: Path):
+
+    rows = []
+
+    with Path(index_path).open("r", encoding="utf-8") as f:
+        for line in f:
+            row = parse_line(line)
+            if row is not None:
+                rows.append(row)
+
+    return rows
+
+
+# ------------------------------------------------------------
+# SNAPSHOT
+# ------------------------------------------------------------
+
+def snapshot_path(index_path: Path, cache_dir: Path = CACHE_DIR):
+
+    digest = hashlib.sha1(str(Path(index_path).resolve()).encode("utf-8")).hexdigest()[:12]
+
+    return cache_dir / f"resfileindex_{digest}.pickle"
+
+
+def snapshot_key(index_path: Path):
+
+    st = Path(index_path).stat()
+
+    return (
+        SNAPSHOT_VERSION,
+        str(Path(index_path).resolve()),
+        st.st_mtime_ns,
+        st.st_size,
+    )
+
+
+def read_snapshot(path: Path, key):
+
+    # Only plain tuples are pickled, so a snapshot never depends on how
+    # this module was imported.
+    try:
+        with path.open("rb") as f:
+            cached_key, rows = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        return None
+
+    if cached_key != key:
+        return None
+
+    return rows
+
+
+def write_snapshot(path: Path, key, rows):
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_name(path.name + ".tmp")
+
+        with tmp.open("wb") as f:
+            pickle.dump((key, rows), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        tmp.replace(path)
+
+    except OSError as exc:
+        print("[WARN] could not write resfileindex snapshot:", exc)
+
+
+def load_index(index_path: Path, rebuild=False, cache_dir: Path = CACHE_DIR):
+    """
+    Return the ResfileIndex for index_path, parsing the text file only when
+    the snapshot is missing or the file changed since it was taken.
+    """
+
+    index_path = Path(index_path)
+    key = snapshot_key(index_path)
+
+    index = _INDEXES.get(key[1])
+
+    if not rebuild and index is not None and index.key == key:
+        return index
+
+    path = snapshot_path(index_path, cache_dir)
+
+    rows = None if rebuild else read_snapshot(path, key)
+    parsed = rows is None
+
+    if parsed:
+        print("[INFO] Parsing", index_path)
+        rows = parse_rows(index_path)
+        write_snapshot(path, key, rows)
+
+    index = ResfileIndex(rows, key)
+
+    if parsed:
+        print(f"[INFO] {len(index)} resfileindex entries, {len(index.containers)} containers")
+
+    _INDEXES[key[1]] = index
+
+    return index
+
+
+def main():
+
+    ap = argparse.ArgumentParser(description="List containers in a resfileindex.txt")
+    ap.add_argument("index", help="resfileindex.txt path")
+    ap.add_argument("pattern", nargs="?", default="*", help="shell pattern over container keys (default *)")
+    ap.add_argument("--respaths", action="store_true", help="match full respaths instead of container keys")
+    ap.add_argument("--rebuild", action="store_true", help="ignore the cached snapshot")
+    args = ap.parse_intermixed_args()
+
+    index = load_index(Path(args.index), rebuild=args.rebuild)
+
+    if args.respaths:
+        for respath in index.glob_respaths(args.pattern):
+            row = index.rows[respath]
+            print(f"{respath},{row[1]}")
+        return
+
+    for key in index.glob(args.pattern):
+        e = index.get(key)
+        size = "" if e["size"] is None else e["size"]
+        print(f"{key:<48} {e['folder']:<48} {size}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Record extractors generated from FSD .schema resfiles.
+
+materialize() has to discover every object's attributes with dir() and
+read each one inside try/except. When a container ships a schema, the
+attribute names of every object type are known up front, so this module
+writes a plain Python function per object type instead:
+
+  def node_2(obj):
+      out = {}
+      v = getattr(obj, "density", MISSING)
+      if v is not MISSING:
+          out["density"] = v if v.__class__ in SCALAR_CLASSES else materialize(v)
+      ...
+      return out or materialize(obj)
+
+Attributes are emitted in sorted order (the order dir() gives
+materialize()), dicts get str() keys and lists become lists, so the
+output is the same JSON. Types the generator does not know (vectors,
+enums, ...) and unexpected values are handed to materialize().
+
+The generated source is cached in .cache/extractors/, keyed on the schema
+bytes and GENERATOR_VERSION. Its first line records that digest and a hash
+of the source below it; a cached file whose line does not match is
+regenerated instead of being run. The first VERIFY_RECORDS records of every
+container are also run through materialize() and compared; on any
+difference (or exception) the container falls back to materialize().
+
+Schemas are read as a pickle, JSON or (with PyYAML installed) YAML
+mapping of {"type": ..., "keyTypes" / "valueTypes" / "itemTypes" /
+"attributes": ...} nodes. Pickles are read with SchemaUnpickler, which
+only builds plain containers and scalars: a pickle that names any class
+or function is rejected, so schema resfiles cannot run code. A container whose schema is missing, cannot be
+read, or is not a dict of records keeps using materialize().
+"""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+from pathlib import Path
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "extractors"
+
+# bump when the generated code changes
+GENERATOR_VERSION = 2
+
+# records per container compared against materialize()
+VERIFY_RECORDS = 8
+
+# schema types whose values are plain Python scalars
+SCALAR_TYPES = {
+    "int", "long", "float", "double", "bool", "string", "unicode",
+    "typeID", "groupID", "localizationID", "resPath",
+}
+
+SCALAR_CLASSES = frozenset((str, int, float, bool, type(None)))
+
+# schema digest -> generated extract(), or None if the schema is unusable
+_COMPILED = {}
+
+
+# ------------------------------------------------------------
+# SCHEMA
+# ------------------------------------------------------------
+
+class SchemaUnpickler(pickle.Unpickler):
+    """Unpickler for dict / list / str / number schemas; refuses every global."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"schema pickle references {module}.{name}")
+
+
+def load_pickle(raw: bytes):
+    return SchemaUnpickler(io.BytesIO(raw)).load()
+
+
+def parse_schema(raw: bytes):
+    """The schema file contents as nested dicts, or None if unreadable."""
+
+    readers = [load_pickle, lambda b: json.loads(b.decode("utf-8"))]
+
+    if yaml is not None:
+        readers.append(lambda b: yaml.safe_load(b.decode("utf-8")))
+
+    for read in readers:
+        try:
+            schema = read(raw)
+        except Exception:
+            continue
+        if isinstance(schema, dict) and "type" in schema:
+            return schema
+
+    return None
+
+
+def schema_digest(raw: bytes):
+
+    h = hashlib.sha1(raw)
+    h.update(f"generator {GENERATOR_VERSION}".encode("ascii"))
+
+    return h.hexdigest()[:16]
+
+
+def cache_header(digest, source):
+    """First line of a cached extractor: the schema digest and the source hash."""
+
+    source_hash = hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    return f"# schema {digest} source {source_hash}"
+
+
+def read_cached(path: Path, digest):
+    """The cached source at path, or None if its header does not match."""
+
+    try:
+        text = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    header, _, source = text.partition("\n")
+
+    if header != cache_header(digest, source):
+        print(f"[WARN] {path.name}: cached extractor does not match its schema; regenerating")
+        return None
+
+    return source
+
+
+def write_cached(path: Path, digest, source):
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(cache_header(digest, source) + "\n" + source, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ------------------------------------------------------------
+# CODE GENERATION
+# ------------------------------------------------------------
+
+class Generator:
+
+    def __init__(self):
+        self.functions = []
+
+    def scalar(self, var):
+        return f"{var} if {var}.__class__ in SCALAR_CLASSES else materialize({var})"
+
+    def value(self, node, var):
+        """Expression converting var, described by schema node, to JSON data."""
+
+        kind = node.get("type") if isinstance(node, dict) else None
+
+        if kind in SCALAR_TYPES:
+            return self.scalar(var)
+
+        if kind in ("dict", "list", "object"):
+            return f"{self.function(node)}({var})"
+
+        return f"materialize({var})"
+
+    def function(self, node):
+        """Emit a function for a dict / list / object node; return its name."""
+
+        i = len(self.functions)
+        name = f"node_{i}"
+
+        # reserve the slot; nested nodes are numbered after this one
+        self.functions.append(None)
+
+        kind = node["type"]
+        lines = [f"def {name}(obj):", ""]
+
+        if kind == "dict":
+            lines += [
+                "    if obj is None:",
+                "        return None",
+                "",
+                f"    return {{str(k): {self.value(node.get('valueTypes'), 'v')} for k, v in obj.items()}}",
+            ]
+
+        elif kind == "list":
+            lines += [
+                "    if obj is None:",
+                "        return None",
+                "",
+                f"    return [{self.value(node.get('itemTypes'), 'v')} for v in obj]",
+            ]
+
+        else:
+            attributes = node.get("attributes") or {}
+
+            lines.append("    out = {}")
+
+            for attr in sorted(attributes):
+
+                if not isinstance(attr, str):
+                    raise ValueError(f"unsupported attribute name: {attr!r}")
+
+                # materialize() skips these too
+                if attr.startswith("_"):
+                    continue
+
+                lines += [
+                    f"    v = getattr(obj, {attr!r}, MISSING)",
+                    "    if v is not MISSING:",
+                    f"        out[{attr!r}] = {self.value(attributes[attr], 'v')}",
+                ]
+
+            # no attributes present: let materialize() decide what it is
+            lines.append("    return out or materialize(obj)")
+
+        self.functions[i] = "\n".join(lines)
+
+        return name
+
+
+def generate_source(schema, container=""):
+    """
+    Python source defining extract(record) for the records of a
+    dict-of-records schema, or None if the schema has another shape.
+    """
+
+    if schema.get("type") != "dict" or not isinstance(schema.get("valueTypes"), dict):
+        return None
+
+    gen = Generator()
+    entry = gen.value(schema["valueTypes"], "record")
+
+    header = [
+        f"# Generated by schema_extractors.py (version {GENERATOR_VERSION}) for {container or 'a container'}.",
+        "# Do not edit: regenerated whenever the schema changes.",
+        "",
+        "",
+        "def extract(record):",
+        f"    return {entry}",
+    ]
+
+    return "\n\n\n".join(["\n".join(header)] + gen.functions) + "\n"
+
+
+def compile_source(source, filename, materialize):
+
+    namespace = {
+        "MISSING": object(),
+        "SCALAR_CLASSES": SCALAR_CLASSES,
+        "materialize": materialize,
+    }
+
+    exec(compile(source, filename, "exec"), namespace)
+
+    return namespace["extract"]
+
+
+def load_generated(container, schema_file: Path, materialize, cache_dir: Path = CACHE_DIR):
+    """The generated extract() for a schema, or None (materialize fallback)."""
+
+    raw = Path(schema_file).read_bytes()
+    digest = schema_digest(raw)
+
+    if digest in _COMPILED:
+        return _COMPILED[digest]
+
+    path = Path(cache_dir) / f"{container}_{digest}.py"
+
+    source = read_cached(path, digest) if path.exists() else None
+
+    if source is None:
+        schema = parse_schema(raw)
+
+        try:
+            source = generate_source(schema, container) if schema is not None else None
+        except ValueError as exc:
+            print(f"[WARN] {container}: cannot generate extractor from schema: {exc}")
+
+        if source is not None:
+            try:
+                write_cached(path, digest, source)
+            except OSError as exc:
+                print("[WARN] could not cache generated extractor:", exc)
+
+    extract = compile_source(source, str(path), materialize) if source else None
+
+    _COMPILED[digest] = extract
+
+    return extract
+
+
+# ------------------------------------------------------------
+# RECORD EXTRACTOR
+# ------------------------------------------------------------
+
+class RecordExtractor:
+    """
+    Callable record -> JSON data using a generated function, checked
+    against materialize() on the first VERIFY_RECORDS records.
+    """
+
+    def __init__(self, container, extract, materialize):
+
+        self.container = container
+        self.extract = extract
+        self.materialize = materialize
+
+        self.records = 0
+        self.fallbacks = 0
+        self.disabled = False
+
+    def __call__(self, record):
+
+        self.records += 1
+
+        if self.disabled:
+            return self.materialize(record)
+
+        try:
+            out = self.extract(record)
+        except Exception as exc:
+            return self.fall_back(record, f"{type(exc).__name__}: {exc}")
+
+        if self.records <= VERIFY_RECORDS:
+
+            expected = self.materialize(record)
+
+            if json.dumps(out, ensure_ascii=False) != json.dumps(expected, ensure_ascii=False):
+                self.disabled = True
+                print(f"[WARN] {self.container}: generated extractor differs from materialize(); not used")
+                return expected
+
+        return out
+
+    def fall_back(self, record, reason):
+
+        self.fallbacks += 1
+
+        if self.records <= VERIFY_RECORDS:
+            self.disabled = True
+            print(f"[WARN] {self.container}: generated extractor failed ({reason}); not used")
+
+        return self.materialize(record)
+
+    def stats_line(self):
+
+        state = "disabled, used materialize()" if self.disabled else "ok"
+
+        return (
+            f"schema extractor: {state}, {self.records} records, "
+            f"{self.fallbacks} materialize() fallbacks"
+        )
+
+
+def schema_extractor(container, schema_file, materialize, cache_dir: Path = CACHE_DIR):
+    """
+    A RecordExtractor for the container's records, or None when there is
+    no usable schema and materialize() should be used directly.
+    """
+
+    if schema_file is None or not Path(schema_file).exists():
+        return None
+
+    extract = load_generated(container, schema_file, materialize, cache_dir)
+
+    if extract is None:
+        return None
+
+    return RecordExtractor(container, extract, materialize)
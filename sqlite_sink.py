@@ -0,0 +1,639 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Direct-to-SQLite sink for EF_Extractor_V4.
+
+Builds the same eve_universe.db tables as the convert/*_json_to_db.py
+pipeline, fed with materialized records straight from the FSD
+containers. No JSON is written or parsed. Rows are batched per table and
+inserted with executemany inside a single transaction. If the run fails,
+the transaction is rolled back and the previous tables are left intact.
+
+Only the tables of the extracted containers are dropped and recreated;
+the rest of the database is kept. systems, locationcache and
+solarsystemcontent together make up the systems tables, so they have to
+be extracted together.
+"""
+
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+# The converters live in convert/; their secondary indexes are reused so a
+# database built by the sink has the same schema as one built by them.
+sys.path.insert(0, str(Path(__file__).resolve().parent / "convert"))
+
+from solarsystemcontent_json_to_db import INDEXES
+
+BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE types (
+    typeID          INTEGER PRIMARY KEY,
+    typeNameID      INTEGER,
+    name            TEXT,
+    groupID         INTEGER,
+    volume          REAL,
+    mass            REAL,
+    capacity        REAL,
+    radius          REAL,
+    published       INTEGER,
+    basePrice       REAL,
+    descriptionID   INTEGER,
+    graphicID       INTEGER,
+    raceID          INTEGER,
+    portionSize     INTEGER,
+    platforms       INTEGER
+);
+
+CREATE TABLE systems (
+    solarSystemID      INTEGER PRIMARY KEY,
+    nameID             INTEGER,
+    name               TEXT,
+    securityStatus     REAL,
+    securityClass      TEXT,
+    regionID           INTEGER,
+    constellationID    INTEGER,
+    center_x           REAL,
+    center_y           REAL,
+    center_z           REAL,
+    sunTypeID          INTEGER,
+    sunFlareGraphicID  INTEGER,
+    station            INTEGER DEFAULT 0
+);
+
+CREATE TABLE system_planets (
+    solarSystemID INTEGER,
+    planetItemID  INTEGER,
+    PRIMARY KEY (solarSystemID, planetItemID)
+);
+
+CREATE TABLE stargates (
+    solarSystemID INTEGER,
+    stargateID INTEGER,
+    destination INTEGER,
+    typeID INTEGER,
+    position_x REAL,
+    position_y REAL,
+    position_z REAL,
+    PRIMARY KEY (solarSystemID, stargateID)
+);
+
+CREATE TABLE planets (
+    solarSystemID INTEGER,
+    planetID INTEGER,
+    celestialIndex INTEGER,
+    typeID INTEGER,
+    radius REAL,
+    density REAL,
+    eccentricity REAL,
+    escapeVelocity REAL,
+    fragmented INTEGER,
+    life REAL,
+    locked INTEGER,
+    massDust REAL,
+    massGas REAL,
+    orbitClockwise INTEGER,
+    orbitPeriod REAL,
+    orbitRadius REAL,
+    pressure REAL,
+    rotationRate REAL,
+    spectralClass TEXT,
+    surfaceGravity REAL,
+    temperature REAL,
+    typeDescription TEXT,
+    PRIMARY KEY (solarSystemID, planetID)
+);
+
+CREATE TABLE moons (
+    planetID INTEGER,
+    moonID INTEGER,
+    orbitID INTEGER,
+    typeID INTEGER,
+    radius REAL,
+    density REAL,
+    eccentricity REAL,
+    escapeVelocity REAL,
+    fragmented INTEGER,
+    life REAL,
+    locked INTEGER,
+    massDust REAL,
+    massGas REAL,
+    orbitClockwise INTEGER,
+    orbitPeriod REAL,
+    orbitRadius REAL,
+    pressure REAL,
+    rotationRate REAL,
+    spectralClass TEXT,
+    surfaceGravity REAL,
+    temperature REAL,
+    typeDescription TEXT,
+    PRIMARY KEY (planetID, moonID)
+);
+
+CREATE TABLE npc_stations (
+    celestialID INTEGER,  -- planetID or moonID
+    stationID INTEGER,
+    constructableTypeListID INTEGER,
+    isConquerable INTEGER,
+    lagrangePoint INTEGER,
+    operationID INTEGER,
+    orbitID INTEGER,
+    ownerID INTEGER,
+    reprocessingEfficiency REAL,
+    reprocessingHangarFlag INTEGER,
+    reprocessingStationsTake REAL,
+    solarSystemID INTEGER,
+    stationName TEXT,
+    typeID INTEGER,
+    useOperationName INTEGER,
+    PRIMARY KEY (celestialID, stationID)
+);
+
+CREATE TABLE regions (
+    regionId INTEGER PRIMARY KEY,
+    descriptionId INTEGER,
+    nameId INTEGER,
+    name TEXT,
+    nebulaId INTEGER,
+    nebulaPath TEXT,
+    potential REAL,
+    regionLevel INTEGER,
+    sectorId INTEGER,
+    wormholeClassId INTEGER,
+    zoneLevel INTEGER
+);
+
+CREATE TABLE region_constellations (
+    regionId INTEGER,
+    constellationId INTEGER,
+    PRIMARY KEY (regionId, constellationId)
+);
+
+CREATE TABLE stars (
+    solarSystemID INTEGER PRIMARY KEY,
+    starID        INTEGER,
+    typeID        INTEGER,
+    radius        REAL,
+    stats_radius  REAL,
+    age           REAL,
+    life          REAL,
+    locked        INTEGER,
+    luminosity    REAL,
+    mass          REAL,
+    metallicity   REAL,
+    spectralClass TEXT,
+    temperature   REAL
+);
+"""
+
+# Filled by the systems and locationcache containers and folded into the
+# systems rows by FINALIZE; they vanish with the connection.
+TEMP_SCHEMA = """
+CREATE TEMP TABLE systems_meta (
+    solarSystemID   INTEGER PRIMARY KEY,
+    nameID          INTEGER,
+    name            TEXT,
+    regionID        INTEGER,
+    constellationID INTEGER
+);
+
+CREATE TEMP TABLE station_systems (
+    solarSystemID INTEGER PRIMARY KEY
+);
+"""
+
+TEMP_TABLES = {"systems_meta", "station_systems"}
+
+# CREATE statement of every table in SCHEMA, by table name
+CREATES = {
+    re.match(r"\s*CREATE TABLE (\w+)", statement).group(1): statement
+    for statement in SCHEMA.split(";")
+    if statement.strip()
+}
+
+# Tables each container replaces. Tables of containers that are not
+# extracted are left as they are.
+OWNED_TABLES = {
+    "types": ("types",),
+    "regions": ("regions", "region_constellations"),
+    "solarsystemcontent": (
+        "systems", "system_planets", "stargates", "planets", "moons", "npc_stations", "stars",
+    ),
+}
+
+# Dropped with the solarsystemcontent tables, like the converter does
+LEGACY_TABLES = ("region_solar_systems", "region_neighbours")
+
+# The systems rows are written from solarsystemcontent and completed from
+# systems (names, region, constellation) and locationcache (station flag),
+# so these three only make sense together.
+UNIVERSE = ("systems", "locationcache", "solarsystemcontent")
+
+INSERTS = {
+    "types": "INSERT INTO types VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "systems": """
+        INSERT INTO systems (
+            solarSystemID, nameID, name, securityStatus, securityClass,
+            regionID, constellationID, center_x, center_y, center_z,
+            sunTypeID, sunFlareGraphicID
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "planets": "INSERT INTO planets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "moons": "INSERT INTO moons VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "npc_stations": "INSERT INTO npc_stations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "stargates": "INSERT INTO stargates VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "stars": "INSERT INTO stars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "regions": "INSERT OR REPLACE INTO regions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "region_constellations": "INSERT OR IGNORE INTO region_constellations VALUES (?, ?)",
+    "systems_meta": "INSERT OR REPLACE INTO systems_meta VALUES (?, ?, ?, ?, ?)",
+    "station_systems": "INSERT OR IGNORE INTO station_systems VALUES (?)",
+}
+
+# Applied once every container has been written, so the order in which
+# systems / locationcache / solarsystemcontent arrive does not matter.
+FINALIZE = """
+UPDATE systems SET
+    nameID = (SELECT m.nameID FROM systems_meta m WHERE m.solarSystemID = systems.solarSystemID),
+    name = (SELECT m.name FROM systems_meta m WHERE m.solarSystemID = systems.solarSystemID),
+    regionID = (SELECT m.regionID FROM systems_meta m WHERE m.solarSystemID = systems.solarSystemID),
+    constellationID = (SELECT m.constellationID FROM systems_meta m WHERE m.solarSystemID = systems.solarSystemID);
+
+UPDATE systems SET station = 1
+WHERE solarSystemID IN (SELECT solarSystemID FROM station_systems);
+
+DROP TABLE systems_meta;
+DROP TABLE station_systems;
+"""
+
+
+# ------------------------------------------------------------
+# NAMES (same rules as the convert/ scripts)
+# ------------------------------------------------------------
+
+def normalize_name(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        # Frontier localization: first element is usually the display name
+        return value[0] if value else None
+    return str(value)
+
+
+def resolve_localized_text(localization_map, key):
+    if key is None:
+        return None
+
+    text = normalize_name(localization_map.get(str(key)))
+    if not text:
+        return None
+
+    # Some builds store an intermediate numeric token; dereference once.
+    if isinstance(text, str) and text.isdigit():
+        indirect = normalize_name(localization_map.get(text))
+        if indirect:
+            return indirect
+
+    return text
+
+
+def resolve_name(record, id_field, localization_map):
+    direct_name = normalize_name(record.get("name"))
+    if direct_name and not (isinstance(direct_name, str) and direct_name.isdigit()):
+        return direct_name
+
+    localized = resolve_localized_text(localization_map, record.get(id_field))
+    if localized:
+        return localized
+
+    return direct_name
+
+
+# ------------------------------------------------------------
+# LOCATIONCACHE
+# ------------------------------------------------------------
+
+def classify(location_id: int) -> str:
+    if 30000000 <= location_id < 40000000:
+        return "SolarSystem"
+    if 40000000 <= location_id < 40100000:
+        return "Planet"
+    if 40100000 <= location_id < 40200000:
+        return "Moon"
+    if 50000000 <= location_id < 60000000:
+        return "Stargate"
+    if 60000000 <= location_id < 70000000:
+        return "Station"
+    return "Other"
+
+
+# ------------------------------------------------------------
+# ROW BUILDERS
+# ------------------------------------------------------------
+
+def celestial_row(owner_id, celestial_id, first, data):
+    stats = data.get("statistics") or {}
+    return (
+        owner_id,
+        celestial_id,
+        first,
+        data.get("typeID"),
+        data.get("radius"),
+        stats.get("density"),
+        stats.get("eccentricity"),
+        stats.get("escapeVelocity"),
+        1 if stats.get("fragmented") else 0,
+        stats.get("life"),
+        1 if stats.get("locked") else 0,
+        stats.get("massDust"),
+        stats.get("massGas"),
+        1 if stats.get("orbitClockwise") else 0,
+        stats.get("orbitPeriod"),
+        stats.get("orbitRadius"),
+        stats.get("pressure"),
+        stats.get("rotationRate"),
+        stats.get("spectralClass"),
+        stats.get("surfaceGravity"),
+        stats.get("temperature"),
+        stats.get("typeDescription"),
+    )
+
+
+def npc_station_row(celestial_id, station_id, station_data):
+    return (
+        celestial_id,
+        station_id,
+        station_data.get("constructableTypeListID"),
+        1 if station_data.get("isConquerable") else 0,
+        station_data.get("lagrangePoint"),
+        station_data.get("operationID"),
+        station_data.get("orbitID"),
+        station_data.get("ownerID"),
+        station_data.get("reprocessingEfficiency"),
+        station_data.get("reprocessingHangarFlag"),
+        station_data.get("reprocessingStationsTake"),
+        station_data.get("solarSystemID"),
+        station_data.get("stationName"),
+        station_data.get("typeID"),
+        1 if station_data.get("useOperationName") else 0,
+    )
+
+
+def solarsystem_rows(system):
+    """Yield (table, row) for one solarsystemcontent record."""
+
+    system_id = system.get("solarSystemID")
+    center = system.get("center") or {}
+
+    # nameID / name / region / constellation come from the systems
+    # container and are filled in by FINALIZE.
+    yield "systems", (
+        system_id,
+        None,
+        None,
+        system.get("security"),
+        system.get("securityClass"),
+        None,
+        None,
+        center.get("x"),
+        center.get("y"),
+        center.get("z"),
+        system.get("sunTypeID"),
+        system.get("sunFlareGraphicID"),
+    )
+
+    for planet_id, planet_data in (system.get("planets") or {}).items():
+
+        yield "planets", celestial_row(
+            system_id, int(planet_id), planet_data.get("celestialIndex"), planet_data
+        )
+
+        for station_id, station_data in (planet_data.get("npcStations") or {}).items():
+            yield "npc_stations", npc_station_row(int(planet_id), int(station_id), station_data)
+
+        for moon_id, moon_data in (planet_data.get("moons") or {}).items():
+
+            yield "moons", celestial_row(
+                int(planet_id), int(moon_id), moon_data.get("orbitID"), moon_data
+            )
+
+            for station_id, station_data in (moon_data.get("npcStations") or {}).items():
+                yield "npc_stations", npc_station_row(int(moon_id), int(station_id), station_data)
+
+    for stargate_id, stargate_data in (system.get("stargates") or {}).items():
+        position = stargate_data.get("position") or {}
+        yield "stargates", (
+            system_id,
+            int(stargate_id),
+            stargate_data.get("destination"),
+            stargate_data.get("typeID"),
+            position.get("x"),
+            position.get("y"),
+            position.get("z"),
+        )
+
+    star = system.get("star")
+    if star:
+        star_stats = star.get("statistics") or {}
+        yield "stars", (
+            system_id,
+            star.get("id"),
+            star.get("typeID"),
+            star.get("radius"),
+            star_stats.get("radius"),
+            star_stats.get("age"),
+            star_stats.get("life"),
+            1 if star_stats.get("locked") else 0,
+            star_stats.get("luminosity"),
+            star_stats.get("mass"),
+            star_stats.get("metallicity"),
+            star_stats.get("spectralClass"),
+            star_stats.get("temperature"),
+        )
+
+
+def type_rows(key, t, localization):
+    yield "types", (
+        int(key),
+        t.get("typeNameID"),
+        resolve_name(t, "typeNameID", localization),
+        t.get("groupID"),
+        t.get("volume"),
+        t.get("mass"),
+        t.get("capacity"),
+        t.get("radius"),
+        t.get("published"),
+        t.get("basePrice"),
+        t.get("descriptionID"),
+        t.get("graphicID"),
+        t.get("raceID"),
+        t.get("portionSize"),
+        t.get("platforms"),
+    )
+
+
+def system_meta_rows(key, system, localization):
+    yield "systems_meta", (
+        system.get("solarSystemID"),
+        system.get("nameID"),
+        resolve_name(system, "nameID", localization),
+        system.get("regionID"),
+        system.get("constellationID"),
+    )
+
+
+def region_rows(key, region, localization):
+    region_id = int(key)
+
+    yield "regions", (
+        region_id,
+        region.get("descriptionID"),
+        region.get("nameID"),
+        resolve_name(region, "nameID", localization),
+        region.get("nebulaID"),
+        region.get("nebulaPath"),
+        region.get("potential"),
+        region.get("regionLevel"),
+        region.get("sectorID"),
+        region.get("wormholeClassID"),
+        region.get("zoneLevel"),
+    )
+
+    for cid in region.get("constellationIDs", region.get("regionLevels", [])):
+        yield "region_constellations", (region_id, cid)
+
+
+def locationcache_rows(key, value, localization):
+    if key is not None:
+        # {location_id: solar_system_id}
+        location_id, system_id = key, value
+    elif isinstance(value, (list, tuple)) and len(value) == 2:
+        # [[location_id, solar_system_id], ...]
+        location_id, system_id = value
+    else:
+        raise ValueError("Unknown locationcache structure")
+
+    if classify(int(location_id)) == "Station":
+        yield "station_systems", (int(system_id),)
+
+
+ROW_BUILDERS = {
+    "types": type_rows,
+    "systems": system_meta_rows,
+    "regions": region_rows,
+    "locationcache": locationcache_rows,
+    "solarsystemcontent": lambda key, record, localization: solarsystem_rows(record),
+}
+
+
+# ------------------------------------------------------------
+# SINK
+# ------------------------------------------------------------
+
+class SqliteSink:
+    """
+    Write extracted containers into an eve_universe.db-style database.
+
+    open() drops and recreates the tables of the containers to be
+    written inside one transaction (other tables are kept), write() feeds
+    one container's (key, record) pairs, and finish() applies the
+    cross-container updates and commits.
+    """
+
+    def __init__(self, db_path: Path, localization=None, batch_size=BATCH_SIZE):
+        self.db_path = Path(db_path)
+        self.localization = localization or {}
+        self.batch_size = batch_size
+        self.conn = None
+        self.pending = {}
+        self.counts = {}
+        self.finalize = False
+
+    @staticmethod
+    def supports(container):
+        return container in ROW_BUILDERS
+
+    @staticmethod
+    def check(containers):
+        """Raise ValueError for a container set the sink cannot write on its own."""
+        universe = [c for c in UNIVERSE if c in containers]
+        if universe and len(universe) != len(UNIVERSE):
+            missing = [c for c in UNIVERSE if c not in universe]
+            raise ValueError(
+                f"{', '.join(UNIVERSE)} fill the same tables and must be extracted "
+                f"together (missing: {', '.join(missing)})"
+            )
+
+    def open(self, containers):
+        containers = [c for c in containers if self.supports(c)]
+        self.check(containers)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        self.conn.execute("BEGIN")
+
+        tables = [t for c in containers for t in OWNED_TABLES.get(c, ())]
+        if "solarsystemcontent" in containers:
+            tables += LEGACY_TABLES
+
+        for table in tables:
+            self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            if table in CREATES:
+                self.conn.execute(CREATES[table])
+
+        for statement in TEMP_SCHEMA.split(";"):
+            if statement.strip():
+                self.conn.execute(statement)
+
+        self.finalize = "solarsystemcontent" in containers
+
+        return self
+
+    def flush(self, table):
+        rows = self.pending.get(table)
+        if rows:
+            self.conn.executemany(INSERTS[table], rows)
+            self.counts[table] = self.counts.get(table, 0) + len(rows)
+            rows.clear()
+
+    def write(self, container, records):
+        build = ROW_BUILDERS[container]
+        n = 0
+
+        for key, record in records:
+            for table, row in build(key, record, self.localization):
+                rows = self.pending.setdefault(table, [])
+                rows.append(row)
+                if len(rows) >= self.batch_size:
+                    self.flush(table)
+            n += 1
+
+        for table in list(self.pending):
+            self.flush(table)
+
+        return n
+
+    def finish(self):
+        if self.finalize:
+            for statement in FINALIZE.split(";"):
+                if statement.strip():
+                    self.conn.execute(statement)
+            for statement in INDEXES:
+                self.conn.execute(statement)
+
+        self.conn.execute("COMMIT")
+        self.conn.close()
+        self.conn = None
+
+        return {t: c for t, c in self.counts.items() if t not in TEMP_TABLES}
+
+    def abort(self):
+        if self.conn is not None:
+            self.conn.execute("ROLLBACK")
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+A list-shaped container (locationcache as [[location_id, solar_system_id],
+...]) is hashed per item, and diff_extractions.py reads back the changed
+items from json and ndjson files.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(ROOT_DIR))
+
+import EF_Extractor_V4 as v4
+from diff_extractions import diff_container
+from record_hashes import hashes_path, write_hashes
+from record_io import container_path
+
+OLD = [[60000001, 30000001], [60000002, 30000002], [60000003, 30000003]]
+NEW = [[60000001, 30000001], [60000002, 30000009], [60000003, 30000003], [60000004, 30000004]]
+
+
+def extract(out_dir, value, fmt, sidecar):
+
+    out_dir.mkdir()
+    out = container_path(out_dir, "locationcache", fmt)
+
+    hashes = {}
+    v4.write_container(value, out, hashes=hashes)
+
+    if sidecar:
+        write_hashes(hashes_path(out_dir, "locationcache"), "locationcache", hashes)
+
+    return {"output": out.name}, hashes
+
+
+@pytest.mark.parametrize("sidecar", [True, False])
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "ndjson.gz"])
+def test_changed_list_item_is_listed(tmp_path, fmt, sidecar):
+
+    old_entry, old_hashes = extract(tmp_path / "old", OLD, fmt, sidecar)
+    new_entry, _ = extract(tmp_path / "new", NEW, fmt, sidecar)
+
+    assert sorted(old_hashes) == ["0", "1", "2"]
+
+    result = diff_container(tmp_path / "old", tmp_path / "new", "locationcache", old_entry, new_entry)
+
+    assert result["added"] == ["3"]
+    assert result["removed"] == []
+    assert result["changed"] == {"1": [["[1]", 30000002, 30000009]]}
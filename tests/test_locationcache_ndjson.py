@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+A list-shaped locationcache ([[location_id, solar_system_id], ...]) written
+by record_io.write_value must convert the same from json and ndjson.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "convert"))
+
+import locationcache_json_to_db
+from converter_inputs import ConverterInputs
+from record_io import container_path, open_text, write_value
+
+
+def convert_pairs(tmp_path, pairs, fmt):
+
+    out_dir = tmp_path / "output"
+    out_dir.mkdir()
+
+    with open_text(container_path(out_dir, "locationcache", fmt), "w") as f:
+        write_value(f, pairs, fmt)
+
+    inputs = ConverterInputs(out_dir, tmp_path / "db" / "eve_universe.db")
+    try:
+        locationcache_json_to_db.convert(inputs)
+    finally:
+        inputs.close()
+
+    conn = sqlite3.connect(inputs.db_dir / "locationcache.db")
+    try:
+        return conn.execute(
+            "SELECT location_id, solar_system_id, location_type "
+            "FROM locationcache_typed ORDER BY location_id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "ndjson.gz"])
+@pytest.mark.parametrize("pairs", [
+    # two pairs: one record holding the whole list would unpack as a pair
+    [[60000001, 30000001], [40000002, 30000002]],
+    [[60000001, 30000001], [40000002, 30000002], [50000003, 30000003]],
+])
+def test_list_container_round_trip(tmp_path, fmt, pairs):
+
+    rows = convert_pairs(tmp_path, pairs, fmt)
+
+    assert rows == [
+        (location_id, system_id, locationcache_json_to_db.classify(location_id))
+        for location_id, system_id in sorted(pairs)
+    ]
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Container keys keep the case of resfileindex.txt; names typed by the user
+(debug_resfile.py, the server's inspect) resolve to them in any case.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(ROOT_DIR))
+
+from resfileindex import ResfileIndex, parse_line
+
+LINES = [
+    "res:/staticdata/SolarSystemContent.static,ab/ab12_ssc.static,aaaa,10,5",
+    "res:/staticdata/SolarSystemContent.schema,ab/ab12_ssc.schema,bbbb,10,5",
+    "res:/localizationfsd/localization_fsd_en-us.pickle,ab/ab12_loc.pickle,cccc,10,5",
+]
+
+
+@pytest.mark.parametrize("name, key", [
+    ("SolarSystemContent", "SolarSystemContent"),
+    ("solarsystemcontent", "SolarSystemContent"),
+    ("SOLARSYSTEMCONTENT", "SolarSystemContent"),
+    ("localization_fsd_en-us", "localization_fsd_en-us.pickle"),
+    ("Localization_FSD_en-US", "localization_fsd_en-us.pickle"),
+    ("solarsystem", None),
+])
+def test_resolve_ignores_case(name, key):
+
+    index = ResfileIndex([parse_line(line) for line in LINES])
+
+    assert index.resolve(name) == key
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Schema resfiles are untrusted game data: a pickled schema may only hold
+plain containers, and a cached extractor is only run when its header
+matches the schema it was generated from.
+"""
+
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(ROOT_DIR))
+
+import schema_extractors
+
+SCHEMA = {
+    "type": "dict",
+    "keyTypes": {"type": "int"},
+    "valueTypes": {"type": "object", "attributes": {"typeID": {"type": "int"}}},
+}
+
+
+class Record:
+    typeID = 7
+
+
+def materialize(obj):
+    return {"typeID": obj.typeID}
+
+
+class Payload:
+    def __reduce__(self):
+        return (os.system, ("true",))
+
+
+def test_pickle_schema_is_read_without_globals():
+
+    assert schema_extractors.parse_schema(pickle.dumps(SCHEMA)) == SCHEMA
+    assert schema_extractors.parse_schema(pickle.dumps({"type": Payload()})) is None
+
+
+def test_tampered_cache_is_regenerated(tmp_path):
+
+    schema_file = tmp_path / "types.schema"
+    schema_file.write_text(json.dumps(SCHEMA), encoding="utf-8")
+
+    cache_dir = tmp_path / "extractors"
+    digest = schema_extractors.schema_digest(schema_file.read_bytes())
+    cached = cache_dir / f"types_{digest}.py"
+
+    schema_extractors.load_generated("types", schema_file, materialize, cache_dir)
+    source = cached.read_text(encoding="utf-8")
+
+    cached.write_text(source + "\nraise SystemExit('tampered')\n", encoding="utf-8")
+    schema_extractors._COMPILED.clear()
+
+    extract = schema_extractors.load_generated("types", schema_file, materialize, cache_dir)
+
+    assert extract(Record()) == {"typeID": 7}
+    assert cached.read_text(encoding="utf-8") == source